@@ -23,23 +23,41 @@ Context dictionaries are used by the template engine.
 
 import re
 import copy
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from math import ceil, log2
 from pathlib import Path
 
 import jinja2
 from systemrdl import AddressableNode, RDLListener
 from systemrdl.messages import MessageHandler, MessagePrinter
-from systemrdl.node import AddrmapNode, FieldNode, MemNode, RegfileNode, RegNode, RootNode
-
+from systemrdl.node import AddrmapNode, FieldNode, MemNode, Node, RegfileNode, RegNode, RootNode
+from systemrdl.rdltypes import PropertyReference
+
+from desyrdl.context import (
+    AddrmapItemContext,
+    ArrayElement,
+    AttributeDict,
+    FieldContext,
+    ItemContext,
+    MemContext,
+    NodeSnapshotError,
+    RegContext,
+    RegfileContext,
+    freeze_context,
+)
+from desyrdl.profiler import Profiler
 from desyrdl.rdlformatcode import DesyrdlMarkup
+from desyrdl.rendercache import write_if_changed
 
+# inputs of read data mux tree nodes of pipelined decoder, and-or of 8 words fits 2 LUT levels
+DECODER_RD_MUX_FANIN = 8
 
-class AttributeDict(dict):
-    """Class to convert dict to attributes of object."""
-
-    __getattr__ = dict.get
-    __setattr__ = dict.__setitem__
-    __delattr__ = dict.__delitem__
+# library adapters built from other adapters, the dependencies are listed before the adapter
+INTERFACE_ADAPTER_DEPS = {
+    "axi4_to_ibus": ["axi4_to_axi4l", "axi4l_to_ibus"],
+    "ibus_to_axi4": ["ibus_to_axi4l", "axi4l_to_axi4"],
+}
 
 
 class DesyListener(RDLListener):
@@ -58,7 +76,15 @@ class DesyListener(RDLListener):
         self.top_exts = []
         self.top_regf = []
         self.top_intrs = []
-        self.top_intrs_tree = []
+        # interrupt tree, entries keyed by interrupt register path
+        self.top_intrs_tree = {}
+        # interrupt controller options, keyed by interrupt registers parent path
+        self.intr_options = {}
+        # resolved properties and descriptions, keyed by component instance
+        self.inst_cache = {}
+        # access channels keyed by address map instance, field reset signals by node path
+        self.access_channels = {}
+        self.reset_signals = {}
 
         self.top_context = {}
         self.top_context['addrmaps'] = []
@@ -73,6 +99,7 @@ class DesyListener(RDLListener):
         self.context_tpl['mem_insts'] = []
         self.context_tpl['ext_insts'] = []
         self.context_tpl['rgf_insts'] = []
+        self.context_tpl['bram_insts'] = []
         self.context_tpl['reg_types'] = []
         self.context_tpl['mem_types'] = []
         self.context_tpl['ext_types'] = []
@@ -98,12 +125,15 @@ class DesyListener(RDLListener):
         self.md = DesyrdlMarkup()
         message_printer = MessagePrinter()
         self.msg = MessageHandler(message_printer)
+        # generation profiler, disabled by default
+        self.profiler = Profiler()
 
     # =========================================================================
     def init_addrmap_lists(self):
         """Intializes conectext ditionary in addrmap."""
         self.context.clear()
-        self.context = copy.deepcopy(self.context_tpl)
+        # template holds empty lists and counters only
+        self.context = {key: copy.copy(value) for key, value in self.context_tpl.items()}
 
     # =========================================================================
     def exit_Addrmap(self, node: AddrmapNode):
@@ -111,97 +141,259 @@ class DesyListener(RDLListener):
 
         Walks over address space tree.
         """
-        self.init_addrmap_lists()
-        # ------------------------------------------
-        self.context['node'] = node
-        self.context['type_name'] = node.type_name
-        self.context['inst_name'] = node.inst_name
-        self.context['type_name_org'] = (
-            node.inst.original_def.type_name if node.inst.original_def is not None else node.type_name
-        )
-
-        if node.get_property('desyrdl_interface') is None:
-            self.msg.warning(
-                "No desyrdl_interface defined. Fallback to AXI4L.",
-                node.inst.property_src_ref.get('addrmap', node.inst.def_src_ref),
+        profile_path = node.get_path(array_suffix=f'{self.separator}{{index:d}}', empty_array_suffix='')
+        with self.profiler.phase('context', profile_path):
+            self.init_addrmap_lists()
+            # ------------------------------------------
+            self.context['node'] = node
+            self.context['type_name'] = node.type_name
+            self.context['inst_name'] = node.inst_name
+            self.context['type_name_org'] = self.get_type_name_org(node)
+            props = self.get_props(node)
+            self.context['generate_hdl'] = props['desyrdl_generate_hdl']
+
+            if props['desyrdl_interface'] is None:
+                self.msg.warning(
+                    "No desyrdl_interface defined. Fallback to AXI4L.",
+                    node.inst.property_src_ref.get('addrmap', node.inst.def_src_ref),
+                )
+                self.context['interface'] = "axi4l"
+            else:
+                self.context['interface'] = props['desyrdl_interface']
+            self.context['access_channel'] = self.get_access_channel(node)
+            self.context['addrwidth'] = ceil(log2(node.size))
+
+            self.context['desc'] = props['desc']
+            self.context['desc_html'] = self.get_desc_html(node)
+
+            path_segments = node.get_path_segments(array_suffix=f'{self.separator}{{index:d}}', empty_array_suffix='')
+            self.context['path_segments'] = path_segments
+            self.context['path'] = self.separator.join(path_segments)
+            self.context['path_notop'] = self.separator.join(path_segments[1:])
+            self.context['path_addrmap_name'] = path_segments[-1]
+
+            self.set_item_dimmentions(node, self.context)
+            # ------------------------------------------
+            self.gen_items(node, self.context)
+            self.context['regs'] = self.unroll_inst('reg_insts', self.context)
+            self.context['mems'] = self.unroll_inst('mem_insts', self.context)
+            self.context['regf'] = self.unroll_inst('rgf_insts', self.context)
+            self.context['exts'] = self.unroll_inst('ext_insts', self.context)
+            # block RAM arrays are single memories for the decoder, after the mem elements
+            for bram in self.context['bram_insts']:
+                bram['idx'] = len(self.context['mems'])
+                self.context['mems'].append(bram)
+
+            # ------------------------------------------
+            self.context['n_reg_insts'] = len(self.context['reg_insts'])
+            self.context['n_bram_insts'] = len(self.context['bram_insts'])
+            self.context['n_mem_insts'] = len(self.context['mem_insts']) + self.context['n_bram_insts']
+            self.context['n_ext_insts'] = len(self.context['ext_insts'])
+            self.context['n_rgf_insts'] = len(self.context['rgf_insts'])
+
+            self.context['n_regs'] = len(self.context['regs'])
+            self.context['n_mems'] = len(self.context['mems'])
+            self.context['n_exts'] = len(self.context['exts'])
+            self.context['n_regf'] = len(self.context['regf'])
+
+            self.context['n_regf_regs'] = 0
+            for regf in self.context['regf']:
+                self.context['n_regf_regs'] += len(regf['regs'])
+            self.set_decoder_pipeline(node, self.context)
+
+            # ------------------------------------------
+            self.top_context['addrmaps'].append(self.context.copy())
+            self.top_context['access_channel'] = self.context['access_channel']
+            self.top_context['interface_adapters'] = (
+                self.top_context['interface_adapters'] + self.context['interface_adapters'].copy()
             )
-            self.context['interface'] = "axi4l"
-        else:
-            self.context['interface'] = node.get_property('desyrdl_interface')
-        self.context['access_channel'] = self.get_access_channel(node)
-        self.context['addrwidth'] = ceil(log2(node.size))
-
-        self.context['desc'] = node.get_property('desc')
-        self.context['desc_html'] = node.get_html_desc(self.md)
-
-        path_segments = node.get_path_segments(array_suffix=f'{self.separator}{{index:d}}', empty_array_suffix='')
-        self.context['path_segments'] = path_segments
-        self.context['path'] = self.separator.join(path_segments)
-        self.context['path_notop'] = self.separator.join(path_segments[1:])
-        self.context['path_addrmap_name'] = path_segments[-1]
-
-        self.set_item_dimmentions(node, self.context)
-        # ------------------------------------------
-        self.gen_items(node, self.context)
-        self.context['regs'] = self.unroll_inst('reg_insts', self.context)
-        self.context['mems'] = self.unroll_inst('mem_insts', self.context)
-        self.context['regf'] = self.unroll_inst('rgf_insts', self.context)
-        self.context['exts'] = self.unroll_inst('ext_insts', self.context)
-
-        # ------------------------------------------
-        self.context['n_reg_insts'] = len(self.context['reg_insts'])
-        self.context['n_mem_insts'] = len(self.context['mem_insts'])
-        self.context['n_ext_insts'] = len(self.context['ext_insts'])
-        self.context['n_rgf_insts'] = len(self.context['rgf_insts'])
-
-        self.context['n_regs'] = len(self.context['regs'])
-        self.context['n_mems'] = len(self.context['mems'])
-        self.context['n_exts'] = len(self.context['exts'])
-        self.context['n_regf'] = len(self.context['regf'])
-
-        self.context['n_regf_regs'] = 0
-        for regf in self.context['regf']:
-            self.context['n_regf_regs'] += len(regf['regs'])
-
-        # ------------------------------------------
-        self.top_context['addrmaps'].append(self.context.copy())
-        self.top_context['access_channel'] = self.context['access_channel']
-        self.top_context['interface_adapters'] = (
-            self.top_context['interface_adapters'] + self.context['interface_adapters'].copy()
-        )
 
         # update interript context with proper path only in top_contxt
         if isinstance(node.parent, RootNode):
-            for intr in self.top_intrs_tree:
-                print(f"intr: {intr}")
+            with self.profiler.phase('interrupts', profile_path):
+                for intr in self.top_intrs_tree.values():
+                    print(f"intr: {intr}")
                 for addrmap in self.top_context['addrmaps']:
-                    self.update_intr_context(addrmap, intr)
+                    self.update_intr_context(addrmap)
+            with self.profiler.phase('index', profile_path):
+                self.top_context['address_index'] = self.gen_address_index()
 
-    def update_intr_context(self, addrmap_ctx, intr_ctx):
+    def set_decoder_pipeline(self, node, context):
+        """Set context of pipelined decoder, address pages of registers and levels of read data mux trees.
+
+        Stage 1 of the decoder compares the address bits above the page bit with
+        the pages holding registers, stage 2 the address bits in the page. Read
+        data of registers is selected by and-or trees, one register per level.
+        """
+        context['decoder_pipeline'] = bool(self.get_props(node)['desyrdl_decoder_pipeline'])
+        if context['decoder_pipeline'] and context['interface'].lower() != "axi4l":
+            self.msg.warning(
+                f"desyrdl_decoder_pipeline is supported by AXI4L decoder only, ignored for {context['interface']}.",
+                node.inst.property_src_ref.get('desyrdl_decoder_pipeline', node.inst.def_src_ref),
+            )
+            context['decoder_pipeline'] = False
+        if not context['decoder_pipeline']:
+            return
+        # split word address bits in half, at least one bit in each stage
+        page_bit = min(max(2, (context['addrwidth'] + 2) // 2), context['addrwidth'] - 1)
+        pages = sorted({reg['address_offset'] >> page_bit for reg in context['regs']})
+        slots = {}
+        for reg in context['regs']:
+            offset = reg['address_offset'] & ((1 << page_bit) - 1)
+            page = pages.index(reg['address_offset'] >> page_bit)
+            slots.setdefault(offset, []).append(AttributeDict(page=page, reg=reg))
+        context['decoder_page_bit'] = page_bit
+        context['decoder_pages'] = pages
+        context['decoder_slots'] = [AttributeDict(offset=offset, regs=slots[offset]) for offset in sorted(slots)]
+        # levels of the deeper tree, the other tree gets registered levels of one node
+        inputs = max(context['n_regs'], context['n_regf_regs'], 1)
+        levels = 1
+        while inputs > DECODER_RD_MUX_FANIN:
+            inputs = ceil(inputs / DECODER_RD_MUX_FANIN)
+            levels += 1
+        context['rd_mux_fanin'] = DECODER_RD_MUX_FANIN
+        context['rd_mux_stages'] = levels
+        context['reg_rd_mux_tree'] = self.mux_tree_levels(context['n_regs'], levels)
+        context['rgf_rd_mux_tree'] = self.mux_tree_levels(context['n_regf_regs'], levels)
+
+    def mux_tree_levels(self, inputs, levels):
+        """Return number of nodes in each level of read data mux tree."""
+        nodes = []
+        for _ in range(levels):
+            inputs = max(ceil(inputs / DECODER_RD_MUX_FANIN), 1)
+            nodes.append(inputs)
+        return nodes
+
+    def update_intr_context(self, addrmap_ctx):
         """Update contexs with the interrupt tree data."""
         for inst in addrmap_ctx['insts']:
-            if inst.node.get_path() == intr_ctx['path']:
-                inst.intr_line = intr_ctx['intr_line']
-                inst['intr_opts'] = self.set_intr_options(inst)
+            if isinstance(inst['node'], RegNode):
+                intr = self.top_intrs_tree.get(inst.node.get_path())
+                if intr is not None:
+                    inst.intr_line = intr['intr_line']
+                    inst['intr_opts'] = self.set_intr_options(inst)
             if isinstance(inst['node'], RegfileNode):
                 for rfinst in inst['reg_insts']:
-                    if rfinst['node'].get_path() == intr_ctx['path']:
-                        rfinst['intr_line'] = intr_ctx['intr_line']
+                    intr = self.top_intrs_tree.get(rfinst['node'].get_path())
+                    if intr is not None:
+                        rfinst['intr_line'] = intr['intr_line']
                         rfinst['intr_opts'] = self.set_intr_options(inst)
 
     def set_intr_options(self, inst):
         """Find interrupt registers and set interrupt controller options."""
-        options = []
-        intc_regs = ["ICR", "IAR", "IPR", "MER", "GIE", "SIE", "CIE"]
-        for reg in inst.node.parent.children(unroll=False):
-            if reg.inst_name.lower() in (name.lower() for name in intc_regs):
-                options.append(reg.inst_name)
-        return options
+        parent_path = inst.node.parent.get_path()
+        if parent_path not in self.intr_options:
+            options = []
+            intc_regs = ["ICR", "IAR", "IPR", "MER", "GIE", "SIE", "CIE"]
+            for reg in inst.node.parent.children(unroll=False):
+                if reg.inst_name.lower() in (name.lower() for name in intc_regs):
+                    options.append(reg.inst_name)
+            self.intr_options[parent_path] = options
+        return self.intr_options[parent_path]
+
+    # =========================================================================
+    def gen_address_index(self):
+        """Generate index of registers and memories sorted by address, for reverse lookup of addresses.
+
+        Arrays of address maps, regfiles and memories are unrolled, elements of
+        register arrays and words of memories are found from the entry stride.
+        """
+        index = []
+        for addrmap in self.top_context['addrmaps']:
+            node = addrmap['node']
+            for path, offset in self.addrmap_elements(node):
+                if not addrmap['insts']:
+                    # address map without items, e.g. external module
+                    base = node.raw_absolute_address + offset
+                    index.append(
+                        self.index_entry(path, base, base + node.size - 1, stride=0, size=node.size, item=addrmap)
+                    )
+                for inst in addrmap['insts']:
+                    self.index_item(index, path, inst, offset)
+        index.sort(key=lambda entry: entry['base'])
+        return index
+
+    def addrmap_elements(self, node):
+        """Return path and address offset of all elements of address map, arrays of it and its parents unrolled."""
+        segments = []
+        while not isinstance(node, RootNode):
+            segments.insert(0, node)
+            node = node.parent
+        elements = [("", 0)]
+        for segment in segments:
+            suffixes = self.array_suffixes(segment.array_dimensions) if segment.is_array else [""]
+            elements = [
+                (
+                    f"{path}{self.separator if path else ''}{segment.inst_name}{suffix}",
+                    offset + idx * (segment.array_stride or 0),
+                )
+                for path, offset in elements
+                for idx, suffix in enumerate(suffixes)
+            ]
+        return elements
+
+    def array_suffixes(self, dimensions):
+        """Return index suffixes of all array elements in address order, e.g. [1][0]."""
+        suffixes = [""]
+        for dim in dimensions:
+            suffixes = [f"{suffix}[{idx}]" for suffix in suffixes for idx in range(dim)]
+        return suffixes
+
+    def index_item(self, index, path, inst, offset):
+        """Add index entries of register, memory or regfile item."""
+        path = path + self.separator + inst['inst_name']
+        if inst['node_type'] == "REG":
+            dims = inst['node'].array_dimensions if inst['dim'] > 1 else []
+            fields = [
+                AttributeDict(low=field['low'], high=field['high'], name=field['inst_name']) for field in inst['fields']
+            ]
+            index.append(
+                self.index_entry(
+                    path,
+                    inst['absolute_address'] + offset,
+                    inst['absolute_address_high'] + offset,
+                    stride=inst['array_stride'],
+                    size=inst['node'].size,
+                    dims=dims,
+                    fields=fields,
+                    item=inst,
+                )
+            )
+        elif inst['node_type'] in ("MEM", "REGFILE"):
+            dims = inst['node'].array_dimensions if inst['dim'] > 1 else []
+            for idx, suffix in enumerate(self.array_suffixes(dims)):
+                element_offset = offset + idx * inst['array_stride']
+                if inst['node_type'] == "REGFILE":
+                    for reg in inst['reg_insts']:
+                        self.index_item(index, path + suffix, reg, element_offset)
+                else:
+                    # memory words are elements of the entry
+                    base = inst['absolute_address'] + element_offset
+                    index.append(
+                        self.index_entry(
+                            path + suffix,
+                            base,
+                            base + inst['node'].size - 1,
+                            stride=4,
+                            size=4,
+                            dims=[inst['entries']],
+                            item=inst,
+                        )
+                    )
+
+    def index_entry(self, path, base, high, *, stride, size, dims=(), fields=(), item=None):
+        """Return address index entry, base and high address, element stride and size, array dimensions and fields.
+
+        The entry refers to the context of its register, memory or address map item.
+        """
+        return AttributeDict(
+            path=path, base=base, high=high, stride=stride, size=size, dims=list(dims), fields=list(fields), item=item
+        )
 
     # =========================================================================
     def unroll_inst(self, insts, context):
         """Unroll all registers in addrmap + regfiles.
-        Recalculate index for instsances"""
+        Recalculate index for instsances, array elements are views of the instance"""
         index = 0
         idx_insts = []
         instsc = []
@@ -209,14 +401,7 @@ class DesyListener(RDLListener):
             inst['idx'] = index
             idx_insts.append(inst)
             for idx in range(inst['elements']):
-                instc = inst.copy()
-                instc['idx'] = index
-                instc['address_offset'] = inst['address_offset'] + inst['array_stride'] * idx
-                instc['absolute_address'] = inst['absolute_address'] + inst['array_stride'] * idx
-                if inst['node'].is_array:
-                    instc['address_offset_high'] = instc['address_offset'] + inst['array_stride'] - 1
-                    instc['absolute_address_high'] = instc['absolute_address'] + inst['array_stride'] - 1
-                instsc.append(instc)
+                instsc.append(ArrayElement(inst, index, idx))
                 index += 1
 
         context[insts] = idx_insts
@@ -231,14 +416,21 @@ class DesyListener(RDLListener):
     # =========================================================================
     def gen_item(self, item, context):
         """Genearte context dictionary for addressable instance node."""
-        item_context = {}
+        if isinstance(item, RegNode):
+            item_context = RegContext()
+        elif isinstance(item, MemNode):
+            item_context = MemContext()
+        elif isinstance(item, AddrmapNode):
+            item_context = AddrmapItemContext()
+        elif isinstance(item, RegfileNode):
+            item_context = RegfileContext()
+        else:
+            item_context = ItemContext()
         # common to all items values
         item_context['node'] = item
         item_context['type_name'] = item.type_name
         item_context['inst_name'] = item.inst_name
-        item_context['type_name_org'] = (
-            item.inst.original_def.type_name if item.inst.original_def is not None else item.type_name
-        )
+        item_context['type_name_org'] = self.get_type_name_org(item)
         item_context['access_channel'] = self.get_access_channel(item)
         item_context['address_offset'] = item.raw_address_offset
         item_context['address_offset_high'] = item.raw_address_offset + int(item.total_size) - 1
@@ -254,20 +446,25 @@ class DesyListener(RDLListener):
         item_context["fixedpoint"] = 0
         item_context["rw"] = "RW"
 
-        item_context['desc'] = item.get_property("desc")
-        item_context['desc_html'] = item.get_html_desc(self.md)
+        props = self.get_props(item)
+        item_context['desc'] = props['desc']
+        item_context['desc_html'] = self.get_desc_html(item)
 
         self.set_item_dimmentions(item, item_context)
 
         # add all non-native explicitly set properties
-        for prop in item.list_properties(list_all=True):
-            item_context[prop] = item.get_property(prop)
+        for prop, value in props.items():
+            item_context[prop] = value
 
         # item specyfic context
         if isinstance(item, RegNode):
             item_context['node_type'] = "REG"
             self.gen_regitem(item, context=item_context)
-            context['reg_insts'].append(item_context)
+            if self.is_bram_item(item):
+                self.gen_bramitem(item, context=item_context)
+                context['bram_insts'].append(item_context)
+            else:
+                context['reg_insts'].append(item_context)
             if item.type_name not in context['reg_type_names']:
                 context['reg_type_names'].append(item.type_name)
                 context['reg_types'].append(item_context)
@@ -291,8 +488,9 @@ class DesyListener(RDLListener):
                 and item_context['interface'].lower() != context['interface'].lower()
             ):
                 adapter_name = context['interface'].lower() + "_to_" + item_context['interface'].lower()
-                if adapter_name not in context['interface_adapters']:
-                    context['interface_adapters'].append(adapter_name)
+                for adapter in [*INTERFACE_ADAPTER_DEPS.get(adapter_name, []), adapter_name]:
+                    if adapter not in context['interface_adapters']:
+                        context['interface_adapters'].append(adapter)
             if item.type_name not in context['ext_type_names']:
                 context['ext_type_names'].append(item.type_name)
                 context['ext_types'].append(item_context)
@@ -300,13 +498,17 @@ class DesyListener(RDLListener):
         elif isinstance(item, RegfileNode):
             item_context['node_type'] = "REGFILE"
             self.gen_rfitem(item, context=item_context)
-            context['rgf_insts'].append(item_context)
+            if self.is_bram_item(item):
+                self.gen_bramitem(item, context=item_context)
+                context['bram_insts'].append(item_context)
+            else:
+                context['rgf_insts'].append(item_context)
             if item.type_name not in context['rgf_type_names']:
                 context['rgf_type_names'].append(item.type_name)
                 context['rgf_types'].append(item_context)
 
         # append item contect to items list
-        context['insts'].append(AttributeDict(item_context))
+        context['insts'].append(item_context)
 
     # =========================================================================
     def set_item_dimmentions(self, item: AddressableNode, item_context: dict):
@@ -335,16 +537,15 @@ class DesyListener(RDLListener):
         if isinstance(item, AddrmapNode) and dim > 1:
             addr_size = pow(2, ceil(log2(item.size))) - 1
             if addr_size & item.array_stride:
-                self.msg.error(
+                self.msg.fatal(
                     f"\nOnly full address alignment is supported in addrmap array instance, current stide 0x{item.array_stride:>X}.\nSet stride minimum or n(0...N) times of += 0x{addr_size+1:>X} in parent addrmap.",
                     item.inst.property_src_ref.get('addrmap', item.inst.inst_src_ref),
                 )
-                exit(-1)
 
     # =========================================================================
     def gen_extitem(self, extx: AddrmapNode, context):
         """Genrate context specyfic for AddrmapNode items."""
-        context['interface'] = extx.get_property('desyrdl_interface')
+        context['interface'] = self.get_props(extx)['desyrdl_interface']
         context['access_channel'] = self.get_access_channel(extx)
         context['addrwidth'] = ceil(log2(extx.size))
 
@@ -356,19 +557,20 @@ class DesyListener(RDLListener):
         reset = 0
         fields = []
         # context
-        context["dtype"] = regx.get_property('desyrdl_data_type', default='uint')
+        props = self.get_props(regx)
+        context["dtype"] = props['desyrdl_data_type'] or 'uint'
         context["intr"] = regx.is_interrupt_reg
-        context["intrch"] = regx.get_property('desyrdl_intr_line', default=0)
+        context["intrch"] = props['desyrdl_intr_line'] or 0
         if regx.is_interrupt_reg:
             self.top_intrs.append(regx)  # TMP stores interrupt nodes
             regx.intr_line = []
-            regx.intr_line.append(regx.get_property('desyrdl_intr_line', default=0))
-            intr_tree = {'path': regx.get_path(),
+            regx.intr_line.append(context["intrch"])
+            intr_path = regx.get_path()
+            intr_tree = {'path': intr_path,
                          'intr_line': regx.intr_line,
                          'parent': None}
-            lintr = list(filter(lambda intrit: intrit[1]['path'] == regx.get_path(), enumerate(self.top_intrs_tree)))
-            if not lintr:  # add only if not already on the list due to next intr tree insertion in field
-                self.top_intrs_tree.append(intr_tree)
+            # add only if not already in the tree due to next intr tree insertion in field
+            self.top_intrs_tree.setdefault(intr_path, intr_tree)
             context["intr_line"] = regx.intr_line
             print(f"++adding intr to top {intr_tree}")
 
@@ -387,18 +589,18 @@ class DesyListener(RDLListener):
             totalwidth = max(totalwidth, field.high)
             n_fields += 1
             field_reset = 0
-            field_context = {}
-            mask = self.bitmask(field.get_property('fieldwidth'))
+            field_context = FieldContext()
+            field_props = self.get_props(field)
+            mask = self.bitmask(field_props['fieldwidth'])
             mask = mask << field.low
             field_context['mask'] = mask
             field_context['mask_hex'] = hex(mask)
-            if field.get_property('reset'):
-                field_reset = field.get_property('reset')
+            if field_props['reset']:
+                field_reset = field_props['reset']
                 reset |= (field_reset << field.low) & mask
             field_context['node'] = field
             self.gen_fielditem(field, field_context)
-            fld = AttributeDict(field_context)
-            fields.append(fld)
+            fields.append(field_context)
 
         context["width"] = totalwidth+1
         context["fields"] = fields
@@ -407,71 +609,63 @@ class DesyListener(RDLListener):
     # =========================================================================
     def gen_fielditem(self, fldx: FieldNode, context):
         """Genrate context specyfic for FieldNode items."""
-        for prop in fldx.list_properties(list_all=True):
-            context[prop] = fldx.get_property(prop)
+        props = self.get_props(fldx)
+        for prop, value in props.items():
+            context[prop] = value
         context['node'] = fldx
         context['type_name'] = fldx.type_name
         context['inst_name'] = fldx.inst_name
-        context['type_name_org'] = (
-            fldx.inst.original_def.type_name if fldx.inst.original_def is not None else fldx.type_name
-        )
-        context['width'] = fldx.get_property('fieldwidth')
-        context['sw'] = fldx.get_property('sw').name
-        context['hw'] = fldx.get_property('hw').name
+        context['type_name_org'] = self.get_type_name_org(fldx)
+        context['width'] = props['fieldwidth']
+        context['sw'] = props['sw'].name
+        context['hw'] = props['hw'].name
         if not fldx.is_sw_writable and fldx.is_sw_readable:
             context['rw'] = "RO"
         elif fldx.is_sw_writable and not fldx.is_sw_readable:
             context['rw'] = "WO"
         else:
             context['rw'] = "RW"
-        context['const'] = 1 if fldx.get_property('hw').name in ('na', 'r') else 0
-        context['reset'] = 0 if fldx.get_property('reset') is None else self.to_int32(fldx.get_property('reset'))
+        context['const'] = 1 if props['hw'].name in ('na', 'r') else 0
+        context['reset'] = 0 if props['reset'] is None else self.to_int32(props['reset'])
         context['reset_hex'] = hex(context['reset'])
         context['low'] = fldx.low
         context['high'] = fldx.high
-        context['intrtype'] = fldx.get_property('intr type').name if fldx.get_property('intr type') is not None else None
+        context['intrtype'] = props['intr type'].name if props['intr type'] is not None else None
         context['intr_line'] = fldx
         # interurpt next for tree
-        if fldx.get_property('next') and context['intrtype'] is not None:
-            next_obj = fldx.get_property('next')
+        if props['next'] and context['intrtype'] is not None:
+            next_obj = props['next']
             next_path = next_obj.node.get_path()
             intr_line = list(fldx.parent.intr_line)
             intr_line.append(fldx.low)
-            # we look for interrupt regs on the list, get_propert returns wrong object, compiler bug?
+            # we look for interrupt regs by path, get_propert returns wrong object, compiler bug?
             # 'next' interrupt regs are already processed - bottom to top
             intr_tree = {'path': next_path,
                          'intr_line': intr_line,
                          'parent': fldx}
-            lintr = list(filter(lambda intrit: intrit[1]['path'] == next_path, enumerate(self.top_intrs_tree)))
-            if lintr:
-                self.top_intrs_tree[lintr[0][0]] = intr_tree
-            else:
-                self.top_intrs_tree.append(intr_tree)
-
-        context['onread'] = fldx.get_property('onread')
-        context['onwrite'] = fldx.get_property('onwrite')
-        context['singlepulse'] = fldx.get_property('singlepulse')
-        context['decrwidth'] = fldx.get_property('decrwidth') if fldx.get_property('decrwidth') is not None else 0
-        context['incrwidth'] = fldx.get_property('incrwidth') if fldx.get_property('incrwidth') is not None else 0
-        context['decrvalue'] = fldx.get_property('decrvalue') if fldx.get_property('decrvalue') is not None else 0
-        context['incrvalue'] = fldx.get_property('incrvalue') if fldx.get_property('incrvalue') is not None else 0
-        context['dtype'] = fldx.get_property('desyrdl_data_type') or 'uint'
+            self.top_intrs_tree[next_path] = intr_tree
+
+        context['decrwidth'] = props['decrwidth'] if props['decrwidth'] is not None else 0
+        context['incrwidth'] = props['incrwidth'] if props['incrwidth'] is not None else 0
+        context['decrvalue'] = props['decrvalue'] if props['decrvalue'] is not None else 0
+        context['incrvalue'] = props['incrvalue'] if props['incrvalue'] is not None else 0
+        context['dtype'] = props['desyrdl_data_type'] or 'uint'
         context['signed'] = self.get_data_type_sign(fldx)
         context['fixedpoint'] = self.get_data_type_fixed(fldx)
-        context['desc'] = fldx.get_property("desc") or ""
-        context['desc_html'] = fldx.get_html_desc(self.md) or ""
+        context['desc'] = props['desc'] or ""
+        context['desc_html'] = self.get_desc_html(fldx) or ""
         # check if we flag is set
         if (
             not fldx.is_virtual
             and fldx.is_hw_writable
             and fldx.is_sw_writable
-            and not fldx.get_property('we')
-            and fldx.parent.parent.get_property('desyrdl_generate_hdl') is True
+            and not props['we']
+            and self.get_props(fldx.parent.parent).get('desyrdl_generate_hdl') is True
             and not fldx.parent.is_interrupt_reg
         ):
             self.msg.warning(
-                f"missing 'we' flag. 'sw = {fldx.get_property('sw').name}' "
-                f"and 'hw = {fldx.get_property('hw').name}' both can write to the register filed. "
+                f"missing 'we' flag. 'sw = {props['sw'].name}' "
+                f"and 'hw = {props['hw'].name}' both can write to the register filed. "
                 f"'sw' will be always overwritten.\nRegister: {fldx.parent.inst_name}",
                 fldx.inst.property_src_ref.get('we', fldx.inst.def_src_ref),
             )
@@ -479,15 +673,16 @@ class DesyListener(RDLListener):
     # =========================================================================
     def gen_memitem(self, memx: MemNode, context):
         """Genrate context specyfic for MemNode items."""
-        context['entries'] = memx.get_property('mementries')
-        context['addresses'] = memx.get_property('mementries') * 4
-        context['datawidth'] = memx.get_property("memwidth")
-        context['addrwidth'] = ceil(log2(memx.get_property('mementries') * 4))
+        props = self.get_props(memx)
+        context['entries'] = props['mementries']
+        context['addresses'] = props['mementries'] * 4
+        context['datawidth'] = props['memwidth']
+        context['addrwidth'] = ceil(log2(props['mementries'] * 4))
         context['width'] = context['datawidth']
-        context['dtype'] = memx.get_property('desyrdl_data_type') or 'uint'
+        context['dtype'] = props['desyrdl_data_type'] or 'uint'
         context['signed'] = self.get_data_type_sign(memx)
         context['fixedpoint'] = self.get_data_type_fixed(memx)
-        context['sw'] = memx.get_property('sw').name
+        context['sw'] = props['sw'].name
         if not memx.is_sw_writable and memx.is_sw_readable:
             context['rw'] = "RO"
         elif memx.is_sw_writable and not memx.is_sw_readable:
@@ -517,6 +712,78 @@ class DesyListener(RDLListener):
         context['n_reg_insts'] = len(context['reg_insts'])
         context['n_regs'] = len(context['regs'])
 
+    # =========================================================================
+    def is_bram_item(self, item):
+        """Check if register or regfile array is mapped on block RAM.
+
+        Registers must be plain storage to fit in a RAM: 32 bit, sw read and write,
+        hw read only and no side effects of accesses. If not, the desyrdl_bram
+        property is ignored with a warning and flip-flops are used.
+        """
+        if not self.get_props(item).get('desyrdl_bram'):
+            return False
+        addrwidth = ceil(log2(item.total_size))
+        regs = [item] if isinstance(item, RegNode) else item.descendants()
+        reason = None
+        if not isinstance(item.parent, AddrmapNode):
+            reason = "supported for items of addrmap only"
+        elif not item.is_array:
+            reason = "supported for arrays only"
+        elif item.raw_address_offset % pow(2, addrwidth):
+            reason = f"array address not aligned to its size, align to 0x{pow(2, addrwidth):X}"
+        for reg in regs:
+            if reason is not None:
+                break
+            if not isinstance(reg, RegNode):
+                continue
+            if self.get_props(reg)['regwidth'] != 32 or reg.is_interrupt_reg:  # noqa: PLR2004
+                reason = f"register {reg.inst_name} is not 32 bit storage register"
+            for field in reg.fields():
+                if (
+                    not field.is_sw_readable
+                    or not field.is_sw_writable
+                    or field.is_hw_writable
+                    or field.is_up_counter
+                    or field.is_down_counter
+                    or any(
+                        self.get_props(field)[prop] for prop in ('onread', 'onwrite', 'singlepulse', 'swacc', 'swmod')
+                    )
+                ):
+                    reason = f"field {reg.inst_name}.{field.inst_name} is not sw = rw, hw = r without side effects"
+                    break
+        if reason is not None:
+            self.msg.warning(
+                f"desyrdl_bram {reason}, flip-flops used for {item.inst_name}.",
+                item.inst.property_src_ref.get('desyrdl_bram', item.inst.def_src_ref),
+            )
+            return False
+        return True
+
+    # =========================================================================
+    def gen_bramitem(self, item, context):
+        """Genrate context specyfic for register or regfile array on block RAM.
+
+        The RAM holds all words of the array, init words repeat with the array stride.
+        """
+        context['bram'] = True
+        context['entries'] = context['total_words']
+        context['datawidth'] = 32
+        context['addrwidth'] = ceil(log2(item.total_size))
+        init = [0] * (item.array_stride // 4)
+        regs = [item] if isinstance(item, RegNode) else item.descendants(unroll=True)
+        for reg in regs:
+            if not isinstance(reg, RegNode):
+                continue
+            offset = 0
+            node = reg
+            while node is not item:
+                offset += node.address_offset
+                node = node.parent
+            for field in reg.fields():
+                reset = self.get_props(field)['reset'] or 0
+                init[offset // 4] |= (reset & self.bitmask(field.width)) << field.low
+        context['bram_init'] = [f"{word:08X}" for word in init]
+
     # =========================================================================
     def bitmask(self, width):
         """Generate a bitmask filled with '1' with bit width equal to 'width'."""
@@ -535,56 +802,106 @@ class DesyListener(RDLListener):
 
     # =========================================================================
     def get_access_channel(self, node):
-        """Set proper access channel for the node based on parent."""
-        # Starting point for finding the top node
-        cur_node = node
-        ch = None
-        while ch is None:
-            try:
-                ch = cur_node.get_property('desyrdl_access_channel')
-                # The line above can return 'None' without raising an exception
-                if ch is None:
-                    message = "No access channel"
-                    raise ValueError(message)
-            except ValueError:
-                cur_node = cur_node.parent
-                if isinstance(cur_node, RootNode):
-                    return 0
-            except LookupError:
-                cur_node = cur_node.parent
-                # The RootNode is above the top node and can't have the property
-                # we are looking for.
-                if isinstance(cur_node, RootNode):
-                    print("ERROR: Couldn't find the access channel for " + node.inst_name)
-                    raise
-        return ch
+        """Set proper access channel for the node based on parent.
+
+        The channel is set in address maps, resolved once per address map instance
+        and inherited from the parents, 0 if not set in any.
+        """
+        while not isinstance(node, AddrmapNode):
+            node = node.parent
+        key = id(node.inst)
+        if key not in self.access_channels:
+            ch = self.get_props(node)['desyrdl_access_channel']
+            if ch is None:
+                ch = 0 if isinstance(node.parent, RootNode) else self.get_access_channel(node.parent)
+            self.access_channels[key] = ch
+        return self.access_channels[key]
+
+    # =========================================================================
+    def get_props(self, node):
+        """Return all properties of the node, resolved once per component instance.
+
+        Elements of arrays and of unrolled address maps share the component instance.
+        Values referencing other nodes depend on the node path, they are resolved
+        for each node. Do not modify the returned dictionary.
+        """
+        cache = self.inst_cache.setdefault(id(node.inst), {})
+        if 'props' not in cache:
+            props = {prop: self.resolve_property(node, prop) for prop in node.list_properties(list_all=True)}
+            cache['props'] = props
+            cache['refs'] = [prop for prop, value in props.items() if isinstance(value, (Node, PropertyReference))]
+        if not cache['refs']:
+            return cache['props']
+        props = dict(cache['props'])
+        for prop in cache['refs']:
+            props[prop] = self.resolve_property(node, prop)
+        return props
+
+    def resolve_property(self, node, prop):
+        """Return property value of the node."""
+        if prop == 'resetsignal' and prop not in node.inst.properties:
+            # the default searches the signals of all parents, once per register
+            return self.get_field_reset_signal(node.parent)
+        return node.get_property(prop)
+
+    def get_field_reset_signal(self, node):
+        """Return signal with field_reset set in the node or its parents, cached by node path."""
+        path = node.get_path()
+        if path not in self.reset_signals:
+            signal = next((signal for signal in node.signals() if signal.get_property('field_reset')), None)
+            if signal is None and node.parent is not None:
+                signal = self.get_field_reset_signal(node.parent)
+            self.reset_signals[path] = signal
+        return self.reset_signals[path]
+
+    def get_desc_html(self, node):
+        """Return description of the node converted to HTML, once per component instance."""
+        cache = self.inst_cache.setdefault(id(node.inst), {})
+        if 'desc_html' not in cache:
+            cache['desc_html'] = node.get_html_desc(self.md)
+        return cache['desc_html']
+
+    def get_type_name_org(self, node):
+        """Return type name of the original definition, before parametrization."""
+        return node.inst.original_def.type_name if node.inst.original_def is not None else node.type_name
 
     # =========================================================================
     def get_data_type_sign(self, node):
         """Get data sign value from DesyRDL datatype."""
-        datatype = str(node.get_property('desyrdl_data_type') or '')
-        pattern = "(^int.*|^fixed.*)"
-        if re.match(pattern, datatype):
-            return 1
-        return 0
+        return data_type_sign(str(self.get_props(node)['desyrdl_data_type'] or ''))
 
     # =========================================================================
     def get_data_type_fixed(self, node):
         """Get data fixpoint value from DesyRDL datatype."""
-        datatype = str(node.get_property('desyrdl_data_type') or '')
-        pattern_fix = ".*fixed([0-9-]*)"
-        pattern_fp = 'float'
-        srch_fix = re.search(pattern_fix, datatype.lower())
+        return data_type_fixed(str(self.get_props(node)['desyrdl_data_type'] or ''))
 
-        if srch_fix:
-            if srch_fix.group(1) == '':
-                return ''
-            return int(srch_fix.group(1))
 
-        if pattern_fp == datatype.lower():
-            return 'IEEE754'
+# =============================================================================
+@lru_cache(maxsize=None)
+def data_type_sign(datatype):
+    """Return 1 for signed DesyRDL data type, 0 otherwise."""
+    pattern = "(^int.*|^fixed.*)"
+    if re.match(pattern, datatype):
+        return 1
+    return 0
 
-        return 0
+
+@lru_cache(maxsize=None)
+def data_type_fixed(datatype):
+    """Return number of fractional bits of fixed point DesyRDL data type, 'IEEE754' for float, 0 otherwise."""
+    pattern_fix = ".*fixed([0-9-]*)"
+    pattern_fp = 'float'
+    srch_fix = re.search(pattern_fix, datatype.lower())
+
+    if srch_fix:
+        if srch_fix.group(1) == '':
+            return ''
+        return int(srch_fix.group(1))
+
+    if pattern_fp == datatype.lower():
+        return 'IEEE754'
+
+    return 0
 
 
 class DesyRdlProcessor(DesyListener):
@@ -593,17 +910,39 @@ class DesyRdlProcessor(DesyListener):
     Inherits from DesyListener and SystemRDL Listener.
     """
 
-    def __init__(self, tpl_dir, lib_dir, out_dir, out_formats):
+    def __init__(
+        self,
+        tpl_dir,
+        lib_dir,
+        out_dir,
+        out_formats,
+        *,
+        render_cache=None,
+        vhdl_per_type=False,
+        jobs=1,
+        profiler=None,
+        bytecode_dir=None,
+        sink=None,
+    ):
         super().__init__()
+        if profiler is not None:
+            self.profiler = profiler
 
         self.out_formats = out_formats
         self.lib_dir = lib_dir
         self.out_dir = out_dir
+        self.render_cache = render_cache
+        # rendered outputs are passed to the sink, written to files by default
+        self.sink = sink
+        # render VHDL once per address map type instead of once per instance
+        self.vhdl_per_type = vhdl_per_type
+        self.vhdl_types = {}
 
         self.generated_files = {}
         self.generated_files['vhdl'] = []
         self.generated_files['vhdl_dict'] = {}
         self.generated_files['cocotb'] = []
+        self.generated_files['model'] = []
         self.generated_files['map'] = []
         self.generated_files['h'] = []
         self.generated_files['adoc'] = []
@@ -612,25 +951,58 @@ class DesyRdlProcessor(DesyListener):
 
         self.top_context['generated_files'] = self.generated_files
 
-        # create Jinja template loaders, one loader per output type
-        prefix_loader_dict = {}
-        for out_format in out_formats:
-            prefix_loader_dict[out_format] = jinja2.FileSystemLoader(Path(tpl_dir / out_format))
-            prefix_loader_dict[out_format + "_lib"] = jinja2.FileSystemLoader(Path(lib_dir / out_format))
-            tpl_loader = jinja2.PrefixLoader(prefix_loader_dict)
-
-        self.jinja2_env = jinja2.Environment(
-            loader=tpl_loader,
-            autoescape=jinja2.select_autoescape(),
-            undefined=jinja2.StrictUndefined,
-            line_statement_prefix="--#",
-        )
+        # Jinja environment is created on first render, not at all if all outputs are cached
+        self.tpl_dir = tpl_dir
+        self.bytecode_dir = bytecode_dir
+        self._jinja2_env = None
+
+        # templates are rendered in a process pool if more than one job is used,
+        # the pool is started on the first render, not at all if all outputs are cached
+        self.jobs = jobs
+        self.render_pool = None
+        self.render_futures = []
+
+    # =========================================================================
+    @property
+    def jinja2_env(self):
+        """Return Jinja environment, created on first use."""
+        if self._jinja2_env is None:
+            self._jinja2_env = get_environment(self.tpl_dir, self.lib_dir, self.out_formats, self.bytecode_dir)
+        return self._jinja2_env
+
+    def template_dirs(self, loader):
+        """Return list of directories of the loader templates."""
+        if loader.endswith("_lib"):
+            return [Path(self.lib_dir / loader[:-4])]
+        return [Path(self.tpl_dir / loader)]
 
     # =========================================================================
     def get_generated_files(self):
         """Return generated files variable value."""
         return self.generated_files
 
+    # =========================================================================
+    def get_vhdl_name(self, context):
+        """Return name of the VHDL output folder and library of the address map.
+
+        In per type mode all instances of the same type share one VHDL output.
+        Instances with a different elaborated type, e.g. due to parameters,
+        fall back to the per instance output.
+        """
+        if not self.vhdl_per_type:
+            return context['inst_name']
+        type_name_org = context['type_name_org']
+        type_name = self.vhdl_types.setdefault(type_name_org, context['type_name'])
+        if type_name != context['type_name']:
+            src_ref = context['node'].inst.inst_src_ref if isinstance(context['node'], Node) else None
+            self.msg.warning(
+                f"Address map type '{context['type_name']}' differs from '{type_name}' of the same original "
+                f"type '{type_name_org}'. VHDL is generated for instance '{context['inst_name']}'.",
+                src_ref,
+            )
+            return context['inst_name']
+        return type_name_org
+
     # =========================================================================
     def exit_Addrmap(self, node: AddrmapNode):
         """
@@ -640,62 +1012,236 @@ class DesyRdlProcessor(DesyListener):
 
         super().exit_Addrmap(node)
 
-        # formats to generate per address mapp
-        if 'vhdl' in self.out_formats:
-            if node.get_property('desyrdl_generate_hdl') is None or node.get_property('desyrdl_generate_hdl') is True:
-                print(f"VHDL for: {node.inst_name} ({node.type_name})")
+        self.render_addrmap(self.context)
+        # formats to generate on top
+        if isinstance(node.parent, RootNode):
+            self.render_top()
 
-                files = self.render_templates(loader="vhdl", outdir="vhdl", context=self.context)
-                self.generated_files['vhdl'] = self.generated_files['vhdl'] + files
-                self.generated_files["vhdl_dict"][node.inst_name] = files
+    # =========================================================================
+    def render_model(self, top_context):
+        """Render templates from the top context of a saved model, without the walk."""
+        self.top_context = top_context
+        self.top_context['generated_files'] = self.generated_files
+        for context in top_context['addrmaps']:
+            self.render_addrmap(context)
+        self.render_top()
+
+    # =========================================================================
+    def render_addrmap(self, context):
+        """Render templates of the formats generated per address map."""
+        if 'vhdl' in self.out_formats:
+            if context['generate_hdl'] is None or context['generate_hdl'] is True:
+                vhdl_name = self.get_vhdl_name(context)
+                if self.vhdl_per_type and vhdl_name in self.generated_files["vhdl_dict"]:
+                    print(f"VHDL for: {context['inst_name']} ({context['type_name']}) shared in {vhdl_name}")
+                else:
+                    print(f"VHDL for: {context['inst_name']} ({context['type_name']})")
+                    # output folder is named by inst_name in VHDL include file
+                    if vhdl_name != context['inst_name']:
+                        context = dict(context, inst_name=vhdl_name)
+                    files = self.render_templates(loader="vhdl", outdir="vhdl", context=context)
+                    self.generated_files['vhdl'] = self.generated_files['vhdl'] + files
+                    self.generated_files["vhdl_dict"][vhdl_name] = files
 
         if 'adoc' in self.out_formats:
-            print(f"ASCIIDOC for: {node.inst_name} ({node.type_name})")
-            files = self.render_templates(loader="adoc", outdir="adoc", context=self.context)
+            print(f"ASCIIDOC for: {context['inst_name']} ({context['type_name']})")
+            files = self.render_templates(loader="adoc", outdir="adoc", context=context)
             self.generated_files["adoc"] = self.generated_files['adoc'] + files
 
-        # formats to generate on top
-        if isinstance(node.parent, RootNode):
-            if 'vhdl' in self.out_formats:
-                files = self.render_templates(loader="vhdl_lib", outdir="vhdl", context=self.top_context)
-                self.generated_files["vhdl"] = files + self.generated_files['vhdl']
-                self.generated_files['vhdl_dict']['desyrdl'] = files
+    # =========================================================================
+    def render_top(self):
+        """Render templates of the formats generated once for the top address map."""
+        if 'vhdl' in self.out_formats:
+            files = self.render_templates(loader="vhdl_lib", outdir="vhdl", context=self.top_context)
+            self.generated_files["vhdl"] = files + self.generated_files['vhdl']
+            self.generated_files['vhdl_dict']['desyrdl'] = files
+
+        if 'map' in self.out_formats:
+            files = self.render_templates(loader="map", outdir="map", context=self.top_context)
+            self.generated_files['map'] = self.generated_files['map'] + files
+
+        if 'h' in self.out_formats:
+            files = self.render_templates(loader="h", outdir="h", context=self.top_context)
+            self.generated_files['h'] = self.generated_files['h'] + files
 
-            if 'map' in self.out_formats:
-                files = self.render_templates(loader="map", outdir="map", context=self.top_context)
-                self.generated_files['map'] = self.generated_files['map'] + files
+        if 'cocotb' in self.out_formats:
+            files = self.render_templates(loader="cocotb", outdir="cocotb", context=self.top_context)
+            self.generated_files['cocotb'] = self.generated_files['cocotb'] + files
 
-            if 'h' in self.out_formats:
-                files = self.render_templates(loader="h", outdir="h", context=self.top_context)
-                self.generated_files['h'] = self.generated_files['h'] + files
+        if 'model' in self.out_formats:
+            files = self.render_templates(loader="model", outdir="model", context=self.top_context)
+            self.generated_files['model'] = self.generated_files['model'] + files
 
-            if 'cocotb' in self.out_formats:
-                files = self.render_templates(loader="cocotb", outdir="cocotb", context=self.top_context)
-                self.generated_files['h'] = self.generated_files['cocotb'] + files
+        if 'tcl' in self.out_formats:
+            files = self.render_templates(loader="tcl", outdir="tcl", context=self.top_context)
+            self.generated_files['tcl'] = self.generated_files['tcl'] + files
 
-            if 'tcl' in self.out_formats:
-                files = self.render_templates(loader="tcl", outdir="tcl", context=self.top_context)
-                self.generated_files['tcl'] = self.generated_files['tcl'] + files
+        self.wait_render()
 
     # =========================================================================
     def render_templates(self, loader, outdir, context):
-        """Render template to outdir using jinja loader and context dictionary."""
-        generated_files = []
+        """Render template to outdir using jinja loader and context dictionary.
+
+        If the render cache is used and neither the templates nor the context
+        changed since the last run, the rendering is skipped. With a render
+        pool the templates are rendered in the background, the list of files
+        is known in advance from the include file.
+        """
+        # formats rendered from top context are marked with *
+        addrmap = context.get('path', '*')
+        digest = None
+        if self.render_cache is not None:
+            with self.profiler.phase('cache', addrmap, loader):
+                digest = self.render_cache.digest(loader, self.template_dirs(loader), context)
+                generated_files = self.render_cache.lookup(digest)
+            if generated_files is not None:
+                return generated_files
+
         # get templates list and theyir ouput from include file
         template = self.jinja2_env.get_template(loader + "/include.txt")
         tpl_list = template.render(context).split()
 
-        # render template list and save in out
+        # list of templates and their out files
+        # as_posix() ensures forward slashes, also supported by Tcl on Windows,
+        # see https://www.tcl.tk/man/tcl8.3/TclCmd/filename.htm#M22
+        templates = []
         for tplidx in range(0, len(tpl_list), 2):
-            # get template
-            template = self.jinja2_env.get_template(loader + "/" + tpl_list[tplidx])
-            # create out dir if needed
             out_file_path = Path(self.out_dir / outdir / tpl_list[tplidx + 1])
-            out_file_path.parents[0].mkdir(parents=True, exist_ok=True)
-            # render template and stream it directly to out file
-            template.stream(context).dump(str(out_file_path.resolve()))
-            # as_posix() ensures forward slashes, also supported by Tcl on Windows,
-            # see https://www.tcl.tk/man/tcl8.3/TclCmd/filename.htm#M22
-            generated_files.append(out_file_path.as_posix())
-            # self.generated_files[outdir].append(outFilePath)
+            templates.append((loader + "/" + tpl_list[tplidx], out_file_path.as_posix()))
+        generated_files = [fname for _, fname in templates]
+
+        if self.jobs <= 1:
+            render_template_list(self.jinja2_env, templates, context, self.profiler, self.sink)
+            if self.render_cache is not None:
+                self.render_cache.store(digest, generated_files)
+        else:
+            # context is copied without nodes, it is pickled to the worker
+            # outputs of a custom sink are returned from the worker and passed to the sink here
+            if self.render_pool is None:
+                self.render_pool = ProcessPoolExecutor(
+                    max_workers=self.jobs,
+                    initializer=init_render_worker,
+                    initargs=(self.tpl_dir, self.lib_dir, self.out_formats, self.bytecode_dir),
+                )
+            future = self.render_pool.submit(
+                render_worker, templates, freeze_context(context), collect=self.sink is not None
+            )
+            self.render_futures.append((future, digest, generated_files, templates, context))
         return generated_files
+
+    # =========================================================================
+    def wait_render(self):
+        """Wait for all templates rendered in the render pool.
+
+        Templates using node members which are not kept in the frozen context
+        are rendered again in this process. The pool is shut down also if
+        rendering failed, pending renders are cancelled.
+        """
+        try:
+            for future, digest, generated_files, templates, context in self.render_futures:
+                try:
+                    outputs = future.result()
+                except NodeSnapshotError:
+                    render_template_list(self.jinja2_env, templates, context, self.profiler, self.sink)
+                    outputs = []
+                for out_file, content in outputs:
+                    self.sink(out_file, content)
+                if self.render_cache is not None:
+                    self.render_cache.store(digest, generated_files)
+        finally:
+            self.close()
+
+    def close(self):
+        """Shut down the render pool, pending renders are cancelled.
+
+        Called when the generation ends, also if the walk failed before all
+        renders were submitted.
+        """
+        # same as shutdown(cancel_futures=True), available since Python 3.9
+        for future, *_ in self.render_futures:
+            future.cancel()
+        self.render_futures = []
+        if self.render_pool is not None:
+            self.render_pool.shutdown()
+            self.render_pool = None
+
+
+# =============================================================================
+def create_environment(tpl_dir, lib_dir, out_formats, bytecode_dir=None):
+    """Create Jinja environment, one loader per output format and its library.
+
+    Compiled templates are stored in the bytecode cache directory if given,
+    Jinja invalidates them by the checksum of the template source.
+    """
+    bytecode_cache = None
+    if bytecode_dir is not None:
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(bytecode_dir))
+    prefix_loader_dict = {}
+    for out_format in out_formats:
+        prefix_loader_dict[out_format] = jinja2.FileSystemLoader(Path(tpl_dir / out_format))
+        prefix_loader_dict[out_format + "_lib"] = jinja2.FileSystemLoader(Path(lib_dir / out_format))
+    tpl_loader = jinja2.PrefixLoader(prefix_loader_dict)
+
+    return jinja2.Environment(
+        loader=tpl_loader,
+        autoescape=jinja2.select_autoescape(),
+        undefined=jinja2.StrictUndefined,
+        line_statement_prefix="--#",
+        bytecode_cache=bytecode_cache,
+    )
+
+
+# environments created in this process, reused by later processors, e.g. in watch mode
+_environments = {}
+
+
+def get_environment(tpl_dir, lib_dir, out_formats, bytecode_dir=None):
+    """Return Jinja environment, created once per process for the same directories and formats.
+
+    Jinja checks the modification time of loaded templates, changed templates are reloaded.
+    """
+    key = (str(tpl_dir), str(lib_dir), tuple(out_formats), str(bytecode_dir))
+    if key not in _environments:
+        _environments[key] = create_environment(tpl_dir, lib_dir, out_formats, bytecode_dir)
+    return _environments[key]
+
+
+# =============================================================================
+def render_template_list(jinja2_env, templates, context, profiler=None, sink=None):
+    """Render list of (template name, out file) pairs with context.
+
+    Each output is passed to sink(out_file, content), by default the out file
+    is written only if its content changed.
+    """
+    if profiler is None:
+        profiler = Profiler()
+    if sink is None:
+        sink = write_if_changed
+    addrmap = context.get('path', '*')
+    for tpl_name, out_file in templates:
+        with profiler.phase('render', addrmap, tpl_name):
+            template = jinja2_env.get_template(tpl_name)
+            sink(out_file, template.render(context))
+
+
+# -----------------------------------------------------------------------------
+# render pool worker process
+_worker_env = None
+
+
+def init_render_worker(tpl_dir, lib_dir, out_formats, bytecode_dir=None):
+    """Initialize Jinja environment of the render worker process."""
+    global _worker_env  # noqa: PLW0603
+    _worker_env = create_environment(tpl_dir, lib_dir, out_formats, bytecode_dir)
+
+
+def render_worker(templates, context, *, collect=False):
+    """Render list of templates in the worker process.
+
+    If collect is set the outputs are not written, list of (out file, content)
+    pairs is returned instead.
+    """
+    outputs = []
+    sink = (lambda out_file, content: outputs.append((out_file, content))) if collect else None
+    render_template_list(_worker_env, templates, context, sink=sink)
+    return outputs
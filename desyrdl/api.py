@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# --------------------------------------------------------------------------- #
+#           ____  _____________  __                                           #
+#          / __ \/ ____/ ___/\ \/ /                 _   _   _                 #
+#         / / / / __/  \__ \  \  /                 / \ / \ / \                #
+#        / /_/ / /___ ___/ /  / /               = ( M | S | K )=              #
+#       /_____/_____//____/  /_/                   \_/ \_/ \_/                #
+#                                                                             #
+# --------------------------------------------------------------------------- #
+# @copyright Copyright 2026 DESY
+# SPDX-License-Identifier: Apache-2.0
+# --------------------------------------------------------------------------- #
+# @date 2026-10-18
+# --------------------------------------------------------------------------- #
+"""DesyRdl library interface.
+
+Generates outputs within the calling process, e.g. of a build system
+generating many designs. RDL sources are files or strings, the outputs are
+returned in memory or passed to a sink. Errors raise RDLCompileError instead
+of exiting. The RDL libraries are compiled once and shared by all designs
+generated with the same RdlLibrary object::
+
+    library = RdlLibrary(user_lib_dirs=["rdl_lib"])
+    outputs = render(["module.rdl", RdlText(top_rdl, "top")], ["vhdl", "h"], library=library)
+    generate(["module.rdl"], ["vhdl"], out_dir="out", library=library)
+"""
+
+import copy
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+from systemrdl import RDLCompileError, RDLCompiler, RDLWalker
+from systemrdl.node import RootNode
+
+from desyrdl.DesyListener import DesyRdlProcessor
+from desyrdl.profiler import Profiler
+from desyrdl.rendercache import bytecode_cache_dir
+
+# default templates and libraries
+TPL_DIR = Path(__file__).parent.resolve() / "templates"
+LIB_DIR = Path(__file__).parent.resolve() / "libraries"
+
+OUT_FORMATS = ('vhdl', 'map', 'h', 'adoc', 'cocotb', 'model', 'tcl')
+
+#: RDL source given as string, name is used for the messages
+RdlText = namedtuple('RdlText', ['text', 'name'], defaults=['rdl_text'])
+
+
+# =============================================================================
+def library_files(lib_dir=LIB_DIR, user_lib_dirs=()):
+    """Return RDL files of the DesyRDL and user libraries in compile order, sorted ignoring dir."""
+    lib_input_files = list(Path(Path(lib_dir) / "rdl").glob("*.rdl"))
+    for user_lib_dir in user_lib_dirs:
+        lib_input_files.extend(Path(user_lib_dir).glob("*.rdl"))
+    return sorted(lib_input_files, key=lambda f: f.parts[-1])
+
+
+# =============================================================================
+class RdlLibrary:
+    """RDL library files compiled once, shared by the designs compiled with it.
+
+    Holds the compiler state after the DesyRDL and user libraries, every
+    design is compiled by a copy of it.
+    """
+
+    def __init__(self, user_lib_dirs=(), lib_dir=LIB_DIR, message_printer=None, profiler=None):
+        if profiler is None:
+            profiler = Profiler()
+        self.lib_dir = Path(lib_dir)
+        self.rdlfiles = library_files(self.lib_dir, user_lib_dirs)
+
+        kwargs = {} if message_printer is None else {'message_printer': message_printer}
+        self.rdlc = RDLCompiler(**kwargs)
+        for rdlfile in self.rdlfiles:
+            with profiler.phase('compile', item=rdlfile.name):
+                self.rdlc.compile_file(str(rdlfile))
+
+    # =========================================================================
+    def compile(self, sources, src_dir=None, profiler=None):
+        """Compile and elaborate sources on a copy of the library compiler, return top node.
+
+        Sources given as RdlText are written to src_dir, they must stay there
+        as long as messages may refer to them.
+        """
+        if profiler is None:
+            profiler = Profiler()
+        rdlc = copy.deepcopy(self.rdlc)
+        for idx, source in enumerate(sources):
+            if isinstance(source, RdlText):
+                rdlfile = Path(src_dir) / f"{idx:03d}_{source.name}.rdl"
+                rdlfile.write_text(source.text)
+            else:
+                rdlfile = Path(source)
+            with profiler.phase('compile', item=rdlfile.name):
+                rdlc.compile_file(str(rdlfile))
+        with profiler.phase('elaborate'):
+            root = rdlc.elaborate()
+        if not isinstance(root, RootNode):
+            msg = "root is not a RootNode"
+            raise RDLCompileError(msg)
+        return root.top
+
+
+# =============================================================================
+def generate(sources, out_formats, *, out_dir=None, sink=None, library=None, tpl_dir=None, vhdl_per_type=False, jobs=1):
+    """Compile RDL sources, in bottom to root order, and generate the output formats.
+
+    Sources are file paths or RdlText strings. Output file paths are
+    relative to out_dir, or the current dir if it is not given. Each output
+    is passed to sink(path, content), by default written to the file if its
+    content changed.
+
+    Return dictionary of the lists of output files per format. Raise
+    RDLCompileError if the sources cannot be compiled or are not supported,
+    ValueError for unknown output formats.
+    """
+    for out_format in out_formats:
+        if out_format not in OUT_FORMATS:
+            msg = f"Unknown output format '{out_format}', supported: {', '.join(OUT_FORMATS)}"
+            raise ValueError(msg)
+    if library is None:
+        library = RdlLibrary()
+    tpl_dir = TPL_DIR if tpl_dir is None else Path(tpl_dir).resolve()
+    out_dir = Path() if out_dir is None else Path(out_dir)
+
+    listener = DesyRdlProcessor(
+        tpl_dir,
+        library.lib_dir,
+        out_dir,
+        list(out_formats),
+        vhdl_per_type=vhdl_per_type,
+        jobs=jobs,
+        bytecode_dir=bytecode_cache_dir(),
+        sink=sink,
+    )
+    with tempfile.TemporaryDirectory(prefix="desyrdl_") as src_dir:
+        top_node = library.compile(sources, src_dir)
+        try:
+            RDLWalker(unroll=False).walk(top_node, listener)
+        finally:
+            # render pool is shut down also if the walk failed
+            listener.close()
+
+    generated_files = listener.get_generated_files()
+    return {out_format: generated_files[out_format] for out_format in out_formats}
+
+
+# =============================================================================
+def render(sources, out_formats, **kwargs):
+    """Compile RDL sources and return dictionary of the output contents by file path.
+
+    Nothing is written, other arguments are the same as for generate().
+    """
+    outputs = {}
+    generate(sources, out_formats, sink=outputs.__setitem__, **kwargs)
+    return outputs
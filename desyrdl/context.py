@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+# --------------------------------------------------------------------------- #
+#           ____  _____________  __                                           #
+#          / __ \/ ____/ ___/\ \/ /                 _   _   _                 #
+#         / / / / __/  \__ \  \  /                 / \ / \ / \                #
+#        / /_/ / /___ ___/ /  / /               = ( M | S | K )=              #
+#       /_____/_____//____/  /_/                   \_/ \_/ \_/                #
+#                                                                             #
+# --------------------------------------------------------------------------- #
+# @copyright Copyright 2026 DESY
+# SPDX-License-Identifier: Apache-2.0
+# --------------------------------------------------------------------------- #
+# @date 2026-10-18
+# --------------------------------------------------------------------------- #
+"""DesyRdl context helpers.
+
+Context dictionaries hold references to the nodes of the compiled SystemRDL
+tree. Frozen contexts replace them with snapshots of the node attributes used
+by the templates, so they can be pickled and rendered without the compiler.
+"""
+
+from systemrdl.node import AddressableNode, FieldNode, MemNode, Node, RegNode
+from systemrdl.rdltypes import PropertyReference, UserEnum, UserStruct
+
+
+class AttributeDict(dict):
+    """Class to convert dict to attributes of object."""
+
+    __getattr__ = dict.get
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+
+# node attributes kept in the snapshot, per node type
+NODE_ATTRIBUTES = {
+    Node: ('inst_name', 'type_name', 'orig_type_name', 'external'),
+    AddressableNode: (
+        'is_array',
+        'array_dimensions',
+        'array_stride',
+        'raw_address_offset',
+        'raw_absolute_address',
+        'size',
+        'total_size',
+    ),
+    FieldNode: (
+        'width',
+        'low',
+        'high',
+        'msb',
+        'lsb',
+        'is_virtual',
+        'is_volatile',
+        'is_sw_readable',
+        'is_sw_writable',
+        'is_hw_readable',
+        'is_hw_writable',
+        'implements_storage',
+        'is_up_counter',
+        'is_down_counter',
+    ),
+    RegNode: (
+        'has_sw_readable',
+        'has_sw_writable',
+        'has_hw_readable',
+        'has_hw_writable',
+        'is_interrupt_reg',
+        'is_virtual',
+        'is_alias',
+    ),
+    MemNode: ('is_sw_readable', 'is_sw_writable'),
+}
+
+
+class NodeSnapshotError(Exception):
+    """Template used a node member which is not kept in node snapshots.
+
+    Not an AttributeError, so Jinja does not turn it into an undefined value.
+    """
+
+
+class NodeSnapshot(AttributeDict):
+    """Node-free copy of the node attributes, used in frozen contexts.
+
+    Only the attributes of NODE_ATTRIBUTES are kept, other node members, e.g.
+    methods used by custom templates, raise NodeSnapshotError.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            if name.startswith('_'):
+                raise AttributeError(name) from None
+            msg = f"{self['node_class']} {self['path']}: node member '{name}' is not kept in the saved model"
+            raise NodeSnapshotError(msg) from None
+
+    @classmethod
+    def from_node(cls, node: Node):
+        """Create snapshot of the node attributes."""
+        snapshot = cls()
+        snapshot['node_class'] = type(node).__name__
+        snapshot['path'] = node.get_path()
+        for node_type, attributes in NODE_ATTRIBUTES.items():
+            if isinstance(node, node_type):
+                for attribute in attributes:
+                    snapshot[attribute] = getattr(node, attribute)
+        return snapshot
+
+
+# =============================================================================
+class ContextItem:
+    """Base of compact item contexts.
+
+    Values are stored in slots, other values, e.g. SystemRDL properties, in
+    the props dictionary. Values are accessible as attributes and as items,
+    missing values read as None like in AttributeDict.
+    """
+
+    __slots__ = ('props',)
+    slot_order = ()
+    slot_names = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        slots = []
+        for klass in reversed(cls.__mro__):
+            slots.extend(slot for slot in klass.__dict__.get('__slots__', ()) if slot != 'props')
+        cls.slot_order = tuple(slots)
+        cls.slot_names = frozenset(slots)
+
+    def __init__(self):
+        self.props = {}
+
+    def __getattr__(self, name):
+        # called only for unset slots and names not in slots
+        if name.startswith('__') or name == 'props':
+            raise AttributeError(name)
+        return self.props.get(name)
+
+    def __setattr__(self, name, value):
+        if name in self.slot_names or name == 'props':
+            object.__setattr__(self, name, value)
+        else:
+            self.props[name] = value
+
+    def __getitem__(self, key):
+        if key in self.slot_names:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self.props[key]
+
+    def __setitem__(self, key, value):
+        self.__setattr__(key, value)
+
+    def __contains__(self, key):
+        if key in self.slot_names:
+            try:
+                object.__getattribute__(self, key)
+            except AttributeError:
+                return False
+            return True
+        return key in self.props
+
+    def __getstate__(self):
+        state = {}
+        for slot in ('props', *self.slot_order):
+            try:
+                state[slot] = object.__getattribute__(self, slot)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            object.__setattr__(self, slot, value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def get(self, key, default=None):
+        """Return value of key or default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """Return list of set keys, slots first."""
+        keys = []
+        for slot in self.slot_order:
+            try:
+                object.__getattribute__(self, slot)
+            except AttributeError:
+                continue
+            keys.append(slot)
+        keys.extend(self.props)
+        return keys
+
+    def items(self):
+        """Return list of (key, value) pairs."""
+        return [(key, self[key]) for key in self.keys()]
+
+    def copy(self):
+        """Return shallow copy."""
+        item = type(self)()
+        for key, value in self.items():
+            item[key] = value
+        return item
+
+
+class ItemContext(ContextItem):
+    """Context of an addressable item in address map, regfile or memory."""
+
+    __slots__ = (
+        'absolute_address',
+        'absolute_address_high',
+        'access_channel',
+        'address_offset',
+        'address_offset_high',
+        'array_stride',
+        'desc',
+        'desc_html',
+        'dim',
+        'dim_m',
+        'dim_n',
+        'dtype',
+        'elements',
+        'fixedpoint',
+        'idx',
+        'inst_name',
+        'node',
+        'node_type',
+        'rw',
+        'signed',
+        'total_size',
+        'total_words',
+        'type_name',
+        'type_name_org',
+        'width',
+    )
+
+
+class RegContext(ItemContext):
+    """Register item context."""
+
+    __slots__ = ('fields', 'fields_count', 'intr', 'intr_line', 'intr_opts', 'intrch', 'reset', 'reset_hex')
+
+
+class RegfileContext(ItemContext):
+    """Regfile item context."""
+
+    __slots__ = ('insts', 'n_reg_insts', 'n_regs', 'reg_insts', 'reg_type_names', 'reg_types', 'regs')
+
+
+class MemContext(RegfileContext):
+    """Memory item context."""
+
+    __slots__ = ('addresses', 'addrwidth', 'datawidth', 'entries', 'sw')
+
+
+class AddrmapItemContext(ItemContext):
+    """External address map item context."""
+
+    __slots__ = ('addrwidth', 'interface')
+
+
+class FieldContext(ContextItem):
+    """Register field context."""
+
+    __slots__ = (
+        'const',
+        'decrvalue',
+        'decrwidth',
+        'desc',
+        'desc_html',
+        'dtype',
+        'fixedpoint',
+        'high',
+        'hw',
+        'incrvalue',
+        'incrwidth',
+        'inst_name',
+        'intr_line',
+        'intrtype',
+        'low',
+        'mask',
+        'mask_hex',
+        'node',
+        'onread',
+        'onwrite',
+        'reset',
+        'reset_hex',
+        'rw',
+        'signed',
+        'singlepulse',
+        'sw',
+        'type_name',
+        'type_name_org',
+        'width',
+    )
+
+
+class ArrayElement(ContextItem):
+    """Element of an unrolled array instance.
+
+    Lightweight view of the array item context, the addresses are computed
+    from the element number and array stride.
+    """
+
+    __slots__ = ('base', 'element', 'idx')
+    view_keys = frozenset(('idx', 'address_offset', 'absolute_address', 'address_offset_high', 'absolute_address_high'))
+
+    def __init__(self, base=None, idx=0, element=0):
+        object.__setattr__(self, 'props', None)
+        object.__setattr__(self, 'base', base)
+        object.__setattr__(self, 'idx', idx)
+        object.__setattr__(self, 'element', element)
+
+    def _view_value(self, name):
+        base = self.base
+        if name == 'idx':
+            return self.idx
+        if name in ('address_offset', 'absolute_address'):
+            return base[name] + base['array_stride'] * self.element
+        # high addresses, element size is the stride in arrays
+        if base['node'].is_array:
+            return self._view_value(name[:-5]) + base['array_stride'] - 1
+        return base[name]
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('props', 'base'):
+            raise AttributeError(name)
+        return self.get(name)
+
+    def __setattr__(self, name, value):
+        if self.props is None:
+            object.__setattr__(self, 'props', {})
+        self.props[name] = value
+
+    def __getitem__(self, key):
+        if self.props is not None and key in self.props:
+            return self.props[key]
+        if key in self.view_keys:
+            return self._view_value(key)
+        return self.base[key]
+
+    def __contains__(self, key):
+        return key in self.view_keys or key in self.base or (self.props is not None and key in self.props)
+
+    def keys(self):
+        """Return list of keys of the array item and view."""
+        keys = list(self.base.keys())
+        keys.extend(key for key in self.view_keys if key not in keys)
+        if self.props is not None:
+            keys.extend(key for key in self.props if key not in keys)
+        return keys
+
+    def copy(self):
+        """Return copy of the view."""
+        item = ArrayElement(self.base, self.idx, self.element)
+        if self.props is not None:
+            object.__setattr__(item, 'props', dict(self.props))
+        return item
+
+
+# =============================================================================
+def freeze_context(context, memo=None):
+    """Return node-free copy of the context.
+
+    Nodes are replaced with snapshots, references and user defined types with
+    attribute dictionaries. Containers shared in the context are shared in the
+    copy too.
+    """
+    if memo is None:
+        memo = {}
+    return _freeze(context, memo)
+
+
+def _freeze(obj, memo):
+    """Recursively freeze object."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if id(obj) in memo:
+        return memo[id(obj)][1]
+
+    if isinstance(obj, Node):
+        frozen = NodeSnapshot.from_node(obj)
+    elif isinstance(obj, PropertyReference):
+        frozen = AttributeDict(name=obj.name, node=_freeze(obj.node, memo))
+    elif isinstance(obj, UserEnum):
+        frozen = AttributeDict(name=obj.name, value=obj.value, rdl_name=obj.rdl_name, rdl_desc=obj.rdl_desc)
+    elif isinstance(obj, UserStruct):
+        frozen = AttributeDict()
+        for key, value in obj.members.items():
+            frozen[key] = _freeze(value, memo)
+    elif isinstance(obj, ArrayElement):
+        frozen = ArrayElement(_freeze(obj.base, memo), obj.idx, obj.element)
+        for key, value in (obj.props or {}).items():
+            frozen[key] = _freeze(value, memo)
+    elif isinstance(obj, (dict, ContextItem)):
+        frozen = type(obj)()
+        # register before descending, keeps the original alive to preserve id
+        memo[id(obj)] = (obj, frozen)
+        for key, value in obj.items():
+            frozen[key] = _freeze(value, memo)
+    elif isinstance(obj, list):
+        frozen = []
+        memo[id(obj)] = (obj, frozen)
+        frozen.extend(_freeze(value, memo) for value in obj)
+    elif isinstance(obj, tuple):
+        frozen = tuple(_freeze(value, memo) for value in obj)
+    else:
+        # built-in enumerations and other plain values
+        frozen = obj
+    memo[id(obj)] = (obj, frozen)
+    return frozen
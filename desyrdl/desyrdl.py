@@ -20,14 +20,27 @@ Use of Python SystemRDL compiler to generate VHDL and address map artifacts.
 """
 
 import argparse
+import functools
+import os
 import sys
+import time
 from pathlib import Path
 
-from systemrdl import RDLCompiler, RDLWalker
+from systemrdl import RDLCompileError, RDLWalker
 from systemrdl.messages import MessagePrinter, Severity
-from systemrdl.node import RootNode
 
+from desyrdl.api import RdlLibrary, library_files
+from desyrdl.context import NodeSnapshotError
 from desyrdl.DesyListener import DesyRdlProcessor
+from desyrdl.model import load_model, save_model
+from desyrdl.profiler import Profiler
+from desyrdl.rendercache import RenderCache, bytecode_cache_dir, write_if_changed
+
+# seconds between checks of the watched files
+WATCH_INTERVAL = 0.5
+
+# compiled libraries with the state of their files, reused by later runs in watch mode
+_libraries = {}
 
 
 def main():
@@ -47,9 +60,9 @@ def main():
         '--input-files',
         dest="input_files",
         metavar='file1.rdl',
-        required=True,
         nargs='+',
-        help='input rdl file/files, in bottom to root order',
+        default=[],
+        help='input rdl file/files, in bottom to root order, optional with --load-model',
     )
     arg_parser.add_argument(
         '-f',
@@ -58,7 +71,7 @@ def main():
         metavar='FORMAT',
         required=True,
         nargs='+',  # allow multiple values
-        choices=['vhdl', 'map', 'h', 'adoc', 'cocotb', 'tcl'],
+        choices=['vhdl', 'map', 'h', 'adoc', 'cocotb', 'model', 'tcl'],
         help='output format: vhdl, map, h',
     )
     arg_parser.add_argument(
@@ -82,8 +95,62 @@ def main():
     arg_parser.add_argument(
         '-t', '--templates-dir', dest="tpl_dir", metavar='DIR', help='[optional] location of templates dir'
     )
+    arg_parser.add_argument(
+        '--vhdl-per-type',
+        dest="vhdl_per_type",
+        action='store_true',
+        help='[optional] generate VHDL once per address map type, shared by all its instances',
+    )
+    arg_parser.add_argument(
+        '-j',
+        '--jobs',
+        dest="jobs",
+        metavar='N',
+        type=int,
+        default=1,
+        help='[optional] number of processes rendering templates, 0 for number of CPUs, default 1',
+    )
+    arg_parser.add_argument(
+        '--save-model',
+        dest="save_model",
+        metavar='FILE',
+        help='[optional] save the compiled address space model to FILE',
+    )
+    arg_parser.add_argument(
+        '--load-model',
+        dest="load_model",
+        metavar='FILE',
+        help='[optional] load the address space model from FILE instead of compiling the input files, '
+        'templates using node members not kept in the model need the input files, which are then compiled',
+    )
+    arg_parser.add_argument(
+        '--no-cache',
+        dest="no_cache",
+        action='store_true',
+        help='[optional] do not use render and template caches, render and write all output files',
+    )
+    arg_parser.add_argument(
+        '--watch',
+        dest="watch",
+        action='store_true',
+        help='[optional] keep running and generate again when input, library or template files change',
+    )
+    arg_parser.add_argument(
+        '--profile',
+        dest="profile",
+        action='store_true',
+        help='[optional] print time and memory of the generation phases, per address map and template',
+    )
+    arg_parser.add_argument(
+        '--profile-json',
+        dest="profile_json",
+        action='store_true',
+        help='[optional] profile and save the report to gen_profile.json in the output directory',
+    )
 
     args = arg_parser.parse_args()
+    if not args.input_files and args.load_model is None:
+        arg_parser.error("the following arguments are required: -i/--input-files")
 
     # compiler print log
     msg_severity = Severity(5)
@@ -106,59 +173,213 @@ def main():
     lib_dir = Path(__file__).parent.resolve() / "./libraries"
     msg_printer.print_message(msg_severity.INFO, "Taking common libraries from " + str(lib_dir), src_ref=None)
 
-    lib_input_files = list(Path(lib_dir / "rdl").glob("*.rdl"))
-    for user_lib_dir in args.user_lib_dirs:
-        lib_input_files.extend(Path(user_lib_dir).glob("*.rdl"))
-        print('INFO: Taking user libraries from ' + user_lib_dir)
-
     out_dir = Path(args.out_dir).resolve()
     out_dir.mkdir(exist_ok=True)
 
-    rdlfiles = []
-    rdlfiles.extend(sorted(lib_input_files, key=lambda f: f.parts[-1]))  # Sorted ignoring dir
-    rdlfiles.extend(args.input_files)
-
     # -------------------------------------------------------------------------
-    # Create an instance of the compiler
-    rdlc = RDLCompiler()
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
 
-    # Compile and elaborate to obtain the hierarchical model
-    try:
-        for rdlfile in rdlfiles:
-            rdlc.compile_file(rdlfile)
-        root = rdlc.elaborate()
-    except Exception as e:  # RDLCompileError
-        # A compilation error occurred. Exit with error code
-        msg_printer.print_message(msg_severity.ERROR, str(e), src_ref=None)
-        sys.exit(1)
+    # rendering is profiled in this process only
+    if (args.profile or args.profile_json) and jobs > 1:
+        msg_printer.print_message(msg_severity.INFO, "Profiling, templates are rendered in one process.", src_ref=None)
+        jobs = 1
 
-    msg_printer.print_message(msg_severity.INFO, "SystemRdl compiler done.", src_ref=None)
+    # compiled templates shared by all runs
+    bytecode_dir = None if args.no_cache else bytecode_cache_dir()
 
-    # -------------------------------------------------------------------------
-    # Check root node
-    if isinstance(root, RootNode):
-        top_node = root.top
+    if args.watch:
+        watch(args, tpl_dir, lib_dir, out_dir, jobs, bytecode_dir, msg_printer)
     else:
-        print('#\nERROR: root is not a RootNode')
-        sys.exit(2)
+        try:
+            generate(args, tpl_dir, lib_dir, out_dir, jobs, bytecode_dir, msg_printer)
+        except RDLCompileError:
+            # error is already reported
+            sys.exit(1)
+
+
+def collect_rdlfiles(lib_dir, user_lib_dirs, input_files):
+    """Return list of RDL files to compile, libraries first."""
+    for user_lib_dir in user_lib_dirs:
+        print('INFO: Taking user libraries from ' + user_lib_dir)
+
+    rdlfiles = []
+    rdlfiles.extend(library_files(lib_dir, user_lib_dirs))
+    rdlfiles.extend(input_files)
+    return rdlfiles
+
+
+def get_library(lib_dir, user_lib_dirs, msg_printer, profiler=None):
+    """Return compiled DesyRDL and user libraries, compiled again only if their files changed."""
+    key = (str(lib_dir), tuple(user_lib_dirs))
+    state = files_state(library_files(lib_dir, user_lib_dirs))
+    cached = _libraries.get(key)
+    if cached is None or cached[0] != state:
+        cached = _libraries[key] = (state, RdlLibrary(user_lib_dirs, lib_dir, msg_printer, profiler))
+    return cached[1]
+
+
+def generate(args, tpl_dir, lib_dir, out_dir, jobs, bytecode_dir, msg_printer):  # noqa: PLR0917
+    """Compile input files or load the model and generate all output formats."""
+    msg_severity = Severity(5)
+    rdlfiles = collect_rdlfiles(lib_dir, args.user_lib_dirs, args.input_files)
+
+    # profiler is disabled unless requested
+    profiler = Profiler(enabled=args.profile or args.profile_json)
+
+    # cache of rendered outputs, unchanged outputs are not rendered again
+    render_cache = None
+    if not args.no_cache:
+        render_cache = RenderCache(out_dir / ".desyrdl_cache")
+
+    create_listener = functools.partial(
+        DesyRdlProcessor,
+        tpl_dir,
+        lib_dir,
+        out_dir,
+        args.out_format,
+        render_cache=render_cache,
+        vhdl_per_type=args.vhdl_per_type,
+        jobs=jobs,
+        profiler=profiler,
+        bytecode_dir=bytecode_dir,
+    )
+    listener = create_listener()
 
     # -------------------------------------------------------------------------
-    walker = RDLWalker(unroll=False)
-    listener = DesyRdlProcessor(tpl_dir, lib_dir, out_dir, args.out_format)
-    walker.walk(top_node, listener)
+    # Load saved model, inputs are checked only if given
+    top_context = None
+    if args.load_model is not None:
+        try:
+            with profiler.phase('load model', item=args.load_model):
+                top_context = load_model(args.load_model, rdlfiles if args.input_files else None)
+            msg_printer.print_message(msg_severity.INFO, "Using model " + args.load_model, src_ref=None)
+        except (OSError, ValueError) as e:
+            if not args.input_files:
+                msg_printer.print_message(msg_severity.ERROR, str(e), src_ref=None)
+                sys.exit(1)
+            msg_printer.print_message(msg_severity.INFO, str(e) + ", compiling input files.", src_ref=None)
+
+    try:
+        if top_context is not None:
+            try:
+                listener.render_model(top_context)
+            except NodeSnapshotError as e:
+                # templates using node members not kept in the model need the compiled address space
+                if not args.input_files:
+                    msg_printer.print_message(msg_severity.ERROR, str(e), src_ref=None)
+                    sys.exit(1)
+                msg_printer.print_message(msg_severity.INFO, str(e) + ", compiling input files.", src_ref=None)
+                listener.close()
+                listener = create_listener()
+                top_context = None
+        if top_context is None:
+            top_node = compile_rdl(args.input_files, lib_dir, args.user_lib_dirs, msg_printer, profiler)
+            walker = RDLWalker(unroll=False)
+            with profiler.phase('walk', top_node.get_path()):
+                walker.walk(top_node, listener)
+            if args.save_model is not None:
+                with profiler.phase('save model', item=args.save_model):
+                    save_model(args.save_model, listener.top_context, rdlfiles)
+                msg_printer.print_message(msg_severity.INFO, "Model saved to " + args.save_model, src_ref=None)
+    finally:
+        # render pool is shut down also if the walk failed
+        listener.close()
+
+    if render_cache is not None:
+        render_cache.save()
+        msg_printer.print_message(
+            msg_severity.INFO,
+            f"Render cache: {render_cache.hits} up to date, {render_cache.misses} rendered.",
+            src_ref=None,
+        )
 
     generated_files = listener.get_generated_files()
     for out_format in args.out_format:
         # target file where to list all output files, either copied from
         # libraries or generated
         fname_out_list = Path(out_dir / f'gen_files_{out_format}.txt')
-        with fname_out_list.open('w') as f_out:
-            # copy all common files of the selected format into the out folder
-            for fname in generated_files[out_format]:
-                f_out.write(f"{fname!s}\n")
+        write_if_changed(fname_out_list, "".join(f"{fname!s}\n" for fname in generated_files[out_format]))
+
+    if profiler.enabled:
+        print(profiler.report())
+        if args.profile_json:
+            profiler.save(out_dir / 'gen_profile.json')
 
     msg_printer.print_message(msg_severity.INFO, "Generation of the output files done.", src_ref=None)
 
 
+def watch(args, tpl_dir, lib_dir, out_dir, jobs, bytecode_dir, msg_printer):  # noqa: PLR0917
+    """Generate outputs again whenever an input, library or template file changes.
+
+    The process keeps the loaded modules, the compiled RDL libraries and the
+    Jinja environment with the compiled templates. Address maps which did not
+    change are found in the render cache and are not rendered again.
+    """
+    msg_severity = Severity(5)
+    try:
+        while True:
+            try:
+                generate(args, tpl_dir, lib_dir, out_dir, jobs, bytecode_dir, msg_printer)
+            except (SystemExit, RDLCompileError):
+                # error is already reported, wait for the fix
+                pass
+            except Exception as e:  # e.g. template errors, keep watching
+                msg_printer.print_message(msg_severity.ERROR, str(e), src_ref=None)
+            msg_printer.print_message(msg_severity.INFO, "Watching for changes, press Ctrl+C to stop.", src_ref=None)
+            wait_for_changes(lambda: watched_files(args, tpl_dir, lib_dir))
+    except KeyboardInterrupt:
+        msg_printer.print_message(msg_severity.INFO, "Watch stopped.", src_ref=None)
+
+
+def watched_files(args, tpl_dir, lib_dir):
+    """Return list of input, library and template files."""
+    files = [Path(fname) for fname in args.input_files]
+    for user_lib_dir in args.user_lib_dirs:
+        files.extend(Path(user_lib_dir).glob("*.rdl"))
+    for root_dir in (lib_dir, tpl_dir):
+        files.extend(fname for fname in Path(root_dir).rglob("*") if fname.is_file())
+    return files
+
+
+def files_state(files):
+    """Return modification time and size by file, None for files which do not exist."""
+    state = {}
+    for fname in files:
+        try:
+            stat = Path(fname).stat()
+            state[fname] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            state[fname] = None
+    return state
+
+
+def wait_for_changes(get_files, interval=WATCH_INTERVAL):
+    """Poll files until a file is changed, added or removed."""
+    initial = files_state(get_files())
+    while True:
+        time.sleep(interval)
+        if files_state(get_files()) != initial:
+            return
+
+
+def compile_rdl(input_files, lib_dir, user_lib_dirs, msg_printer, profiler=None):
+    """Compile and elaborate input files on the compiled libraries, return top node of the hierarchical model."""
+    msg_severity = Severity(5)
+    if profiler is None:
+        profiler = Profiler()
+
+    # Compile and elaborate to obtain the hierarchical model
+    try:
+        library = get_library(lib_dir, user_lib_dirs, msg_printer, profiler)
+        top_node = library.compile(input_files, profiler=profiler)
+    except Exception as e:  # RDLCompileError
+        # A compilation error occurred. Exit with error code
+        msg_printer.print_message(msg_severity.ERROR, str(e), src_ref=None)
+        sys.exit(1)
+
+    msg_printer.print_message(msg_severity.INFO, "SystemRdl compiler done.", src_ref=None)
+    return top_node
+
+
 if __name__ == '__main__':
     main()
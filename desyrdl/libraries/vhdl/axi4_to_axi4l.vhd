@@ -0,0 +1,216 @@
+--------------------------------------------------------------------------------
+--          ____  _____________  __                                           --
+--         / __ \/ ____/ ___/\ \/ /                 _   _   _                 --
+--        / / / / __/  \__ \  \  /                 / \ / \ / \                --
+--       / /_/ / /___ ___/ /  / /               = ( M | S | K )=              --
+--      /_____/_____//____/  /_/                   \_/ \_/ \_/                --
+--                                                                            --
+--------------------------------------------------------------------------------
+--! @copyright Copyright 2026 DESY
+--! SPDX-License-Identifier: Apache-2.0
+--------------------------------------------------------------------------------
+--! @date 2026-10-18
+--------------------------------------------------------------------------------
+--! @brief
+--! Bus translator from AXI4 to AXI4-Lite, bursts are split into single beat transfers,
+--! requires the same bus width
+--------------------------------------------------------------------------------
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+------------------------------------------------------------------------------
+library desyrdl;
+use desyrdl.common.all;
+
+------------------------------------------------------------------------------
+--! @brief AXI4 to AXI4-Lite translation
+entity axi4_to_axi4l is
+  port (
+    -- AXI4 slave port
+    pi_reset        : in  std_logic;
+    pi_clock        : in  std_logic;
+    pi_s_decoder    : in  t_axi4_m2s;
+    po_s_decoder    : out t_axi4_s2m;
+    -- AXI4-Lite interface
+    po_m_ext        : out t_axi4l_m2s;
+    pi_m_ext        : in  t_axi4l_s2m
+  );
+end axi4_to_axi4l;
+
+architecture rtl of axi4_to_axi4l is
+
+  type t_state_read is (ST_READ_IDLE, ST_READ_ADDR, ST_READ_DATA);
+  signal state_read : t_state_read;
+
+  type t_state_write is (ST_WRITE_IDLE, ST_WRITE_DATA, ST_WRITE_BEAT, ST_WRITE_BEAT_RESP, ST_WRITE_RESP);
+  signal state_write : t_state_write;
+
+  signal rid    : std_logic_vector(C_AXI4_ID_WIDTH-1 downto 0) := (others => '0');
+  signal raddr  : std_logic_vector(C_AXI4_ADDR_WIDTH-1 downto 0) := (others => '0');
+  signal rlen   : std_logic_vector(7 downto 0) := (others => '0');
+  signal rsize  : std_logic_vector(2 downto 0) := (others => '0');
+  signal rburst : std_logic_vector(1 downto 0) := (others => '0');
+  signal rprot  : std_logic_vector(2 downto 0) := (others => '0');
+  signal rbeat  : unsigned(7 downto 0) := (others => '0');
+
+  signal wid    : std_logic_vector(C_AXI4_ID_WIDTH-1 downto 0) := (others => '0');
+  signal waddr  : std_logic_vector(C_AXI4_ADDR_WIDTH-1 downto 0) := (others => '0');
+  signal wlen   : std_logic_vector(7 downto 0) := (others => '0');
+  signal wsize  : std_logic_vector(2 downto 0) := (others => '0');
+  signal wburst : std_logic_vector(1 downto 0) := (others => '0');
+  signal wprot  : std_logic_vector(2 downto 0) := (others => '0');
+  signal wbeat  : unsigned(7 downto 0) := (others => '0');
+  signal wdata  : std_logic_vector(C_AXI4_DATA_WIDTH-1 downto 0) := (others => '0');
+  signal wstrb  : std_logic_vector(C_AXI4_DATA_WIDTH/8-1 downto 0) := (others => '0');
+  signal wresp  : std_logic_vector(1 downto 0) := (others => '0');
+
+  signal awvalid : std_logic := '0';
+  signal wvalid  : std_logic := '0';
+
+begin
+
+  -- ===========================================================================
+  -- read, one AXI4-Lite transfer for each beat of the burst
+  prs_state_read: process (pi_clock)
+  begin
+    if rising_edge(pi_clock) then
+      if pi_reset = '1' then
+        state_read <= ST_READ_IDLE;
+      else
+        case state_read is
+          when ST_READ_IDLE =>
+            if pi_s_decoder.arvalid = '1' then
+              rid    <= pi_s_decoder.arid;
+              raddr  <= pi_s_decoder.araddr;
+              rlen   <= pi_s_decoder.arlen;
+              rsize  <= pi_s_decoder.arsize;
+              rburst <= pi_s_decoder.arburst;
+              rprot  <= pi_s_decoder.arprot;
+              rbeat  <= (others => '0');
+              state_read <= ST_READ_ADDR;
+            end if;
+
+          when ST_READ_ADDR =>
+            if pi_m_ext.arready = '1' then
+              state_read <= ST_READ_DATA;
+            end if;
+
+          when ST_READ_DATA =>
+            if pi_m_ext.rvalid = '1' and pi_s_decoder.rready = '1' then
+              rbeat <= rbeat + 1;
+              if rbeat = unsigned(rlen) then
+                state_read <= ST_READ_IDLE;
+              else
+                raddr      <= axi4_next_addr(raddr, rlen, rsize, rburst);
+                state_read <= ST_READ_ADDR;
+              end if;
+            end if;
+
+          when others =>
+            state_read <= ST_READ_IDLE;
+        end case;
+      end if;
+    end if;
+  end process prs_state_read;
+
+  po_s_decoder.arready <= '1' when state_read = ST_READ_IDLE else '0';
+
+  po_m_ext.araddr  <= raddr;
+  po_m_ext.arprot  <= rprot;
+  po_m_ext.arvalid <= '1' when state_read = ST_READ_ADDR else '0';
+
+  po_s_decoder.rid    <= rid;
+  po_s_decoder.rdata  <= pi_m_ext.rdata;
+  po_s_decoder.rresp  <= pi_m_ext.rresp;
+  po_s_decoder.rlast  <= '1' when rbeat = unsigned(rlen) else '0';
+  po_s_decoder.rvalid <= pi_m_ext.rvalid when state_read = ST_READ_DATA else '0';
+  po_m_ext.rready     <= pi_s_decoder.rready when state_read = ST_READ_DATA else '0';
+
+  -- ===========================================================================
+  -- write, one AXI4-Lite transfer for each beat of the burst
+  prs_state_write: process (pi_clock)
+  begin
+    if rising_edge(pi_clock) then
+      if pi_reset = '1' then
+        state_write <= ST_WRITE_IDLE;
+        awvalid     <= '0';
+        wvalid      <= '0';
+      else
+        case state_write is
+          when ST_WRITE_IDLE =>
+            if pi_s_decoder.awvalid = '1' then
+              wid    <= pi_s_decoder.awid;
+              waddr  <= pi_s_decoder.awaddr;
+              wlen   <= pi_s_decoder.awlen;
+              wsize  <= pi_s_decoder.awsize;
+              wburst <= pi_s_decoder.awburst;
+              wprot  <= pi_s_decoder.awprot;
+              wbeat  <= (others => '0');
+              wresp  <= C_AXI4_RESP_OKAY;
+              state_write <= ST_WRITE_DATA;
+            end if;
+
+          when ST_WRITE_DATA =>
+            if pi_s_decoder.wvalid = '1' then
+              wdata   <= pi_s_decoder.wdata;
+              wstrb   <= pi_s_decoder.wstrb;
+              awvalid <= '1';
+              wvalid  <= '1';
+              state_write <= ST_WRITE_BEAT;
+            end if;
+
+          when ST_WRITE_BEAT =>
+            if pi_m_ext.awready = '1' then
+              awvalid <= '0';
+            end if;
+            if pi_m_ext.wready = '1' then
+              wvalid <= '0';
+            end if;
+            if (awvalid = '0' or pi_m_ext.awready = '1') and (wvalid = '0' or pi_m_ext.wready = '1') then
+              state_write <= ST_WRITE_BEAT_RESP;
+            end if;
+
+          when ST_WRITE_BEAT_RESP =>
+            if pi_m_ext.bvalid = '1' then
+              -- keep the first error response of the burst
+              if wresp = C_AXI4_RESP_OKAY then
+                wresp <= pi_m_ext.bresp;
+              end if;
+              wbeat <= wbeat + 1;
+              if wbeat = unsigned(wlen) then
+                state_write <= ST_WRITE_RESP;
+              else
+                waddr       <= axi4_next_addr(waddr, wlen, wsize, wburst);
+                state_write <= ST_WRITE_DATA;
+              end if;
+            end if;
+
+          when ST_WRITE_RESP =>
+            if pi_s_decoder.bready = '1' then
+              state_write <= ST_WRITE_IDLE;
+            end if;
+
+          when others =>
+            state_write <= ST_WRITE_IDLE;
+        end case;
+      end if;
+    end if;
+  end process prs_state_write;
+
+  po_s_decoder.awready <= '1' when state_write = ST_WRITE_IDLE else '0';
+  po_s_decoder.wready  <= '1' when state_write = ST_WRITE_DATA else '0';
+
+  po_m_ext.awaddr  <= waddr;
+  po_m_ext.awprot  <= wprot;
+  po_m_ext.awvalid <= awvalid;
+  po_m_ext.wdata   <= wdata;
+  po_m_ext.wstrb   <= wstrb;
+  po_m_ext.wvalid  <= wvalid;
+  po_m_ext.bready  <= '1' when state_write = ST_WRITE_BEAT_RESP else '0';
+
+  po_s_decoder.bid    <= wid;
+  po_s_decoder.bresp  <= wresp;
+  po_s_decoder.bvalid <= '1' when state_write = ST_WRITE_RESP else '0';
+
+end rtl;
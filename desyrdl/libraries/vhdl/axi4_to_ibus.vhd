@@ -0,0 +1,67 @@
+--------------------------------------------------------------------------------
+--          ____  _____________  __                                           --
+--         / __ \/ ____/ ___/\ \/ /                 _   _   _                 --
+--        / / / / __/  \__ \  \  /                 / \ / \ / \                --
+--       / /_/ / /___ ___/ /  / /               = ( M | S | K )=              --
+--      /_____/_____//____/  /_/                   \_/ \_/ \_/                --
+--                                                                            --
+--------------------------------------------------------------------------------
+--! @copyright Copyright 2026 DESY
+--! SPDX-License-Identifier: Apache-2.0
+--------------------------------------------------------------------------------
+--! @date 2026-10-18
+--------------------------------------------------------------------------------
+--! @brief
+--! Bus translator from AXI4 to IBUS through AXI4-Lite, bursts are split into single transfers
+--------------------------------------------------------------------------------
+library ieee;
+use ieee.std_logic_1164.all;
+
+------------------------------------------------------------------------------
+library desyrdl;
+use desyrdl.common.all;
+
+------------------------------------------------------------------------------
+entity axi4_to_ibus is
+  generic (
+    G_BUS_TIMEOUT : natural := 4095
+  );
+  port (
+    pi_reset        : in  std_logic;
+    pi_clock        : in  std_logic;
+    pi_s_decoder    : in  t_axi4_m2s;
+    po_s_decoder    : out t_axi4_s2m;
+    po_m_ext        : out t_ibus_m2s;
+    pi_m_ext        : in  t_ibus_s2m
+  );
+end axi4_to_ibus;
+
+architecture rtl of axi4_to_ibus is
+  signal axi4l_m2s : t_axi4l_m2s := C_AXI4L_M2S_DEFAULT;
+  signal axi4l_s2m : t_axi4l_s2m := C_AXI4L_S2M_DEFAULT;
+begin
+
+  ins_axi4_to_axi4l: entity desyrdl.axi4_to_axi4l
+    port map (
+      pi_reset     => pi_reset,
+      pi_clock     => pi_clock,
+      pi_s_decoder => pi_s_decoder,
+      po_s_decoder => po_s_decoder,
+      po_m_ext     => axi4l_m2s,
+      pi_m_ext     => axi4l_s2m
+    );
+
+  ins_axi4l_to_ibus: entity desyrdl.axi4l_to_ibus
+    generic map (
+      G_BUS_TIMEOUT => G_BUS_TIMEOUT
+    )
+    port map (
+      pi_reset     => pi_reset,
+      pi_clock     => pi_clock,
+      pi_s_decoder => axi4l_m2s,
+      po_s_decoder => axi4l_s2m,
+      po_m_ext     => po_m_ext,
+      pi_m_ext     => pi_m_ext
+    );
+
+end rtl;
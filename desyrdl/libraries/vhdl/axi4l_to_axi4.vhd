@@ -0,0 +1,81 @@
+--------------------------------------------------------------------------------
+--          ____  _____________  __                                           --
+--         / __ \/ ____/ ___/\ \/ /                 _   _   _                 --
+--        / / / / __/  \__ \  \  /                 / \ / \ / \                --
+--       / /_/ / /___ ___/ /  / /               = ( M | S | K )=              --
+--      /_____/_____//____/  /_/                   \_/ \_/ \_/                --
+--                                                                            --
+--------------------------------------------------------------------------------
+--! @copyright Copyright 2026 DESY
+--! SPDX-License-Identifier: Apache-2.0
+--------------------------------------------------------------------------------
+--! @date 2026-10-18
+--------------------------------------------------------------------------------
+--! @brief
+--! Bus translator from AXI4-Lite to AXI4, single beat transfers, requires the same bus width
+--------------------------------------------------------------------------------
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+------------------------------------------------------------------------------
+library desyrdl;
+use desyrdl.common.all;
+
+------------------------------------------------------------------------------
+--! @brief AXI4-Lite to AXI4 translation
+entity axi4l_to_axi4 is
+  port (
+    -- AXI4-Lite slave port
+    pi_reset        : in  std_logic;
+    pi_clock        : in  std_logic;
+    pi_s_decoder    : in  t_axi4l_m2s;
+    po_s_decoder    : out t_axi4l_s2m;
+    -- AXI4 interface
+    po_m_ext        : out t_axi4_m2s;
+    pi_m_ext        : in  t_axi4_s2m
+  );
+end axi4l_to_axi4;
+
+architecture rtl of axi4l_to_axi4 is
+begin
+  -- write address, single beat of the bus width
+  po_m_ext.awid    <= (others => '0');
+  po_m_ext.awaddr  <= pi_s_decoder.awaddr;
+  po_m_ext.awlen   <= (others => '0');
+  po_m_ext.awsize  <= std_logic_vector(to_unsigned(2, 3));
+  po_m_ext.awburst <= C_AXI4_BURST_INCR;
+  po_m_ext.awlock  <= '0';
+  po_m_ext.awcache <= (others => '0');
+  po_m_ext.awprot  <= pi_s_decoder.awprot;
+  po_m_ext.awvalid <= pi_s_decoder.awvalid;
+  po_s_decoder.awready <= pi_m_ext.awready;
+  -- write data
+  po_m_ext.wdata   <= pi_s_decoder.wdata;
+  po_m_ext.wstrb   <= pi_s_decoder.wstrb;
+  po_m_ext.wlast   <= '1';
+  po_m_ext.wvalid  <= pi_s_decoder.wvalid;
+  po_s_decoder.wready <= pi_m_ext.wready;
+  -- write response
+  po_s_decoder.bresp  <= pi_m_ext.bresp;
+  po_s_decoder.bvalid <= pi_m_ext.bvalid;
+  po_m_ext.bready  <= pi_s_decoder.bready;
+
+  -- read address, single beat of the bus width
+  po_m_ext.arid    <= (others => '0');
+  po_m_ext.araddr  <= pi_s_decoder.araddr;
+  po_m_ext.arlen   <= (others => '0');
+  po_m_ext.arsize  <= std_logic_vector(to_unsigned(2, 3));
+  po_m_ext.arburst <= C_AXI4_BURST_INCR;
+  po_m_ext.arlock  <= '0';
+  po_m_ext.arcache <= (others => '0');
+  po_m_ext.arprot  <= pi_s_decoder.arprot;
+  po_m_ext.arvalid <= pi_s_decoder.arvalid;
+  po_s_decoder.arready <= pi_m_ext.arready;
+  -- read data
+  po_s_decoder.rdata  <= pi_m_ext.rdata;
+  po_s_decoder.rresp  <= pi_m_ext.rresp;
+  po_s_decoder.rvalid <= pi_m_ext.rvalid;
+  po_m_ext.rready  <= pi_s_decoder.rready;
+
+end rtl;
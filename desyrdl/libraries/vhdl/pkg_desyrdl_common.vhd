@@ -29,6 +29,10 @@ package common is
   constant C_AXI4L_ADDR_WIDTH : natural := 32;
   constant C_AXI4L_DATA_WIDTH : natural := 32;
 
+  constant C_AXI4_ADDR_WIDTH : natural := 32;
+  constant C_AXI4_DATA_WIDTH : natural := 32;
+  constant C_AXI4_ID_WIDTH   : natural := 16;
+
   ---------------------------------------------------------------------------
   -- common type definitions
   -- type t_4b_slv_array  is array (integer range<>) of std_logic_vector( 3 downto 0) ;
@@ -100,6 +104,111 @@ package common is
     rready        => '0'
   );
 
+  --============================================================================
+  -- AXI4
+  --============================================================================
+  type t_axi4_m2s is record
+    -- write address channel signals---------------------------------------------
+    awid        : std_logic_vector(C_AXI4_ID_WIDTH-1 downto 0);
+    awaddr      : std_logic_vector(C_AXI4_ADDR_WIDTH-1 downto 0);
+    awlen       : std_logic_vector(7 downto 0);
+    awsize      : std_logic_vector(2 downto 0);
+    awburst     : std_logic_vector(1 downto 0);
+    awlock      : std_logic;
+    awcache     : std_logic_vector(3 downto 0);
+    awprot      : std_logic_vector(2 downto 0);
+    awvalid     : std_logic;
+    -- write data channel signals---------------------------------------------
+    wdata       : std_logic_vector(C_AXI4_DATA_WIDTH-1 downto 0);
+    wstrb       : std_logic_vector(C_AXI4_DATA_WIDTH/8-1 downto 0);
+    wlast       : std_logic;
+    wvalid      : std_logic;
+    -- write response channel signals
+    bready      : std_logic;
+    -- read address channel signals ---------------------------------------------
+    arid        : std_logic_vector(C_AXI4_ID_WIDTH-1 downto 0);
+    araddr      : std_logic_vector(C_AXI4_ADDR_WIDTH-1 downto 0);
+    arlen       : std_logic_vector(7 downto 0);
+    arsize      : std_logic_vector(2 downto 0);
+    arburst     : std_logic_vector(1 downto 0);
+    arlock      : std_logic;
+    arcache     : std_logic_vector(3 downto 0);
+    arprot      : std_logic_vector(2 downto 0);
+    arvalid     : std_logic;
+    -- read data channel signals---------------------------------------------
+    rready      : std_logic;
+  end record t_axi4_m2s;
+
+  type t_axi4_s2m is record
+    -- write address channel signals---------------------------------------------
+    awready     : std_logic;
+    -- write data channel signals---------------------------------------------
+    wready      : std_logic;
+    -- write response channel signals ---------------------------------------------
+    bid         : std_logic_vector(C_AXI4_ID_WIDTH-1 downto 0);
+    bresp       : std_logic_vector(1 downto 0);
+    bvalid      : std_logic;
+    -- read address channel signals---------------------------------------------
+    arready     : std_logic;
+    -- read data channel signals---------------------------------------------
+    rid         : std_logic_vector(C_AXI4_ID_WIDTH-1 downto 0);
+    rdata       : std_logic_vector(C_AXI4_DATA_WIDTH-1 downto 0);
+    rresp       : std_logic_vector(1 downto 0);
+    rlast       : std_logic;
+    rvalid      : std_logic;
+  end record t_axi4_s2m;
+
+  type t_axi4_m2s_vector is array (integer range <>) of t_axi4_m2s;
+  type t_axi4_s2m_vector is array (integer range <>) of t_axi4_s2m;
+
+  constant  C_AXI4_S2M_DEFAULT : t_axi4_s2m := (
+    awready     => '0',
+    wready      => '0',
+    bid         => (others => '0'),
+    bresp       => (others => '0'),
+    bvalid      => '0',
+    arready     => '0' ,
+    rid         => (others => '0'),
+    rdata       => (others => '0'),
+    rresp       => (others => '0'),
+    rlast       => '0',
+    rvalid      => '0'
+  );
+  constant  C_AXI4_M2S_DEFAULT : t_axi4_m2s := (
+    awid          => (others => '0'),
+    awaddr        => (others => '0'),
+    awlen         => (others => '0'),
+    awsize        => (others => '0'),
+    awburst       => (others => '0'),
+    awlock        => '0',
+    awcache       => (others => '0'),
+    awprot        => (others => '0'),
+    awvalid       => '0',
+    wdata         => (others => '0'),
+    wstrb         => (others => '0'),
+    wlast         => '0',
+    wvalid        => '0',
+    bready        => '0',
+    arid          => (others => '0'),
+    araddr        => (others => '0'),
+    arlen         => (others => '0'),
+    arsize        => (others => '0'),
+    arburst       => (others => '0'),
+    arlock        => '0',
+    arcache       => (others => '0'),
+    arprot        => (others => '0'),
+    arvalid       => '0',
+    rready        => '0'
+  );
+
+  -- AXI4 burst types
+  constant C_AXI4_BURST_FIXED : std_logic_vector(1 downto 0) := "00";
+  constant C_AXI4_BURST_INCR  : std_logic_vector(1 downto 0) := "01";
+  constant C_AXI4_BURST_WRAP  : std_logic_vector(1 downto 0) := "10";
+  -- AXI4 responses
+  constant C_AXI4_RESP_OKAY   : std_logic_vector(1 downto 0) := "00";
+  constant C_AXI4_RESP_SLVERR : std_logic_vector(1 downto 0) := "10";
+
   ---------------------------------------------------------------------------
   -- Interface definitions for IBUS
   -- Internal BUS (IBUS) is the internal bus used in the applications of MSK Firmware
@@ -236,6 +345,46 @@ package common is
       pi_m_ext     : in  t_ibus_s2m);
   end component axi4l_to_ibus;
 
+  component axi4_to_axi4l is
+    port (
+      pi_reset       : in  std_logic;
+      pi_clock       : in  std_logic;
+      pi_s_decoder : in  t_axi4_m2s;
+      po_s_decoder : out t_axi4_s2m;
+      po_m_ext     : out t_axi4l_m2s;
+      pi_m_ext     : in  t_axi4l_s2m);
+  end component axi4_to_axi4l;
+
+  component axi4l_to_axi4 is
+    port (
+      pi_reset       : in  std_logic;
+      pi_clock       : in  std_logic;
+      pi_s_decoder : in  t_axi4l_m2s;
+      po_s_decoder : out t_axi4l_s2m;
+      po_m_ext     : out t_axi4_m2s;
+      pi_m_ext     : in  t_axi4_s2m);
+  end component axi4l_to_axi4;
+
+  component axi4_to_ibus is
+    port (
+      pi_reset       : in  std_logic;
+      pi_clock       : in  std_logic;
+      pi_s_decoder : in  t_axi4_m2s;
+      po_s_decoder : out t_axi4_s2m;
+      po_m_ext     : out t_ibus_m2s;
+      pi_m_ext     : in  t_ibus_s2m);
+  end component axi4_to_ibus;
+
+  component ibus_to_axi4 is
+    port (
+      pi_reset       : in  std_logic;
+      pi_clock       : in  std_logic;
+      pi_s_decoder : in  t_ibus_m2s;
+      po_s_decoder : out t_ibus_s2m;
+      po_m_ext     : out t_axi4_m2s;
+      pi_m_ext     : in  t_axi4_s2m);
+  end component ibus_to_axi4;
+
   component ibus_to_axi4l is
     port (
       pi_reset       : in  std_logic;
@@ -249,6 +398,11 @@ package common is
   --common functions
   -- intr_or_reduce - or recuce for interrupt register
   function intr_or_reduce (arg: std_logic_vector) return std_logic;
+  -- axi4_next_addr - address of the next beat of AXI4 burst
+  function axi4_next_addr (addr  : std_logic_vector;
+                           len   : std_logic_vector(7 downto 0);
+                           size  : std_logic_vector(2 downto 0);
+                           burst : std_logic_vector(1 downto 0)) return std_logic_vector;
 
 end package common;
 
@@ -263,4 +417,26 @@ package body common is
       return '1';
     end if;
   end function intr_or_reduce;
+
+  function axi4_next_addr (addr  : std_logic_vector;
+                           len   : std_logic_vector(7 downto 0);
+                           size  : std_logic_vector(2 downto 0);
+                           burst : std_logic_vector(1 downto 0)) return std_logic_vector is
+    variable v_addr : unsigned(addr'length-1 downto 0);
+    variable v_incr : unsigned(addr'length-1 downto 0);
+    variable v_wrap : unsigned(addr'length-1 downto 0);
+  begin  -- function axi4_next_addr
+    -- beats after the first one are aligned to the transfer size
+    v_incr := shift_left(to_unsigned(1, addr'length), to_integer(unsigned(size)));
+    v_addr := unsigned(addr) and not (v_incr - 1);
+    if burst = C_AXI4_BURST_FIXED then
+      return addr;
+    elsif burst = C_AXI4_BURST_WRAP then
+      -- wrap boundary is the total burst size, len is 1, 3, 7 or 15
+      v_wrap := shift_left(resize(unsigned(len), addr'length) + 1, to_integer(unsigned(size))) - 1;
+      return std_logic_vector((v_addr and not v_wrap) or ((v_addr + v_incr) and v_wrap));
+    else
+      return std_logic_vector(v_addr + v_incr);
+    end if;
+  end function axi4_next_addr;
 end package body;
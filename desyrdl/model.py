@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# --------------------------------------------------------------------------- #
+#           ____  _____________  __                                           #
+#          / __ \/ ____/ ___/\ \/ /                 _   _   _                 #
+#         / / / / __/  \__ \  \  /                 / \ / \ / \                #
+#        / /_/ / /___ ___/ /  / /               = ( M | S | K )=              #
+#       /_____/_____//____/  /_/                   \_/ \_/ \_/                #
+#                                                                             #
+# --------------------------------------------------------------------------- #
+# @copyright Copyright 2026 DESY
+# SPDX-License-Identifier: Apache-2.0
+# --------------------------------------------------------------------------- #
+# @date 2026-10-18
+# --------------------------------------------------------------------------- #
+"""DesyRdl model file.
+
+Stores the node-free top context built while walking the address space, so
+outputs can be rendered later without running the SystemRDL compiler. The
+model is keyed by the hashes of all RDL input files.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+from desyrdl import __version__
+from desyrdl.context import freeze_context
+
+MODEL_FORMAT = 4
+
+
+# =============================================================================
+def input_digests(rdlfiles):
+    """Return list of content hashes of RDL input files, in compile order."""
+    return [hashlib.sha256(Path(rdlfile).read_bytes()).hexdigest() for rdlfile in rdlfiles]
+
+
+# =============================================================================
+def save_model(fname, top_context, rdlfiles):
+    """Save node-free top context with input files hashes."""
+    top_context = {key: value for key, value in top_context.items() if key != 'generated_files'}
+    model = {
+        'format': MODEL_FORMAT,
+        'version': __version__,
+        'inputs': input_digests(rdlfiles),
+        'top_context': freeze_context(top_context),
+    }
+    fname = Path(fname)
+    fname.parents[0].mkdir(parents=True, exist_ok=True)
+    tmp_fname = fname.with_suffix(fname.suffix + '.tmp')
+    with tmp_fname.open('wb') as f_out:
+        pickle.dump(model, f_out, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_fname, fname)
+
+
+# =============================================================================
+def load_model(fname, rdlfiles=None):
+    """Load top context from model file.
+
+    Raise ValueError if the model was saved by other tool version or, when
+    RDL input files are given, if it was built from different inputs.
+    """
+    with Path(fname).open('rb') as f_in:
+        model = pickle.load(f_in)  # noqa: S301
+    if not isinstance(model, dict) or model.get('format') != MODEL_FORMAT or model.get('version') != __version__:
+        msg = f"Model {fname} was not saved by DesyRDL {__version__}"
+        raise ValueError(msg)
+    if rdlfiles is not None and model['inputs'] != input_digests(rdlfiles):
+        msg = f"Model {fname} was built from different input files"
+        raise ValueError(msg)
+    return model['top_context']
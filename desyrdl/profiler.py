@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# --------------------------------------------------------------------------- #
+#           ____  _____________  __                                           #
+#          / __ \/ ____/ ___/\ \/ /                 _   _   _                 #
+#         / / / / __/  \__ \  \  /                 / \ / \ / \                #
+#        / /_/ / /___ ___/ /  / /               = ( M | S | K )=              #
+#       /_____/_____//____/  /_/                   \_/ \_/ \_/                #
+#                                                                             #
+# --------------------------------------------------------------------------- #
+# @copyright Copyright 2026 DESY
+# SPDX-License-Identifier: Apache-2.0
+# --------------------------------------------------------------------------- #
+# @date 2026-10-18
+# --------------------------------------------------------------------------- #
+"""DesyRdl generation profiler.
+
+Measures wall time and memory allocated in the generation phases, per address
+map and per template file. Memory is traced with tracemalloc, which slows down
+the generation, so the profiler does nothing unless it is enabled.
+"""
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+from desyrdl import __version__
+
+_NO_PHASE = contextlib.nullcontext()
+
+# available since Python 3.9, before the peaks of phases include the peaks of earlier phases
+_reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+
+# =============================================================================
+class Profiler:
+    """Collects time and memory of named phases.
+
+    Phases can be nested, the self time of a phase excludes the time of the
+    phases nested in it. Records with the same phase, address map and item
+    are accumulated.
+    """
+
+    def __init__(self, *, enabled=False):
+        self.enabled = enabled
+        self.records = {}
+        self.stack = []
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # =========================================================================
+    def phase(self, name, addrmap='', item=''):
+        """Return context manager measuring the phase."""
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name, addrmap, item)
+
+    # =========================================================================
+    def record(self, key, seconds, self_seconds, allocated, peak):
+        """Accumulate measurement of the phase."""
+        rec = self.records.get(key)
+        if rec is None:
+            rec = self.records[key] = {'calls': 0, 'time': 0.0, 'self_time': 0.0, 'allocated': 0, 'peak': 0}
+        rec['calls'] += 1
+        rec['time'] += seconds
+        rec['self_time'] += self_seconds
+        rec['allocated'] += allocated
+        rec['peak'] = max(rec['peak'], peak)
+
+    # =========================================================================
+    def entries(self):
+        """Return list of records, in order of the first call."""
+        return [
+            {'phase': phase, 'addrmap': addrmap, 'item': item, **rec}
+            for (phase, addrmap, item), rec in self.records.items()
+        ]
+
+    def summary(self):
+        """Return list of records accumulated per phase."""
+        phases = {}
+        for (phase, _, _), rec in self.records.items():
+            total = phases.setdefault(
+                phase, {'phase': phase, 'calls': 0, 'time': 0.0, 'self_time': 0.0, 'allocated': 0, 'peak': 0}
+            )
+            total['calls'] += rec['calls']
+            total['time'] += rec['time']
+            total['self_time'] += rec['self_time']
+            total['allocated'] += rec['allocated']
+            total['peak'] = max(total['peak'], rec['peak'])
+        return list(phases.values())
+
+    # =========================================================================
+    def report(self):
+        """Return the profile as text tables, summary per phase and all records."""
+        lines = []
+        header = f"{'calls':>7} {'time [ms]':>11} {'self [ms]':>11} {'alloc [kB]':>11} {'peak [kB]':>11}"
+        lines.append(f"{'phase':<12} {header}")
+        lines.extend(f"{rec['phase']:<12} {_format_record(rec)}" for rec in self.summary())
+        lines.append("")
+        lines.append(f"{'phase':<12} {'addrmap':<32} {'item':<40} {header}")
+        lines.extend(
+            f"{rec['phase']:<12} {rec['addrmap']:<32} {rec['item']:<40} {_format_record(rec)}" for rec in self.entries()
+        )
+        return "\n".join(lines)
+
+    def save(self, fname):
+        """Save the profile as JSON file."""
+        profile = {
+            'version': __version__,
+            'summary': self.summary(),
+            'entries': self.entries(),
+        }
+        fname = Path(fname)
+        tmp_fname = fname.with_suffix(fname.suffix + '.tmp')
+        tmp_fname.write_text(json.dumps(profile, indent=2))
+        os.replace(tmp_fname, fname)
+
+
+def _format_record(rec):
+    """Return formatted time and memory columns of the record."""
+    return (
+        f"{rec['calls']:>7} {rec['time'] * 1e3:>11.1f} {rec['self_time'] * 1e3:>11.1f} "
+        f"{rec['allocated'] / 1024:>11.1f} {rec['peak'] / 1024:>11.1f}"
+    )
+
+
+# =============================================================================
+class _Phase:
+    """Measurement of a single phase call."""
+
+    __slots__ = ('children_time', 'key', 'memory', 'peak', 'profiler', 'start')
+
+    def __init__(self, profiler, name, addrmap, item):
+        self.profiler = profiler
+        self.key = (name, addrmap, item)
+
+    def __enter__(self):
+        stack = self.profiler.stack
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # peak is reset for this phase, keep peak of the outer phase so far
+            stack[-1].peak = max(stack[-1].peak, peak)
+        if _reset_peak is not None:
+            _reset_peak()
+        self.memory = current
+        self.peak = current
+        self.children_time = 0.0
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        current, peak = tracemalloc.get_traced_memory()
+        stack = self.profiler.stack
+        stack.pop()
+        peak = max(self.peak, peak)
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+            stack[-1].children_time += seconds
+        self.profiler.record(self.key, seconds, seconds - self.children_time, current - self.memory, peak - self.memory)
+        return False
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# --------------------------------------------------------------------------- #
+#           ____  _____________  __                                           #
+#          / __ \/ ____/ ___/\ \/ /                 _   _   _                 #
+#         / / / / __/  \__ \  \  /                 / \ / \ / \                #
+#        / /_/ / /___ ___/ /  / /               = ( M | S | K )=              #
+#       /_____/_____//____/  /_/                   \_/ \_/ \_/                #
+#                                                                             #
+# --------------------------------------------------------------------------- #
+# @copyright Copyright 2026 DESY
+# SPDX-License-Identifier: Apache-2.0
+# --------------------------------------------------------------------------- #
+# @date 2026-10-18
+# --------------------------------------------------------------------------- #
+"""DesyRdl render cache.
+
+Content addressed cache of rendered artifacts. Each render of a template set is
+keyed by a hash of the template sources and of the context used to render
+them. Output files are only written when their content changes, so unchanged
+artifacts keep their modification time. Compiled templates are kept in a user
+cache directory shared by all runs.
+"""
+
+import hashlib
+import json
+import os
+from enum import Enum
+from pathlib import Path
+
+from systemrdl.node import Node
+from systemrdl.rdltypes import PropertyReference, UserStruct
+
+from desyrdl import __version__
+from desyrdl.context import ArrayElement, ContextItem
+
+CACHE_FORMAT = 1
+
+
+# =============================================================================
+def write_if_changed(file_path: Path, content: str):
+    """Write content to file only if it differs from the existing one.
+
+    Returns True if the file was written.
+    """
+    file_path = Path(file_path)
+    if file_path.is_file() and file_path.read_text() == content:
+        return False
+    file_path.parents[0].mkdir(parents=True, exist_ok=True)
+    file_path.write_text(content)
+    return True
+
+
+# =============================================================================
+def bytecode_cache_dir():
+    """Return directory of the Jinja bytecode cache, None if it cannot be created.
+
+    The directory is in XDG_CACHE_HOME, default ~/.cache, or in DESYRDL_CACHE_DIR if set.
+    """
+    cache_dir = os.environ.get('DESYRDL_CACHE_DIR')
+    if cache_dir is None:
+        cache_dir = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / ".cache") / "desyrdl"
+    cache_dir = Path(cache_dir) / "jinja"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return cache_dir
+
+
+# =============================================================================
+def context_digest(context, hasher=None):
+    """Return hex digest of the context dictionary.
+
+    Nodes of the compiled tree are represented by their path, their properties
+    are already part of the context.
+    """
+    if hasher is None:
+        hasher = hashlib.sha256()
+    _feed(hasher, context, {})
+    return hasher.hexdigest()
+
+
+def _feed(hasher, obj, memo):
+    """Recursively feed object to the hasher."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+        return
+    if isinstance(obj, Enum):
+        hasher.update(f"E:{obj!s};".encode())
+        return
+    if isinstance(obj, Node):
+        hasher.update(f"N:{type(obj).__name__}:{obj.get_path()};".encode())
+        return
+    if isinstance(obj, PropertyReference):
+        hasher.update(f"P:{obj.node.get_path()}->{obj.name};".encode())
+        return
+    # containers can be shared between lists, e.g. types and instances
+    if id(obj) in memo:
+        hasher.update(f"R:{memo[id(obj)]};".encode())
+        return
+    memo[id(obj)] = len(memo)
+    if isinstance(obj, UserStruct):
+        obj = obj.members
+    if isinstance(obj, ArrayElement):
+        hasher.update(f"V:{obj.idx}:{obj.element};".encode())
+        _feed(hasher, obj.base, memo)
+        _feed(hasher, obj.props, memo)
+    elif isinstance(obj, (dict, ContextItem)):
+        hasher.update(f"{type(obj).__name__}{{".encode())
+        for key, value in obj.items():
+            _feed(hasher, key, memo)
+            _feed(hasher, value, memo)
+        hasher.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b"[")
+        for value in obj:
+            _feed(hasher, value, memo)
+        hasher.update(b"]")
+    else:
+        hasher.update(f"O:{type(obj).__name__}:{obj!r};".encode())
+
+
+# =============================================================================
+class RenderCache:
+    """Persistent cache of rendered template sets, stored in the output dir."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.index_file = self.cache_dir / "render_cache.json"
+        self.entries = {}
+        self.used_entries = {}
+        self.tpl_digests = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    # =========================================================================
+    def load(self):
+        """Load cache index, an invalid or outdated index is discarded."""
+        try:
+            index = json.loads(self.index_file.read_text())
+        except (OSError, ValueError):
+            return
+        if index.get('format') == CACHE_FORMAT and index.get('version') == __version__:
+            self.entries = index.get('entries', {})
+
+    # =========================================================================
+    def save(self):
+        """Save index with the entries used in this run only."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index = {'format': CACHE_FORMAT, 'version': __version__, 'entries': self.used_entries}
+        tmp_file = self.index_file.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps(index))
+        os.replace(tmp_file, self.index_file)
+
+    # =========================================================================
+    def template_digest(self, tpl_dirs):
+        """Return digest of all template files in the template directories."""
+        key = tuple(str(tpl_dir) for tpl_dir in tpl_dirs)
+        if key not in self.tpl_digests:
+            hasher = hashlib.sha256()
+            for tpl_dir in tpl_dirs:
+                tpl_path = Path(tpl_dir)
+                for tpl_file in sorted(tpl_path.rglob("*")):
+                    if tpl_file.is_file():
+                        hasher.update(tpl_file.relative_to(tpl_path).as_posix().encode())
+                        hasher.update(tpl_file.read_bytes())
+            self.tpl_digests[key] = hasher.hexdigest()
+        return self.tpl_digests[key]
+
+    # =========================================================================
+    def digest(self, loader, tpl_dirs, context):
+        """Return the key of the template set rendered with context."""
+        hasher = hashlib.sha256()
+        hasher.update(f"{CACHE_FORMAT}:{__version__}:{loader}:".encode())
+        hasher.update(self.template_digest(tpl_dirs).encode())
+        return context_digest(context, hasher)
+
+    # =========================================================================
+    def lookup(self, digest):
+        """Return list of files rendered for digest if they are still on disk unchanged."""
+        entry = self.entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        for fname, size, mtime in entry:
+            try:
+                stat = os.stat(fname)
+            except OSError:
+                self.misses += 1
+                return None
+            if stat.st_size != size or stat.st_mtime_ns != mtime:
+                self.misses += 1
+                return None
+        self.hits += 1
+        self.used_entries[digest] = entry
+        return [fname for fname, _, _ in entry]
+
+    # =========================================================================
+    def store(self, digest, files):
+        """Store list of files rendered for digest."""
+        entry = []
+        for fname in files:
+            stat = os.stat(fname)
+            entry.append([fname, stat.st_size, stat.st_mtime_ns])
+        self.entries[digest] = entry
+        self.used_entries[digest] = entry
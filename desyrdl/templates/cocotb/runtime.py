@@ -0,0 +1,971 @@
+"""DesyRDL cocotb runtime.
+
+Access to the address map items over a bus providing the read_dwords and
+write_dwords coroutines. Values are converted on whole numpy arrays.
+"""
+
+import asyncio
+import contextlib
+import functools
+import itertools
+import mmap
+import os
+import sys
+import weakref
+
+import numpy as np
+
+WORD_BITS = 32
+# float32 holds integers up to 24 bits exactly
+FLOAT32_INT_BITS = 24
+
+
+def to_words(values, mask=0xFFFFFFFF):
+    """Return integer values as raw bus words, negative values in two's complement."""
+    if values.dtype.kind == 'f':
+        values = np.rint(values)
+    return (values.astype(np.int64) & mask).astype(np.uint32)
+
+
+def bursts(regions, max_words=None):
+    """Merge regions, (offset, words) tuples sorted by offset, into bursts of contiguous words.
+
+    Overlapping regions, e.g. the registers of a memory, are part of one burst.
+    Bursts have at most max_words words, regions are merged up to max_words
+    and larger regions are split.
+    """
+    for start, words in merge_regions(regions, max_words):
+        step = words if max_words is None else max_words
+        for offset in range(start, start + words, step):
+            yield offset, min(step, start + words - offset)
+
+
+def merge_regions(regions, max_words=None):
+    """Merge regions into contiguous ranges of words, up to max_words unless a region is larger."""
+    start = end = None
+    for offset, words in regions:
+        first, stop = offset, offset + words
+        if start is not None:
+            if stop <= end:
+                continue
+            if offset <= end and (max_words is None or stop - start <= max_words):
+                end = stop
+                continue
+            yield start, end - start
+            # words of the previous burst are not repeated
+            first = max(offset, end)
+        start, end = first, stop
+    if start is not None:
+        yield start, end - start
+
+
+async def gather(*coros):
+    """Run coroutines concurrently, as cocotb tasks in a simulation, else with asyncio."""
+    cocotb = sys.modules.get("cocotb")
+    if cocotb is not None and getattr(cocotb, "top", None) is not None:
+        tasks = [cocotb.start_soon(coro) for coro in coros]
+        return [await task for task in tasks]
+    return await asyncio.gather(*coros)
+
+
+class AddrmapItem:
+    """Item of the address space, register, memory or a whole block of words."""
+
+    def __init__(self, name, bus, address, size, *, bits=WORD_BITS, fixp=0, signed=0, access="RW"):
+        self.name = name
+        self.bus = bus
+        self.address = address
+        self.size = size
+        self.bits = bits
+        self.fixp = fixp
+        self.signed = signed
+        self.access = access
+        # conversion of raw bus words, computed once per item
+        self.mask = (1 << bits) - 1
+        self.sign_shift = WORD_BITS - bits
+        self.scaling = 1
+        if fixp == "IEEE754":
+            self.dtype = np.float32
+        elif fixp == 0 and signed == 0:
+            self.dtype = np.uint32
+        elif fixp == 0 and signed == 1:
+            self.dtype = np.int32
+        else:
+            self.scaling = 1 / pow(2, fixp)
+            self.dtype = np.float32 if bits <= FLOAT32_INT_BITS else np.float64
+        # words of views on the bus memory, item values where no conversion is needed
+        if fixp == "IEEE754":
+            self.view_dtype = np.float32
+        elif fixp == 0 and signed == 1 and bits == WORD_BITS:
+            self.view_dtype = np.int32
+        else:
+            self.view_dtype = np.uint32
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, address=0x{self.address:X}, size={self.size})"
+
+    def from_raw(self, data):
+        """Convert raw bus words to item values, array at once."""
+        raw = np.asarray(data, dtype=np.uint32)
+        if self.fixp == "IEEE754":
+            return raw.view(np.float32)
+        if self.signed:
+            # sign extension from the item width
+            values = (raw << self.sign_shift).view(np.int32) >> self.sign_shift
+        else:
+            values = raw & self.mask
+        if self.scaling != 1:
+            return (values * self.scaling).astype(self.dtype)
+        return values.astype(self.dtype, copy=False)
+
+    def to_raw(self, value):
+        """Convert item values, scalar or array, to raw bus words."""
+        values = np.asarray(value).ravel()
+        if self.fixp == "IEEE754":
+            return values.astype(np.float32).view(np.uint32)
+        if self.scaling != 1:
+            values = values / self.scaling
+        return to_words(values, self.mask)
+
+    async def read(self, count=1, offset=0):
+        data = await self.bus.read_dwords(self.address + offset * 4, count)
+        return self.from_raw(data)
+
+    async def read_raw(self, count=1, offset=0):
+        data = await self.bus.read_dwords(self.address + offset * 4, count)
+        return np.asarray(data, dtype=np.uint32)
+
+    def bus_words(self, words):
+        """Return raw words as passed to write_dwords, a list unless the bus takes numpy arrays."""
+        if getattr(self.bus, "array_words", False):
+            return words
+        return words.tolist()
+
+    async def write(self, value, offset=0):
+        # bus takes a list, converted once at the bus boundary
+        await self.bus.write_dwords(self.address + offset * 4, self.bus_words(self.to_raw(value)))
+
+    async def write_raw(self, value, offset=0):
+        data = to_words(np.asarray(value).ravel())
+        await self.bus.write_dwords(self.address + offset * 4, self.bus_words(data))
+
+    def view(self):
+        """Return the item words as numpy array on the memory of the bus, without copy.
+
+        Needs a bus mapping the memory, e.g. MmapBus. The words are float32 for
+        IEEE754 items, int32 for signed 32 bit items and raw uint32 words else,
+        from_raw converts raw words to item values.
+        """
+        return self.bus.view(self.address, self.size // 4, self.view_dtype)
+
+
+class ItemArray(AddrmapItem):
+    """Array of registers, regfiles, memories or address maps.
+
+    The array is an item covering all elements. Elements are created on first
+    access by index, array[3] or array[1, 2] for two dimensional arrays.
+    """
+
+    def __init__(self, name, bus, address, size, *, shape, stride, element, element_size, **kwargs):
+        super().__init__(name, bus, address, size, **kwargs)
+        self.shape = shape
+        self.stride = stride
+        self.element = element
+        self.element_size = element_size
+        self.length = 1
+        for dim in shape:
+            self.length *= dim
+        self.elements = {}
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for index in range(self.length):
+            yield self[index]
+
+    def __getitem__(self, index):
+        # array[5] and array[1, 2] are the same element of a 2 x 3 array
+        flat = self.flat_index(index)
+        item = self.elements.get(flat)
+        if item is None:
+            item = self.elements[flat] = self.create_element(flat)
+        return item
+
+    def flat_index(self, index):
+        """Return element number of the index, integer or tuple of indices."""
+        if isinstance(index, tuple):
+            if len(index) != len(self.shape):
+                msg = f"{self.name} has {len(self.shape)} dimensions, index {index}"
+                raise IndexError(msg)
+            flat = 0
+            for idx, dim in zip(index, self.shape):
+                if not 0 <= idx < dim:
+                    msg = f"{self.name} index {index} out of range {self.shape}"
+                    raise IndexError(msg)
+                flat = flat * dim + idx
+            return flat
+        if not 0 <= index < self.length:
+            msg = f"{self.name} index {index} out of range {self.length}"
+            raise IndexError(msg)
+        return index
+
+    def view(self):
+        """Return the words of all elements as numpy array on the memory of the bus, without copy.
+
+        The array has the shape of the item array, with the words of the
+        element as last dimension if elements have more than one word.
+        """
+        words = self.element_size // 4
+        data = self.bus.view(self.address, (self.length - 1) * self.stride // 4 + words, self.view_dtype)
+        strides = [self.stride]
+        for dim in reversed(self.shape[1:]):
+            strides.insert(0, strides[0] * dim)
+        if words == 1:
+            return np.lib.stride_tricks.as_strided(data, self.shape, strides)
+        return np.lib.stride_tricks.as_strided(data, (*self.shape, words), (*strides, 4))
+
+    def create_element(self, flat):
+        """Return element number flat, named by its index in each dimension."""
+        indices = []
+        rest = flat
+        for dim in reversed(self.shape):
+            rest, idx = divmod(rest, dim)
+            indices.insert(0, idx)
+        return self.element(
+            self.name + "".join(f"[{idx}]" for idx in indices),
+            self.bus,
+            self.address + flat * self.stride,
+            self.element_size,
+            bits=self.bits,
+            fixp=self.fixp,
+            signed=self.signed,
+            access=self.access,
+        )
+
+
+class Register(AddrmapItem):
+    """Register with fields, the fields are attributes created on first access.
+
+    The register keeps a shadow of its value, starting from the reset value
+    and updated by all reads and writes of its address on the bus of the
+    address map, also of other items. With the shadow cache of the address
+    map enabled the shadow is used instead of bus reads where the bits can not
+    change in hardware. Fields are described by (attribute name, instance name,
+    low, high, access, reset, fixp, signed, volatile, onread, onwrite,
+    singlepulse) specs.
+    """
+
+    def __init__(self, name, bus, address, size, *, fields=None, **kwargs):
+        super().__init__(name, bus, address, size, **kwargs)
+        self.field_specs = fields or {}
+        self.reset = 0
+        # bits changed by hardware, bits written neutral to avoid side effects
+        self.volatile = 0
+        self.neutral_mask = 0
+        self.neutral_ones = 0
+        self.writable = 0
+        self.read_clear = 0
+        self.read_set = 0
+        for spec in self.field_specs.values():
+            _, _, low, high, field_access, reset, _, _, volatile, onread, onwrite, singlepulse = spec
+            low = int(low)
+            mask = ((1 << (int(high) - low + 1)) - 1) << low
+            self.reset |= (int(reset) << low) & mask
+            if "W" in field_access:
+                self.writable |= mask
+            if volatile == "1" or onread == "ruser" or onwrite != "none":
+                self.volatile |= mask
+            if singlepulse == "1" or onwrite != "none":
+                self.neutral_mask |= mask
+            if onwrite in ("wzs", "wzc", "wzt"):
+                self.neutral_ones |= mask
+            if onread == "rclr":
+                self.read_clear |= mask
+            elif onread == "rset":
+                self.read_set |= mask
+        self.shadow = self.reset
+        self.valid = True
+        # the bus of the address map updates the shadow on every access of the address
+        self.tracked = hasattr(bus, "attach")
+        if self.tracked:
+            bus.attach(self)
+
+    def __getattr__(self, attr):
+        # only called for fields not created yet
+        spec = self.__dict__.get("field_specs", {}).get(attr)
+        if spec is None:
+            msg = f"{type(self).__name__!r} object has no attribute {attr!r}"
+            raise AttributeError(msg)
+        field = Field(self, spec)
+        setattr(self, attr, field)
+        return field
+
+    @property
+    def field_names(self):
+        return tuple(self.field_specs)
+
+    def fields(self):
+        """Return list of the fields of the register."""
+        return [getattr(self, name) for name in self.field_specs]
+
+    def invalidate(self):
+        """Mark the shadow as not valid, the next field access reads the register."""
+        self.valid = False
+
+    def cached(self, mask):
+        """Return True if the bits of mask are valid in the shadow."""
+        if "R" not in self.access:
+            return True
+        return getattr(self.bus, "shadow", False) and self.valid and not mask & self.volatile
+
+    def update_read(self, word):
+        # hardware clears or sets fields on read
+        self.shadow = (int(word) & ~self.read_clear) | self.read_set
+        self.valid = True
+
+    def update_written(self, word):
+        # single pulse fields return to zero
+        self.shadow = int(word) & ~self.neutral_mask
+        self.valid = True
+
+    async def read(self, count=1, offset=0):
+        data = await self.bus.read_dwords(self.address + offset * 4, count)
+        if offset == 0 and not self.tracked:
+            self.update_read(data[0])
+        return self.from_raw(data)
+
+    async def read_raw(self, count=1, offset=0):
+        data = await self.bus.read_dwords(self.address + offset * 4, count)
+        if offset == 0 and not self.tracked:
+            self.update_read(data[0])
+        return np.asarray(data, dtype=np.uint32)
+
+    async def write(self, value, offset=0):
+        data = self.to_raw(value)
+        await self.bus.write_dwords(self.address + offset * 4, self.bus_words(data))
+        if offset == 0 and not self.tracked:
+            self.update_written(data[0])
+
+    async def write_raw(self, value, offset=0):
+        data = to_words(np.asarray(value).ravel())
+        await self.bus.write_dwords(self.address + offset * 4, self.bus_words(data))
+        if offset == 0 and not self.tracked:
+            self.update_written(data[0])
+
+    async def read_word(self, mask):
+        """Return the register word, from the shadow if the bits of mask are cached."""
+        if self.cached(mask):
+            return self.shadow
+        return int((await self.read_raw())[0])
+
+    async def write_field(self, mask, bits):
+        """Write bits of mask, other writable bits keep their value.
+
+        The register is read only if the kept bits are not cached. Fields with
+        write side effects and single pulse fields are written neutral.
+        """
+        keep = self.writable & ~mask & ~self.neutral_mask
+        word = await self.read_word(keep) if keep else 0
+        word = (word & ~self.neutral_mask) | self.neutral_ones
+        await self.write_raw((word & ~mask) | (bits & mask))
+
+
+class Field(AddrmapItem):
+    """Field of a register, read and written with its own data type."""
+
+    def __init__(self, register, spec):
+        _, inst_name, low, high, access, reset, fixp, signed, *_ = spec
+        self.register = register
+        self.low = int(low)
+        self.high = int(high)
+        self.reset = int(reset)
+        super().__init__(
+            register.name + "." + inst_name,
+            register.bus,
+            register.address,
+            4,
+            bits=self.high - self.low + 1,
+            fixp=fixp if fixp == "IEEE754" else int(fixp),
+            signed=int(signed),
+            access=access,
+        )
+        self.field_mask = self.mask << self.low
+
+    async def read(self):
+        return self.from_raw([await self.read_raw()])
+
+    async def read_raw(self):
+        word = await self.register.read_word(self.field_mask)
+        return (word & self.field_mask) >> self.low
+
+    async def write(self, value):
+        await self.write_raw(int(self.to_raw(value)[0]))
+
+    async def write_raw(self, value):
+        await self.register.write_field(self.field_mask, int(value) << self.low)
+
+
+class Block(AddrmapItem):
+    """Address map, regfile or memory, its items are attributes of the block.
+
+    Generated subclasses describe their items in item_specs, one line per item
+    with the attribute name, instance name, address offset, total size, bits,
+    fixp, signed, access, element class name, element size, array stride and
+    array dimensions. Items are created on first access of the attribute.
+    """
+
+    item_specs = ""
+    # set by memories with registers, the block has data words besides its items
+    memory = False
+
+    @classmethod
+    def specs(cls):
+        """Return item specs of the class by attribute name, parsed once per class.
+
+        Indented lines following a register are the specs of its fields,
+        they are kept by register attribute name in cls._field_specs.
+        """
+        specs = cls.__dict__.get("_specs")
+        if specs is None:
+            specs = {}
+            field_specs = {}
+            attr = None
+            for line in cls.item_specs.splitlines():
+                if line.startswith(" "):
+                    spec = line.split()
+                    field_specs.setdefault(attr, {})[spec[0]] = spec
+                elif line:
+                    spec = line.split()
+                    attr = spec[0]
+                    specs[attr] = spec
+            cls._field_specs = field_specs
+            cls._specs = specs
+        return specs
+
+    @property
+    def item_names(self):
+        return tuple(self.specs())
+
+    def __getattr__(self, attr):
+        # only called for attributes not created yet
+        spec = type(self).specs().get(attr)
+        if spec is None:
+            msg = f"{type(self).__name__!r} object has no attribute {attr!r}"
+            raise AttributeError(msg)
+        item = self.create_item(spec)
+        setattr(self, attr, item)
+        return item
+
+    def create_item(self, spec):
+        attr, inst_name, offset, size, bits, fixp, signed, access, cls_name, element_size, stride, *shape = spec
+        cls = getattr(sys.modules[type(self).__module__], cls_name)
+        if cls is Register:
+            cls = functools.partial(Register, fields=type(self)._field_specs.get(attr))
+        name = self.name + "." + inst_name
+        address = self.address + int(offset)
+        conversion = {
+            "bits": int(bits),
+            "fixp": fixp if fixp == "IEEE754" else int(fixp),
+            "signed": int(signed),
+            "access": access,
+        }
+        if not shape:
+            return cls(name, self.bus, address, int(size), **conversion)
+        return ItemArray(
+            name,
+            self.bus,
+            address,
+            int(size),
+            shape=tuple(int(dim) for dim in shape),
+            stride=int(stride),
+            element=cls,
+            element_size=int(element_size),
+            **conversion,
+        )
+
+    def children(self):
+        """Return list of the items of the block."""
+        return [getattr(self, name) for name in self.specs()]
+
+    @classmethod
+    def regions(cls):
+        """Return registers and memories of the class, computed once per class.
+
+        Regions are (name, offset, words, access, memory) tuples, offsets are in
+        words from the block address. Arrays of registers or memories with
+        contiguous elements are one region. Registers of a memory are regions
+        within the region of the memory.
+        """
+        regions = cls.__dict__.get("_regions")
+        if regions is not None:
+            return regions
+        regions = []
+        module = sys.modules[cls.__module__]
+        for spec in cls.specs().values():
+            _, inst_name, offset, size, _, _, _, access, cls_name, element_size, stride, *shape = spec
+            element = getattr(module, cls_name)
+            offset, element_size, stride = int(offset) // 4, int(element_size) // 4, int(stride) // 4
+            # a single word is a register, memories have more words
+            memory = element_size > 1
+            if not issubclass(element, Block) and (not shape or stride == element_size):
+                regions.append((inst_name, offset, int(size) // 4, access, memory))
+                continue
+            indices = itertools.product(*(range(int(dim)) for dim in shape)) if shape else [()]
+            for num, index in enumerate(indices):
+                name = inst_name + "".join(f"[{idx}]" for idx in index)
+                base = offset + num * stride
+                if issubclass(element, Block):
+                    if element.memory:
+                        regions.append((name, base, element_size, access, True))
+                    regions.extend(
+                        (f"{name}.{sub_name}", base + sub_offset, words, sub_access, sub_memory)
+                        for sub_name, sub_offset, words, sub_access, sub_memory in element.regions()
+                    )
+                else:
+                    regions.append((name, base, element_size, access, memory))
+        regions.sort(key=lambda region: region[1])
+        cls._regions = regions
+        return regions
+
+    def record_dtype(self, regions):
+        """Return numpy structured data type of the regions, field offsets are the addresses in the block."""
+        return np.dtype(
+            {
+                "names": [name for name, *_ in regions],
+                "formats": [(np.uint32, (words,)) if words > 1 else np.uint32 for _, _, words, _, _ in regions],
+                "offsets": [offset * 4 for _, offset, _, _, _ in regions],
+                "itemsize": self.size,
+            }
+        )
+
+    async def snapshot(self, *, memories=True, max_words=None):
+        """Read all readable registers, and memories if requested, in bursts of contiguous words.
+
+        Returns a numpy structured record of raw words with a field per register
+        or memory named by its path in the block, e.g. record["CORE[1].CTRL"].
+        Write only registers are skipped.
+        """
+        regions = [region for region in self.regions() if "R" in region[3] and (memories or not region[4])]
+        words = np.zeros(self.size // 4, dtype=np.uint32)
+        for offset, count in bursts([(region[1], region[2]) for region in regions], max_words):
+            data = await self.bus.read_dwords(self.address + offset * 4, count)
+            words[offset : offset + count] = data
+        return words.view(self.record_dtype(regions))[0]
+
+    async def restore(self, record, *, max_words=None):
+        """Write the registers and memories of a record taken with snapshot in bursts of contiguous words.
+
+        Only fields of the record which are writable are written, read only
+        registers are skipped.
+        """
+        if record.dtype.itemsize != self.size:
+            msg = f"{self.name}: record of {record.dtype.itemsize} bytes, block has {self.size} bytes"
+            raise ValueError(msg)
+        names = set(record.dtype.names)
+        regions = [region for region in self.regions() if "W" in region[3] and region[0] in names]
+        words = np.asarray(record).reshape(1).view(np.uint32)
+        for offset, count in bursts([(region[1], region[2]) for region in regions], max_words):
+            await self.bus.write_dwords(self.address + offset * 4, self.bus_words(words[offset : offset + count]))
+
+
+ITEM_DTYPE = [
+    ("name", "U"),
+    ("address", np.uint64),
+    ("size", np.uint64),
+    ("bits", np.uint8),
+    ("fixp", np.int16),
+    ("signed", np.uint8),
+    ("ieee754", np.uint8),
+    ("access", "U2"),
+]
+
+
+def parse_items(text):
+    """Return rows of the item table text, one line per item with whitespace separated columns."""
+    return [line.split() for line in text.splitlines() if line]
+
+
+def item_table(rows):
+    """Return the item rows as numpy structured array, one column per item attribute."""
+    columns = list(zip(*rows)) if rows else [()] * len(ITEM_DTYPE)
+    name_len = max((len(name) for name in columns[0]), default=1)
+    dtype = [(field, f"U{name_len}" if field == "name" else kind) for field, kind in ITEM_DTYPE]
+    table = np.empty(len(rows), dtype=dtype)
+    for (field, _), column in zip(dtype, columns):
+        # numbers are converted from their text
+        table[field] = np.array(column)
+    table.flags.writeable = False
+    return table
+
+
+class ItemTable:
+    """Items of the flattened address map by module and name path.
+
+    The generated module holds the map as text, one line per item. It is parsed
+    on first use and held as columns of a numpy structured array. Items are
+    created on first access by path, e.g. table["APP.CTRL"].
+    """
+
+    def __init__(self, text, bus):
+        self.rows = parse_items(text)
+        self.bus = bus
+        self.created = {}
+        self._table = None
+        self._index = None
+
+    @property
+    def table(self):
+        """Numpy structured array of the items, built on first use."""
+        if self._table is None:
+            self._table = item_table(self.rows)
+        return self._table
+
+    @property
+    def index(self):
+        """Row number by path, built on first lookup."""
+        if self._index is None:
+            self._index = {row[0]: num for num, row in enumerate(self.rows)}
+        return self._index
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return (row[0] for row in self.rows)
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def __getitem__(self, path):
+        item = self.created.get(path)
+        if item is None:
+            item = self.created[path] = self.create_item(self.index[path])
+        return item
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (self[path] for path in self)
+
+    def items(self):
+        return ((path, self[path]) for path in self)
+
+    def create_item(self, num):
+        name, address, size, bits, fixp, signed, ieee754, access = self.rows[num]
+        fixp = "IEEE754" if ieee754 == "1" else int(fixp)
+        return AddrmapItem(
+            name, self.bus, int(address), int(size), bits=int(bits), fixp=fixp, signed=int(signed), access=access
+        )
+
+
+class PendingRead:
+    """Read queued in a batch, awaiting it returns the item values."""
+
+    def __init__(self, bus, item, count, offset, raw):
+        self.bus = bus
+        self.item = item
+        self.address = item.address + offset * 4
+        self.count = count
+        self.raw = raw
+        self.done = False
+        self.value = None
+
+    def set_data(self, data):
+        self.value = np.asarray(data, dtype=np.uint32) if self.raw else self.item.from_raw(data)
+        self.done = True
+
+    async def result(self):
+        if not self.done:
+            await self.bus.flush()
+        if not self.done:
+            msg = f"{self.item.name}: batch ended before the read was issued"
+            raise RuntimeError(msg)
+        return self.value
+
+    def __await__(self):
+        return self.result().__await__()
+
+
+class BatchBus:
+    """Bus of the address map, queues writes and reads in batches.
+
+    Outside of a batch accesses are passed to the bus. In a batch writes are
+    queued, reads of items wait for the queued writes. Attributes other than
+    the access coroutines are the ones of the bus. shadow enables the shadow
+    register cache of the address map, not on buses with views of the memory
+    as views change the words without bus writes.
+
+    Registers attached to the bus have their shadows updated by every read
+    and write of their address, by any item.
+    """
+
+    def __init__(self, bus, *, shadow=False):
+        self.bus = bus
+        self.shadow = shadow and not hasattr(bus, "view")
+        self.queue = None
+        self.concurrent = True
+        self.max_words = None
+        # registers by address, registers attached after the first access do not know their value
+        self.registers = {}
+        self.accessed = False
+
+    def __getattr__(self, attr):
+        return getattr(self.bus, attr)
+
+    def attach(self, register):
+        """Update the shadow of the register on the accesses of its address."""
+        self.registers.setdefault(register.address, weakref.WeakSet()).add(register)
+        if self.accessed:
+            register.invalidate()
+
+    def update_shadows(self, address, data, *, written):
+        """Update the shadows of the registers within the words read or written from address."""
+        self.accessed = True
+        if not self.registers:
+            return
+        end = address + len(data) * 4
+        if len(data) <= len(self.registers):
+            addresses = [word_address for word_address in range(address, end, 4) if word_address in self.registers]
+        else:
+            addresses = [word_address for word_address in self.registers if address <= word_address < end]
+        for word_address in addresses:
+            word = data[(word_address - address) // 4]
+            for register in self.registers[word_address]:
+                if written:
+                    register.update_written(word)
+                else:
+                    register.update_read(word)
+
+    async def read_dwords(self, address, count):
+        if self.queue:
+            await self.flush()
+        data = await self.bus.read_dwords(address, count)
+        self.update_shadows(address, data, written=False)
+        return data
+
+    async def write_dwords(self, address, data):
+        # shadows take the written words when the write is queued, as later reads see them
+        self.update_shadows(address, data, written=True)
+        if self.queue is None:
+            await self.bus.write_dwords(address, data)
+        else:
+            self.queue.append((address, list(data)))
+
+    def read(self, item, count=1, offset=0, *, raw=False):
+        """Queue a read of the item, returns a PendingRead to await for the values."""
+        if self.queue is None:
+            msg = "reads are queued only in a batch"
+            raise RuntimeError(msg)
+        pending = PendingRead(self, item, count, offset, raw)
+        self.queue.append(pending)
+        return pending
+
+    @contextlib.asynccontextmanager
+    async def batch(self, *, concurrent=True, max_words=None):
+        """Queue writes and reads, issue them when the block ends.
+
+        Consecutive writes to adjacent addresses are merged into one
+        write_dwords call, up to max_words words. Consecutive queued reads
+        are issued concurrently if concurrent is set, for buses supporting
+        outstanding transactions. Queued operations keep their order
+        otherwise. A batch in a batch is part of the outer one.
+        """
+        if self.queue is not None:
+            yield self
+            return
+        self.queue = []
+        self.concurrent = concurrent
+        self.max_words = max_words
+        try:
+            yield self
+            await self.flush()
+        finally:
+            self.queue = None
+
+    async def flush(self):
+        """Issue the queued writes and reads."""
+        if not self.queue:
+            return
+        queue = self.queue[:]
+        self.queue.clear()
+        writes, reads = [], []
+        for entry in queue:
+            if isinstance(entry, PendingRead):
+                if writes:
+                    await self.write_bursts(writes)
+                    writes = []
+                reads.append(entry)
+            else:
+                if reads:
+                    await self.read_all(reads)
+                    reads = []
+                writes.append(entry)
+        if writes:
+            await self.write_bursts(writes)
+        if reads:
+            await self.read_all(reads)
+
+    async def write_bursts(self, writes):
+        address, data = writes[0][0], list(writes[0][1])
+        for next_address, next_data in writes[1:]:
+            if next_address == address + len(data) * 4 and (
+                self.max_words is None or len(data) + len(next_data) <= self.max_words
+            ):
+                data.extend(next_data)
+                continue
+            await self.bus.write_dwords(address, data)
+            address, data = next_address, list(next_data)
+        await self.bus.write_dwords(address, data)
+
+    async def read_all(self, reads):
+        if self.concurrent:
+            results = await gather(*(self.bus.read_dwords(read.address, read.count) for read in reads))
+        else:
+            results = [await self.bus.read_dwords(read.address, read.count) for read in reads]
+        for read, data in zip(reads, results):
+            self.update_shadows(read.address, data, written=False)
+            read.set_data(data)
+
+
+class MmapBus:
+    """Bus on memory mapped at a bus address, e.g. a UIO device or the shared memory of a co-simulation.
+
+    target is the path of a file mapped with mmap or an object with a
+    writable buffer, e.g. mmap, bytearray or the buf of a multiprocessing
+    SharedMemory. The bus maps size bytes from offset of the target, up to its
+    end if size is not given. Reads return numpy copies of the words,
+    writes take lists or numpy arrays, view() returns the words in place.
+    """
+
+    # write_dwords takes numpy arrays, items pass them without list conversion
+    array_words = True
+
+    def __init__(self, target, address=0, size=None, *, offset=0):
+        self.address = address
+        self.mmap = None
+        if isinstance(target, (str, os.PathLike)):
+            fd = os.open(target, os.O_RDWR)
+            try:
+                if size is None:
+                    size = os.fstat(fd).st_size - offset
+                if size <= 0:
+                    msg = f"{target}: size of the mapped memory not known, give size"
+                    raise ValueError(msg)
+                target = self.mmap = mmap.mmap(fd, size, offset=offset)
+            finally:
+                os.close(fd)
+            # the mapping starts at offset
+            offset = 0
+        self.words = np.frombuffer(target, dtype=np.uint32, count=-1 if size is None else size // 4, offset=offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap the file mapped by the bus, views of its words are invalid afterwards."""
+        self.words = None
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+    def span(self, address, count):
+        start = (address - self.address) >> 2
+        if address & 3 or start < 0 or start + count > len(self.words):
+            msg = f"0x{address:X}: {count} words out of the mapped memory at 0x{self.address:X}"
+            raise ValueError(msg)
+        return slice(start, start + count)
+
+    def view(self, address, count, dtype=np.uint32):
+        """Return count words from address as numpy array of dtype on the mapped memory."""
+        return self.words[self.span(address, count)].view(dtype)
+
+    async def read_dwords(self, address, count):
+        return self.words[self.span(address, count)].copy()
+
+    async def write_dwords(self, address, data):
+        self.words[self.span(address, len(data))] = data
+
+
+class AddressIndex:
+    """Registers and memories sorted by address, resolves bus addresses to paths.
+
+    Array elements are found from the element stride, memory words are
+    elements of their memory. lookup() resolves whole arrays of addresses at
+    once, e.g. addresses of a bus trace.
+    """
+
+    def __init__(self, text):
+        rows = [line.split() for line in text.splitlines() if line]
+        self.paths = [row[0] for row in rows]
+        columns = np.array([row[1:8] for row in rows], dtype=np.int64).reshape(-1, 7)
+        self.base, self.high, self.stride, self.size, self.dims, self.dim_n, self.dim_m = (
+            np.ascontiguousarray(column) for column in columns.T
+        )
+        self.field_specs = [row[8] for row in rows]
+        self.names = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def lookup(self, addresses):
+        """Return entry and element numbers of the addresses, -1 for addresses not mapped."""
+        addresses = np.asarray(addresses, dtype=np.int64)
+        entries = np.searchsorted(self.base, addresses, side="right") - 1
+        found = entries >= 0
+        entries = np.where(found, entries, 0)
+        offsets = addresses - self.base[entries]
+        strides = self.stride[entries]
+        elements = offsets // np.maximum(strides, 1) * (strides > 0)
+        # addresses in the gaps between array elements are not mapped
+        found &= (addresses <= self.high[entries]) & (offsets - elements * strides < self.size[entries])
+        return np.where(found, entries, -1), np.where(found, elements, -1)
+
+    def fields(self, entry):
+        """Return (low, high, name) of the fields of the entry."""
+        spec = self.field_specs[entry]
+        if spec == "-":
+            return []
+        return [(int(low), int(high), name) for low, high, name in (field.split(":") for field in spec.split(","))]
+
+    def name(self, entry, element, bit=None):
+        """Return path of the entry element, e.g. top.APP.TABLE[3], with the field of the bit if given."""
+        dims = self.dims[entry]
+        if dims > 1:
+            row, column = divmod(element, self.dim_m[entry])
+            path = f"{self.paths[entry]}[{row}][{column}]"
+        elif dims == 1:
+            path = f"{self.paths[entry]}[{element}]"
+        else:
+            path = self.paths[entry]
+        if bit is not None:
+            for low, high, field in self.fields(entry):
+                if low <= bit <= high:
+                    return f"{path}.{field}"
+        return path
+
+    def resolve(self, address, bit=None):
+        """Return path of the address, None if it is not mapped."""
+        entries, elements = self.lookup([address])
+        if entries[0] < 0:
+            return None
+        return self.name(int(entries[0]), int(elements[0]), bit)
+
+    def resolve_all(self, addresses):
+        """Return list of paths of the addresses, None for addresses not mapped."""
+        entries, elements = self.lookup(addresses)
+        names = self.names
+        paths = []
+        for entry, element in zip(entries.tolist(), elements.tolist()):
+            if entry < 0:
+                paths.append(None)
+                continue
+            path = names.get((entry, element))
+            if path is None:
+                path = names[entry, element] = self.name(entry, element)
+            paths.append(path)
+        return paths
@@ -0,0 +1,347 @@
+"""DesyRDL device model runtime.
+
+Bus functional model of the address space, a drop-in bus of the cocotb
+address map providing the read_dwords and write_dwords coroutines, to run
+register sequences without a simulator. Register words follow the software
+and hardware access of their fields, memories and external address maps are
+plain storage. Words are held in one numpy buffer.
+"""
+
+import re
+
+import numpy as np
+
+# access of words
+UNMAPPED = 0
+READ = 1
+WRITE = 2
+REGISTER = 4
+ACCESS = {"r": READ, "w": WRITE, "rw": READ | WRITE, "na": UNMAPPED}
+
+# columns of the register masks, bits read, stored on write and changed by onwrite, onread and singlepulse
+MASKS = ("read", "write", "woclr", "woset", "wot", "wzs", "wzc", "wzt", "wclr", "wset", "rclr", "rset", "pulse")
+READ_MASK, WRITE_MASK, WOCLR, WOSET, WOT, WZS, WZC, WZT, WCLR, WSET, RCLR, RSET, PULSE = range(len(MASKS))
+
+WORD = 0xFFFFFFFF
+
+INDICES = re.compile(r"((?:\[\d+\])*)$")
+
+
+def write_word(old, data, masks):
+    """Return register word after a software write of data, works on ints and numpy arrays of words."""
+    new = (old & ~masks[WRITE_MASK]) | (data & masks[WRITE_MASK])
+    new &= ~(data & masks[WOCLR])
+    new |= data & masks[WOSET]
+    new ^= data & masks[WOT]
+    new |= ~data & masks[WZS]
+    new &= data | ~masks[WZC]
+    new ^= ~data & masks[WZT]
+    new &= ~masks[WCLR]
+    return (new | masks[WSET]) & WORD
+
+
+class FieldSpec:
+    """Field of a register, its software and hardware access and side effects."""
+
+    __slots__ = (
+        "decrvalue",
+        "high",
+        "hw",
+        "incrvalue",
+        "intr",
+        "low",
+        "mask",
+        "name",
+        "onread",
+        "onwrite",
+        "reset",
+        "singlepulse",
+        "sticky",
+        "storage",
+        "sw",
+    )
+
+    def __init__(self, token):
+        spec = token.split(":")
+        name, low, high, sw, hw, onread, onwrite, singlepulse, storage, intr, sticky, reset, incr, decr = spec
+        self.name = name
+        self.low = int(low)
+        self.high = int(high)
+        self.mask = ((1 << (self.high - self.low + 1)) - 1) << self.low
+        self.sw = sw.rstrip("1")  # write once access is modeled as write access
+        self.hw = hw.rstrip("1")
+        self.onread = onread
+        self.onwrite = onwrite
+        self.singlepulse = singlepulse == "1"
+        self.storage = storage == "1"
+        self.intr = intr == "1"
+        self.sticky = sticky == "1"
+        self.reset = (int(reset) << self.low) & self.mask
+        self.incrvalue = int(incr)
+        self.decrvalue = int(decr)
+
+
+class RegisterSpec:
+    """Fields of a register type and the masks of their bits by side effect."""
+
+    def __init__(self, fields):
+        self.fields = {field.name: field for field in fields}
+        masks = dict.fromkeys(MASKS, 0)
+        for field in fields:
+            if "r" in field.sw:
+                masks["read"] |= field.mask
+                if field.onread in masks:
+                    masks[field.onread] |= field.mask
+            if "w" in field.sw and field.storage:
+                masks[field.onwrite if field.onwrite in masks else "write"] |= field.mask
+                if field.singlepulse:
+                    masks["pulse"] |= field.mask
+        self.masks = tuple(masks[mask] for mask in MASKS)
+        self.reset = sum(field.reset for field in fields)
+        # reads and writes of registers without side effects take the plain path
+        self.plain_read = not (masks["rclr"] | masks["rset"])
+
+
+class DeviceModel:
+    """Bus functional model of an address space.
+
+    Registers are described by register_specs, one line per register or
+    register array with the path, address, array stride, number of elements
+    and the fields. memory_specs has one line per memory or external address
+    map with path, address, number of words and software access.
+
+    Software accesses read_dwords and write_dwords, or read and write without
+    await, apply the field access: bits which are not readable read 0, onread
+    fields are cleared or set after the read, onwrite fields are changed
+    according to the written bits, singlepulse fields read 0 after the write.
+    Unmapped addresses read 0 and ignore writes, like the generated decoders.
+    The hardware side of the fields is accessed by path with hw_read, hw_write,
+    incr and decr. on_read and on_write register callbacks emulating the
+    reaction of the logic on software accesses.
+    """
+
+    # write_dwords takes numpy arrays, items pass them without list conversion
+    array_words = True
+
+    def __init__(self, register_specs, memory_specs, address, size):
+        self.address = address
+        self.words = np.zeros(size // 4, dtype=np.uint32)
+        self.access = np.zeros(size // 4, dtype=np.uint8)
+        self.specs = []
+        self.paths = {}
+        self.read_watchers = {}
+        self.write_watchers = {}
+        spec_rows = {}
+        reg_words = []
+        reg_specs = []
+        for line in register_specs.splitlines():
+            if not line:
+                continue
+            path, base, stride, count, fields = line.split()
+            row = spec_rows.get(fields)
+            if row is None:
+                row = spec_rows[fields] = len(self.specs)
+                self.specs.append(RegisterSpec([FieldSpec(token) for token in fields.split(",")]))
+            shape = tuple(int(dim) for dim in count.split("x"))
+            first = (int(base) - address) // 4
+            words = first + np.arange(int(np.prod(shape))) * (int(stride) // 4)
+            self.paths[path] = (first, int(stride) // 4, shape, row)
+            reg_words.append(words)
+            reg_specs.append(np.full(len(words), row, dtype=np.int32))
+        for line in memory_specs.splitlines():
+            if not line:
+                continue
+            path, base, count, access = line.split()
+            first = (int(base) - address) // 4
+            self.access[first : first + int(count)] = ACCESS[access]
+        reg_words = np.concatenate(reg_words) if reg_words else np.zeros(0, dtype=np.int64)
+        reg_specs = np.concatenate(reg_specs) if reg_specs else np.zeros(0, dtype=np.int32)
+        order = np.argsort(reg_words)
+        self.reg_words = reg_words[order]
+        self.reg_specs = reg_specs[order]
+        self.access[self.reg_words] = REGISTER
+        self.masks = np.array([spec.masks for spec in self.specs], dtype=np.uint32).reshape(-1, len(MASKS))
+        self.resets = np.array([spec.reset for spec in self.specs], dtype=np.uint32)
+        self.reg_at = dict(zip(self.reg_words.tolist(), self.reg_specs.tolist()))
+        self.reset()
+
+    def reset(self):
+        """Reset all registers to their reset values, memories keep their content."""
+        self.words[self.reg_words] = self.resets[self.reg_specs]
+
+    # =========================================================================
+    # software side, the bus
+    async def read_dwords(self, address, count):
+        return self.read(address, count)
+
+    async def write_dwords(self, address, data):
+        self.write(address, data)
+
+    def read(self, address, count=1):
+        """Return count words read from address as numpy array."""
+        start = (address - self.address) >> 2
+        if count == 1 and 0 <= start < len(self.words):
+            return np.array([self.read_one(start)], dtype=np.uint32)
+        data = np.zeros(count, dtype=np.uint32)
+        low, high = max(start, 0), min(start + count, len(self.words))
+        if low >= high:
+            return data
+        words = self.words[low:high]
+        access = self.access[low:high]
+        data[low - start : high - start] = np.where(access & READ, words, 0)
+        if access.max() & REGISTER:
+            first, last = np.searchsorted(self.reg_words, [low, high])
+            for word in self.reg_words[first:last].tolist():
+                data[word - start] = self.read_one(word)
+        return data
+
+    def read_one(self, word):
+        """Return word of the buffer read by software, with the side effects of register fields."""
+        row = self.reg_at.get(word)
+        if row is None:
+            return int(self.words[word]) if self.access[word] & READ else 0
+        watchers = self.read_watchers.get(word)
+        if watchers:
+            for callback, element in watchers:
+                callback(element, int(self.words[word]))
+        value = int(self.words[word])
+        spec = self.specs[row]
+        if not spec.plain_read:
+            masks = spec.masks
+            self.words[word] = (value & ~masks[RCLR] | masks[RSET]) & WORD
+        return value & spec.masks[READ_MASK]
+
+    def write(self, address, data):
+        """Write words of data, a list or numpy array, to address."""
+        start = (address - self.address) >> 2
+        if len(data) == 1 and 0 <= start < len(self.words):
+            self.write_one(start, int(data[0]))
+            return
+        data = np.asarray(data, dtype=np.uint32)
+        low, high = max(start, 0), min(start + len(data), len(self.words))
+        if low >= high:
+            return
+        data = data[low - start : high - start]
+        access = self.access[low:high]
+        plain = (access & (WRITE | REGISTER)) == WRITE
+        self.words[low:high][plain] = data[plain]
+        if access.max() & REGISTER:
+            first, last = np.searchsorted(self.reg_words, [low, high])
+            words = self.reg_words[first:last]
+            if not any(word in self.write_watchers for word in words.tolist()):
+                # registers without callbacks are written at once
+                masks = self.masks[self.reg_specs[first:last]].T
+                new = write_word(self.words[words], data[words - low], masks)
+                self.words[words] = new & ~masks[PULSE]
+                return
+            for word in words.tolist():
+                self.write_one(word, int(data[word - low]))
+
+    def write_one(self, word, data):
+        """Write data to word of the buffer, with the side effects of register fields."""
+        row = self.reg_at.get(word)
+        if row is None:
+            if self.access[word] & WRITE:
+                self.words[word] = data
+            return
+        masks = self.specs[row].masks
+        value = write_word(int(self.words[word]), data, masks)
+        self.words[word] = value
+        watchers = self.write_watchers.get(word)
+        if watchers:
+            for callback, element in watchers:
+                callback(element, value)
+        if masks[PULSE]:
+            self.words[word] &= ~masks[PULSE] & WORD
+
+    # =========================================================================
+    # hardware side, registers and fields by path
+    def locate(self, path):
+        """Return buffer words, element numbers and register spec of a register path.
+
+        The path is a register, e.g. top.APP.CTRL, a register array or an
+        element of it, e.g. top.APP.TABLE[3].
+        """
+        indices = INDICES.search(path).group(1)
+        name = path[: len(path) - len(indices)]
+        if name not in self.paths:
+            # arrays of regfiles and address maps are unrolled, their indices are part of the path
+            name, indices = path, ""
+        if name not in self.paths:
+            msg = f"Cannot find register `{path}` in the device model"
+            raise KeyError(msg)
+        first, stride, shape, row = self.paths[name]
+        elements = np.arange(int(np.prod(shape))).reshape(shape)
+        if indices:
+            elements = elements[tuple(int(idx) for idx in indices[1:-1].split("]["))]
+        elements = np.ravel(elements)
+        return first + elements * stride, elements, self.specs[row]
+
+    def field(self, spec, name):
+        """Return field spec by name, None for the whole register."""
+        if name is None:
+            return None
+        field = spec.fields.get(name)
+        if field is None:
+            msg = f"Register has no field `{name}`"
+            raise KeyError(msg)
+        return field
+
+    def hw_read(self, path, field=None):
+        """Return the register word or the field value as seen by the logic, numpy array for arrays."""
+        words, _, spec = self.locate(path)
+        values = self.words[words]
+        field = self.field(spec, field)
+        if field is not None:
+            values = (values & field.mask) >> field.low
+        return int(values[0]) if values.size == 1 else values
+
+    def hw_write(self, path, value, field=None):
+        """Write the fields writable by the logic, all of them or the given field.
+
+        Sticky interrupt fields keep their set bits, the value is or-ed.
+        """
+        words, _, spec = self.locate(path)
+        fields = [self.field(spec, field)] if field is not None else spec.fields.values()
+        for fld in fields:
+            if "w" not in fld.hw:
+                if field is not None:
+                    msg = f"Field `{fld.name}` of `{path}` is not writable by hardware"
+                    raise ValueError(msg)
+                continue
+            bits = (np.asarray(value, dtype=np.int64) << (fld.low if field is not None else 0)) & fld.mask
+            bits = bits.astype(np.uint32)
+            if fld.intr and fld.sticky:
+                self.words[words] |= bits
+            else:
+                self.words[words] = (self.words[words] & ~np.uint32(fld.mask)) | bits
+
+    def incr(self, path, field, value=None):
+        """Increment counter field by value, default the incrvalue of the field, wrapping around."""
+        self.count(path, field, value, 1)
+
+    def decr(self, path, field, value=None):
+        """Decrement counter field by value, default the decrvalue of the field, wrapping around."""
+        self.count(path, field, value, -1)
+
+    def count(self, path, field, value, sign):
+        words, _, spec = self.locate(path)
+        fld = self.field(spec, field)
+        if value is None:
+            value = fld.incrvalue if sign > 0 else fld.decrvalue
+        counts = ((self.words[words] & fld.mask) >> fld.low).astype(np.int64) + sign * value
+        bits = ((counts << fld.low) & fld.mask).astype(np.uint32)
+        self.words[words] = (self.words[words] & ~np.uint32(fld.mask)) | bits
+
+    def on_read(self, path, callback):
+        """Call callback(element, value) before software reads of the register, with the register word."""
+        self.watch(self.read_watchers, path, callback)
+
+    def on_write(self, path, callback):
+        """Call callback(element, value) after software writes of the register, before singlepulse fields clear."""
+        self.watch(self.write_watchers, path, callback)
+
+    def watch(self, watchers, path, callback):
+        words, elements, _ = self.locate(path)
+        for word, element in zip(words.tolist(), elements.tolist()):
+            watchers.setdefault(word, []).append((callback, element))
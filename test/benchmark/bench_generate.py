@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# --------------------------------------------------------------------------- #
+#           ____  _____________  __                                           #
+#          / __ \/ ____/ ___/\ \/ /                 _   _   _                 #
+#         / / / / __/  \__ \  \  /                 / \ / \ / \                #
+#        / /_/ / /___ ___/ /  / /               = ( M | S | K )=              #
+#       /_____/_____//____/  /_/                   \_/ \_/ \_/                #
+#                                                                             #
+# --------------------------------------------------------------------------- #
+# @copyright Copyright 2026 DESY
+# SPDX-License-Identifier: Apache-2.0
+# --------------------------------------------------------------------------- #
+# @date 2026-10-18
+# --------------------------------------------------------------------------- #
+"""Generation benchmark.
+
+Generates synthetic SystemRDL designs and measures time and peak memory of
+the DesyRDL processor for every output format. Results are saved as JSON and
+can be compared with a previous run.
+
+    python test/benchmark/bench_generate.py [-s SCALE] [-r REPEAT] [-o results.json] [-c old.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench_interrupts import gen_rdl as gen_interrupts_rdl
+from systemrdl import RDLCompiler, RDLWalker
+
+import desyrdl
+from desyrdl.DesyListener import DesyRdlProcessor
+
+FORMATS = ['vhdl', 'map', 'h', 'adoc', 'cocotb', 'model', 'tcl']
+PKG_DIR = Path(desyrdl.__file__).parent
+
+
+# -----------------------------------------------------------------------------
+# synthetic designs, size is multiplied by the scale
+def reg_rdl(name, n_fields=1, array=""):
+    """Return register with n_fields fields of mixed access."""
+    width = 32 // n_fields
+    fields = []
+    for idx in range(n_fields):
+        if idx % 3 == 0:
+            fields.append(f"field {{ sw = rw; hw = r; }} f{idx}[{width}] = {idx % 2};")
+        elif idx % 3 == 1:
+            fields.append(f"field {{ sw = r; hw = w; }} f{idx}[{width}];")
+        else:
+            fields.append(f"field {{ sw = rw; hw = rw; we; }} f{idx}[{width}] = 0;")
+    return f"reg {{ {' '.join(fields)} }} {name}{array};"
+
+
+def gen_addrmaps(scale):
+    """Many instances of a small address map."""
+    lines = ['addrmap leaf { desyrdl_interface = "AXI4L";']
+    lines.extend(f"  {reg_rdl(f'R{idx}', 4)}" for idx in range(8))
+    lines.append("};")
+    lines.append('addrmap top { desyrdl_interface = "AXI4L";')
+    lines.extend(f"  leaf M{idx};" for idx in range(32 * scale))
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def gen_hierarchy(scale):
+    """Binary tree of address maps, depth grows with the scale."""
+    depth = 3 + scale
+    lines = []
+    for level in range(depth, -1, -1):
+        lines.append(f'addrmap level{level} {{ desyrdl_interface = "AXI4L";')
+        lines.extend(f"  {reg_rdl(f'R{idx}', 2)}" for idx in range(4))
+        if level < depth:
+            lines.append(f"  level{level + 1} A; level{level + 1} B;")
+        lines.append("};")
+    lines.append('addrmap top { desyrdl_interface = "AXI4L"; level0 L; };')
+    return "\n".join(lines) + "\n"
+
+
+def gen_arrays(scale):
+    """Large register, regfile and memory arrays."""
+    lines = [
+        'addrmap top { desyrdl_interface = "AXI4L";',
+        f"  {reg_rdl('TABLE', 1, f'[{256 * scale}]')}",
+        f"  {reg_rdl('MATRIX', 2, f'[{16 * scale}][16]')}",
+        f"  regfile channel {{ {reg_rdl('CTRL', 4)} {reg_rdl('STATUS', 4)} }};",
+        f"  channel CHANNEL[{64 * scale}];",
+        f"  external mem {{ memwidth = 32; mementries = {1024 * scale}; }} BUFFER;",
+        "};",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def gen_fields(scale):
+    """Many registers with many fields."""
+    lines = ['addrmap top { desyrdl_interface = "AXI4L";']
+    lines.extend(f"  {reg_rdl(f'R{idx}', 32)}" for idx in range(64 * scale))
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def gen_interrupts(scale):
+    """Cascaded interrupt controllers, 32 sources each."""
+    return gen_interrupts_rdl(2 * scale)
+
+
+DESIGNS = {
+    'addrmaps': gen_addrmaps,
+    'hierarchy': gen_hierarchy,
+    'arrays': gen_arrays,
+    'fields': gen_fields,
+    'interrupts': gen_interrupts,
+}
+
+
+# -----------------------------------------------------------------------------
+def compile_rdl(rdl_file):
+    """Compile DesyRDL libraries and the design, return top node."""
+    rdlc = RDLCompiler()
+    for lib_file in sorted((PKG_DIR / "libraries" / "rdl").glob("*.rdl")):
+        rdlc.compile_file(lib_file)
+    rdlc.compile_file(rdl_file)
+    return rdlc.elaborate().top
+
+
+def generate(top, out_format, out_dir):
+    """Walk the design with the processor generating one output format."""
+    processor = DesyRdlProcessor(PKG_DIR / "templates", PKG_DIR / "libraries", Path(out_dir), [out_format])
+    # listener prints progress, keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        RDLWalker(unroll=False).walk(top, processor)
+    return processor.get_generated_files()[out_format]
+
+
+def bench_design(name, scale, repeat, tmp_dir):
+    """Return list of results of the design, one per output format, best time of repeat runs."""
+    rdl_file = Path(tmp_dir) / f"{name}.rdl"
+    rdl_file.write_text(DESIGNS[name](scale))
+    start = time.perf_counter()
+    top = compile_rdl(rdl_file)
+    compile_time = time.perf_counter() - start
+
+    results = []
+    for out_format in FORMATS:
+        out_dir = Path(tmp_dir) / name / out_format
+        # time without tracing, memory traced in a separate run
+        gen_time = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            files = generate(top, out_format, out_dir)
+            seconds = time.perf_counter() - start
+            gen_time = seconds if gen_time is None else min(gen_time, seconds)
+        tracemalloc.start()
+        generate(top, out_format, out_dir)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append(
+            {
+                'design': name,
+                'format': out_format,
+                'compile_time': compile_time,
+                'time': gen_time,
+                'peak': peak,
+                'files': len(files),
+                'size': sum(Path(fname).stat().st_size for fname in files),
+            }
+        )
+    return results
+
+
+# -----------------------------------------------------------------------------
+def print_results(results, baseline=None):
+    """Print results table, with ratios to the baseline results if given."""
+    old = {(res['design'], res['format']): res for res in (baseline or [])}
+    header = f"{'design':<12} {'format':<8} {'files':>6} {'size [kB]':>10} {'time [s]':>9} {'peak [MB]':>10}"
+    if old:
+        header += f" {'time/old':>9} {'peak/old':>9}"
+    print(header)
+    for res in results:
+        line = (
+            f"{res['design']:<12} {res['format']:<8} {res['files']:>6} {res['size'] / 1024:>10.1f} "
+            f"{res['time']:>9.3f} {res['peak'] / 2**20:>10.2f}"
+        )
+        old_res = old.get((res['design'], res['format']))
+        if old_res is not None:
+            line += f" {res['time'] / old_res['time']:>9.2f} {res['peak'] / max(old_res['peak'], 1):>9.2f}"
+        print(line)
+
+
+def main():
+    """Run the benchmark, save and compare the results."""
+    arg_parser = argparse.ArgumentParser('DesyRDL generation benchmark')
+    arg_parser.add_argument('-s', '--scale', dest="scale", type=int, default=1, help='size of the designs, default 1')
+    arg_parser.add_argument(
+        '-r', '--repeat', dest="repeat", type=int, default=3, help='timed runs per format, best is taken, default 3'
+    )
+    arg_parser.add_argument(
+        '-d',
+        '--designs',
+        dest="designs",
+        nargs='+',
+        choices=list(DESIGNS),
+        default=list(DESIGNS),
+        help='designs to benchmark, default all',
+    )
+    arg_parser.add_argument('-o', '--output', dest="output", metavar='FILE', help='save results to JSON FILE')
+    arg_parser.add_argument(
+        '-c', '--compare', dest="compare", metavar='FILE', help='compare with results saved in JSON FILE'
+    )
+    args = arg_parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in args.designs:
+            results.extend(bench_design(name, args.scale, args.repeat, tmp_dir))
+
+    baseline = None
+    if args.compare is not None:
+        baseline = json.loads(Path(args.compare).read_text())['results']
+    print_results(results, baseline)
+
+    if args.output is not None:
+        report = {
+            'version': desyrdl.__version__,
+            'python': platform.python_version(),
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'scale': args.scale,
+            'repeat': args.repeat,
+            'results': results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# --------------------------------------------------------------------------- #
+#           ____  _____________  __                                           #
+#          / __ \/ ____/ ___/\ \/ /                 _   _   _                 #
+#         / / / / __/  \__ \  \  /                 / \ / \ / \                #
+#        / /_/ / /___ ___/ /  / /               = ( M | S | K )=              #
+#       /_____/_____//____/  /_/                   \_/ \_/ \_/                #
+#                                                                             #
+# --------------------------------------------------------------------------- #
+# @copyright Copyright 2026 DESY
+# SPDX-License-Identifier: Apache-2.0
+# --------------------------------------------------------------------------- #
+# @date 2026-10-18
+# --------------------------------------------------------------------------- #
+"""Interrupt tree benchmark.
+
+Generates address spaces with cascaded interrupt controllers of growing size
+and measures the time of building the context with the DesyRDL listener.
+The time per interrupt source should stay constant.
+
+    python test/benchmark/bench_interrupts.py [-n 4 16 64 256]
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from systemrdl import RDLCompiler, RDLWalker
+
+from desyrdl.DesyListener import DesyListener
+
+FANOUT = 32
+
+
+def gen_rdl(n_mids):
+    """Return SystemRDL source with n_mids x FANOUT leaf interrupt sources in three levels."""
+    fields = " ".join(f"field {{ nonsticky intr; }} s{idx};" for idx in range(FANOUT))
+    enables = " ".join(f"field {{}} s{idx} = 0;" for idx in range(FANOUT))
+    isr = f"reg isr {{ default sw = rw; default hw = w; {fields} }};"
+    ier = f"reg ier {{ default sw = rw; default hw = r; {enables} }};"
+    lines = [
+        "addrmap leaf {",
+        '  desyrdl_interface = "AXI4L";',
+        "  reg { default sw = rw; default hw = w; default woclr; field { posedge intr; } done; } ISR;",
+        "  reg { default sw = rw; default hw = r; field {} done = 0; } IER;",
+        "  reg { default sw = rw; default hw = r; field {} en = 0; } MER;",
+        "};",
+        "addrmap mid {",
+        '  desyrdl_interface = "AXI4L";',
+        f"  {isr} isr ISR;",
+        f"  {ier} ier IER;",
+        "  reg { default sw = rw; default hw = r; field {} en = 0; } MER;",
+    ]
+    lines.extend(f"  leaf L{idx};" for idx in range(FANOUT))
+    lines.extend(f"  ISR.s{idx}->next = L{idx}.ISR->intr;" for idx in range(FANOUT))
+    lines.append("};")
+    lines.append("addrmap top {")
+    lines.append('  desyrdl_interface = "AXI4L";')
+    lines.append(f"  {isr} {ier}")
+    # one top interrupt controller per interrupt line
+    for line in range((n_mids + FANOUT - 1) // FANOUT):
+        lines.append(f"  isr ISR{line}; ier IER{line}; ISR{line}->desyrdl_intr_line = {line};")
+    lines.extend(f"  mid M{idx};" for idx in range(n_mids))
+    lines.extend(f"  ISR{idx // FANOUT}.s{idx % FANOUT}->next = M{idx}.ISR->intr;" for idx in range(n_mids))
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def compile_rdl(rdl_file):
+    """Compile DesyRDL properties library and the benchmark file."""
+    lib_dir = Path(__file__).parents[2] / "desyrdl" / "libraries" / "rdl"
+    rdlc = RDLCompiler()
+    for lib_file in sorted(lib_dir.glob("*.rdl")):
+        rdlc.compile_file(lib_file)
+    rdlc.compile_file(rdl_file)
+    return rdlc.elaborate().top
+
+
+def bench(n_mids, tmp_dir):
+    """Return number of interrupt registers and time of the context walk."""
+    rdl_file = Path(tmp_dir) / f"intr_{n_mids}.rdl"
+    rdl_file.write_text(gen_rdl(n_mids))
+    top = compile_rdl(rdl_file)
+    listener = DesyListener()
+    start = time.perf_counter()
+    # listener prints the interrupt tree, keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        RDLWalker(unroll=False).walk(top, listener)
+    return len(listener.top_intrs), time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark for all sizes and print the table."""
+    arg_parser = argparse.ArgumentParser('DesyRDL interrupt tree benchmark')
+    arg_parser.add_argument(
+        '-n',
+        dest="sizes",
+        metavar='N',
+        type=int,
+        nargs='+',
+        default=[4, 16, 64, 256],
+        help='number of middle level interrupt controllers, each with 32 sources',
+    )
+    args = arg_parser.parse_args()
+
+    print(f"{'controllers':>12} {'intr regs':>10} {'walk [s]':>10} {'per reg [us]':>13}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_mids in args.sizes:
+            n_intrs, seconds = bench(n_mids, tmp_dir)
+            print(f"{n_mids:>12} {n_intrs:>10} {seconds:>10.3f} {seconds / n_intrs * 1e6:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Fixtures of the tests, outputs generated from the test address maps."""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+from desyrdl.api import generate
+
+RDL_DIR = Path(__file__).parent / "rdl"
+
+
+def load_package(name, path):
+    """Import generated package from path as name, the generated packages may have the name of the tool."""
+    spec = importlib.util.spec_from_file_location(name, path / "__init__.py", submodule_search_locations=[str(path)])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[name] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+@pytest.fixture(scope="session")
+def runtime_out(tmp_path_factory):
+    """Directory of the cocotb and model outputs of the runtime address map."""
+    out_dir = tmp_path_factory.mktemp("runtime")
+    generate([RDL_DIR / "runtime.rdl"], ["cocotb", "model"], out_dir=out_dir)
+    return out_dir
+
+
+@pytest.fixture(scope="session")
+def cocotb_map(runtime_out):
+    """Generated cocotb address map module."""
+    load_package("runtime_cocotb", runtime_out / "cocotb" / "desyrdl")
+    return importlib.import_module("runtime_cocotb.addrmap_ch0")
+
+
+@pytest.fixture(scope="session")
+def device_model(runtime_out):
+    """Generated device model module."""
+    load_package("runtime_model", runtime_out / "model" / "desyrdl_model")
+    return importlib.import_module("runtime_model.model_ch0")
+
+
+@pytest.fixture
+def model(device_model):
+    """Device model in reset state."""
+    return device_model.Model()
+
+
+@pytest.fixture
+def dut_map(cocotb_map, model):
+    """Address map on the device model bus."""
+    return cocotb_map.Addrmap(model)
+
+
+@pytest.fixture(scope="session")
+def cocotb_runtime(cocotb_map):
+    """Runtime module of the generated cocotb address map."""
+    return sys.modules[cocotb_map.__package__ + ".runtime"]
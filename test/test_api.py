@@ -0,0 +1,31 @@
+"""Tests of the library interface."""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+from systemrdl import RDLCompileError
+
+from desyrdl.api import RdlText, generate
+
+SUB_RDL = """
+addrmap sub {
+  reg { field { sw = rw; hw = r; } data[32]; } R0;
+  reg { field { sw = rw; hw = r; } data[32]; } R1;
+};
+"""
+
+
+def test_render_pool(tmp_path):
+    rdl = RdlText(SUB_RDL + "addrmap pool { sub A @0x0; sub B @0x100; };", "pool")
+    files = generate([rdl], ["vhdl", "map"], out_dir=tmp_path, jobs=2)
+    assert all(Path(fname).exists() for fname in files["map"])
+    assert multiprocessing.active_children() == []
+
+
+def test_render_pool_shut_down_on_error(tmp_path):
+    # the address map array stride is not aligned, the walk fails after A was submitted to the pool
+    rdl = RdlText(SUB_RDL + "addrmap bad { sub S[2] @0x0 += 0xC; }; addrmap leak { sub A @0x0; bad B @0x100; };")
+    with pytest.raises(RDLCompileError):
+        generate([rdl], ["vhdl", "map"], out_dir=tmp_path, jobs=2)
+    assert multiprocessing.active_children() == []
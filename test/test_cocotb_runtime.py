@@ -0,0 +1,517 @@
+"""Tests of the generated cocotb address map on the device model bus."""
+
+import asyncio
+import mmap
+
+import numpy as np
+import pytest
+
+
+# =============================================================================
+# block snapshot and restore
+def test_regions_memory_with_registers(dut_map):
+    regions = {name: (offset, words, memory) for name, offset, words, _, memory in dut_map.regions()}
+    # data words of the memory and its registers within
+    assert regions["BMEM"] == (0x300 // 4, 16, True)
+    assert regions["BMEM.HEAD"] == (0x300 // 4, 1, False)
+    assert regions["BMEM.TAIL"] == (0x33C // 4, 1, False)
+    assert regions["MEM"] == (0x100 // 4, 16, True)
+
+
+def test_snapshot_restore(dut_map, model):
+    model.write(0x300, np.arange(100, 116, dtype=np.uint32))
+    model.write(0x100, np.arange(16, dtype=np.uint32))
+    model.write(0x14, np.arange(1, 9, dtype=np.uint32))
+    model.hw_write("runtime.STAT", 0x55)
+
+    record = asyncio.run(dut_map.snapshot())
+    assert list(record["BMEM"]) == list(range(100, 116))
+    assert record["BMEM.HEAD"] == 100
+    assert record["BMEM.TAIL"] == 115
+    assert list(record["MEM"]) == list(range(16))
+    assert list(record["TABLE"]) == list(range(1, 9))
+    assert record["STAT"] == 0x55
+
+    model.words[:] = 0
+    asyncio.run(dut_map.restore(record))
+    assert list(model.read(0x300, 16)) == list(range(100, 116))
+    assert list(model.read(0x100, 16)) == list(range(16))
+    assert list(model.read(0x14, 8)) == list(range(1, 9))
+    # read only register is not restored
+    assert model.hw_read("runtime.STAT") == 0
+
+
+def test_snapshot_without_memories(dut_map, model):
+    model.write(0x100, np.arange(16, dtype=np.uint32))
+    record = asyncio.run(dut_map.snapshot(memories=False))
+    assert "MEM" not in record.dtype.names
+    assert "BMEM" not in record.dtype.names
+    assert "TABLE" in record.dtype.names
+
+
+def test_snapshot_bursts(dut_map, model):
+    reads = []
+    read_dwords = model.read_dwords
+
+    async def count_reads(address, count):
+        reads.append((address, count))
+        return await read_dwords(address, count)
+
+    model.read_dwords = count_reads
+    asyncio.run(dut_map.snapshot(max_words=8))
+    # memories are split into bursts of max_words words
+    assert (0x100, 8) in reads
+    assert (0x120, 8) in reads
+    assert (0x300, 8) in reads
+    assert all(count <= 8 for _, count in reads)
+    # memory registers are read with the memory words, no word is read twice
+    words = [address + 4 * num for address, count in reads for num in range(count)]
+    assert len(words) == len(set(words))
+
+
+def test_restore_bursts(dut_map, model):
+    writes = []
+    write_dwords = model.write_dwords
+
+    async def count_writes(address, data):
+        writes.append((address, len(data)))
+        await write_dwords(address, data)
+
+    record = asyncio.run(dut_map.snapshot())
+    model.write_dwords = count_writes
+    asyncio.run(dut_map.restore(record, max_words=5))
+    assert all(count <= 5 for _, count in writes)
+    assert (0x100, 5) in writes
+    words = [address + 4 * num for address, count in writes for num in range(count)]
+    assert len(words) == len(set(words))
+    assert set(range(0x100, 0x140, 4)) <= set(words)
+
+
+def test_bursts(cocotb_runtime):
+    bursts = cocotb_runtime.bursts
+    # adjacent regions merged up to max_words, overlapping regions in one burst
+    assert list(bursts([(0, 1), (1, 2), (3, 1)])) == [(0, 4)]
+    assert list(bursts([(0, 1), (1, 2), (3, 1)], 3)) == [(0, 3), (3, 1)]
+    assert list(bursts([(0, 16), (0, 1), (15, 1), (20, 1)])) == [(0, 16), (20, 1)]
+    # regions larger than max_words are split
+    assert list(bursts([(0, 10), (10, 1)], 4)) == [(0, 4), (4, 4), (8, 2), (10, 1)]
+
+
+# =============================================================================
+# accessor tree and item arrays
+def test_array_elements(dut_map):
+    assert len(dut_map.TABLE) == 8
+    assert [item.address for item in dut_map.TABLE] == [0x14 + 4 * num for num in range(8)]
+    assert dut_map.TABLE[3].name == "runtime.TABLE[3]"
+    # elements are created once
+    assert dut_map.TABLE[3] is dut_map.TABLE[3]
+    assert dut_map.RF[1].R1.address == 0x44
+    assert dut_map.MATRIX.shape == (2, 3)
+    assert dut_map.MATRIX[1, 2].address == 0x400 + 5 * 4
+    assert dut_map.MATRIX[1, 2].name == "runtime.MATRIX[1][2]"
+    # element number and indices give the same element
+    assert dut_map.MATRIX[5] is dut_map.MATRIX[1, 2]
+    assert [item.name for item in dut_map.MATRIX][3] == "runtime.MATRIX[1][0]"
+
+
+def test_array_index_errors(dut_map):
+    with pytest.raises(IndexError, match="out of range"):
+        dut_map.TABLE[8]
+    with pytest.raises(IndexError, match="out of range"):
+        dut_map.MATRIX[2, 0]
+    with pytest.raises(IndexError, match="dimensions"):
+        dut_map.MATRIX[0, 0, 0]
+
+
+def test_array_read_write(dut_map, model):
+    asyncio.run(dut_map.TABLE.write(np.arange(10, 18)))
+    assert list(model.read(0x14, 8)) == list(range(10, 18))
+    assert list(asyncio.run(dut_map.TABLE.read(8))) == list(range(10, 18))
+    asyncio.run(dut_map.TABLE[2].write(99))
+    assert list(asyncio.run(dut_map.TABLE.read(2, offset=1))) == [11, 99]
+    asyncio.run(dut_map.MATRIX.write([-1, 2, -3, 4, -5, 6]))
+    assert list(asyncio.run(dut_map.MATRIX[1, 0].read())) == [4]
+    assert list(asyncio.run(dut_map.MATRIX.read(6))) == [-1, 2, -3, 4, -5, 6]
+
+
+# =============================================================================
+# item tables and lazily created items
+def test_items_created_on_access(dut_map):
+    assert "SINT" not in vars(dut_map)
+    item = dut_map.SINT
+    assert vars(dut_map)["SINT"] is item
+    assert "CTRL" in dut_map.item_names
+    with pytest.raises(AttributeError, match="NOPE"):
+        dut_map.NOPE  # noqa: B018
+
+
+def test_item_table(dut_map, model):
+    table = dut_map.item_table
+    row = table[list(table["name"]).index("runtime.FLT")]
+    assert (row["address"], row["size"], row["ieee754"]) == (0x10, 4, 1)
+    assert "runtime.RF.1.R1" in dut_map.addrmap
+    assert dut_map.addrmap["runtime.RF.1.R1"].address == 0x44
+    asyncio.run(dut_map.write("runtime", "SINT", -5))
+    assert model.read(0x4)[0] == 0xFFFFFFFB
+    assert list(asyncio.run(dut_map.read("runtime", "SINT"))) == [-5]
+
+
+# =============================================================================
+# fields and the shadow register cache
+def count_accesses(model):
+    """Record (kind, address, count) of the bus accesses of the model."""
+    accesses = []
+    read_dwords, write_dwords = model.read_dwords, model.write_dwords
+
+    async def read(address, count):
+        accesses.append(("read", address, count))
+        return await read_dwords(address, count)
+
+    async def write(address, data):
+        accesses.append(("write", address, len(data)))
+        await write_dwords(address, data)
+
+    model.read_dwords, model.write_dwords = read, write
+    return accesses
+
+
+def test_fields(dut_map, model):
+    ctrl = dut_map.CTRL
+    assert ctrl.field_names == ("enable", "mode", "start", "status", "events")
+    assert ctrl.shadow == 0x5  # reset values of enable and mode
+    asyncio.run(ctrl.mode.write(5))
+    assert model.hw_read("runtime.CTRL", "mode") == 5
+    assert model.hw_read("runtime.CTRL", "enable") == 1
+    model.hw_write("runtime.CTRL", 3, "status")
+    assert list(asyncio.run(ctrl.status.read())) == [3]
+    asyncio.run(dut_map.RF[1].R0.b.write(0x1234))
+    asyncio.run(dut_map.RF[1].R0.a.write(0x5678))
+    assert model.read(0x40)[0] == 0x12345678
+
+
+def test_signed_field(dut_map, model):
+    asyncio.run(dut_map.SHORT.data.write(-2))
+    assert model.read(0x8)[0] == 0xFFFE
+    assert list(asyncio.run(dut_map.SHORT.data.read())) == [-2]
+
+
+def test_field_side_effects(dut_map, model):
+    pulses = []
+    model.on_write("runtime.CTRL", lambda _, value: pulses.append(value >> 4 & 1))
+    asyncio.run(dut_map.CTRL.start.write(1))
+    assert pulses == [1]
+    # single pulse field reads 0 after the write
+    assert model.hw_read("runtime.CTRL", "start") == 0
+    assert list(asyncio.run(dut_map.CTRL.start.read())) == [0]
+    # writes of other fields do not repeat the pulse
+    asyncio.run(dut_map.CTRL.mode.write(1))
+    assert pulses == [1, 0]
+    model.hw_write("runtime.CTRL", 9, "events")
+    assert list(asyncio.run(dut_map.CTRL.events.read())) == [9]
+    assert model.hw_read("runtime.CTRL", "events") == 0
+
+
+def test_shadow_cache(cocotb_map, model):
+    dut_map = cocotb_map.Addrmap(model, shadow=True)
+    accesses = count_accesses(model)
+    ctrl = dut_map.CTRL
+    asyncio.run(ctrl.mode.write(6))
+    # kept bits are known from the reset values, the field write is one bus write
+    assert accesses == [("write", 0x0, 1)]
+    assert list(asyncio.run(ctrl.mode.read())) == [6]
+    assert list(asyncio.run(ctrl.enable.read())) == [1]
+    assert len(accesses) == 1
+    # fields written by hardware are read from the bus
+    model.hw_write("runtime.CTRL", 7, "status")
+    assert list(asyncio.run(ctrl.status.read())) == [7]
+    assert accesses[-1] == ("read", 0x0, 1)
+    ctrl.invalidate()
+    asyncio.run(ctrl.mode.read())
+    assert len(accesses) == 3
+
+
+def test_no_shadow_cache(dut_map, model):
+    accesses = count_accesses(model)
+    asyncio.run(dut_map.CTRL.mode.read())
+    asyncio.run(dut_map.CTRL.mode.read())
+    assert accesses == [("read", 0x0, 1), ("read", 0x0, 1)]
+
+
+def test_shadow_follows_item_table(cocotb_map, model):
+    dut_map = cocotb_map.Addrmap(model, shadow=True)
+    ctrl = dut_map.CTRL
+    asyncio.run(dut_map.write("runtime", "CTRL", 0xF))
+    assert ctrl.shadow == 0xF
+    asyncio.run(ctrl.enable.write(0))
+    assert model.hw_read("runtime.CTRL", "mode") == 7
+    assert model.hw_read("runtime.CTRL", "enable") == 0
+
+
+def test_shadow_of_register_created_after_access(cocotb_map, model):
+    dut_map = cocotb_map.Addrmap(model, shadow=True)
+    asyncio.run(dut_map.write("runtime", "CTRL", 0xF))
+    accesses = count_accesses(model)
+    asyncio.run(dut_map.CTRL.enable.write(0))
+    # the value is not known, the register is read once
+    assert accesses == [("read", 0x0, 1), ("write", 0x0, 1)]
+    assert model.hw_read("runtime.CTRL", "mode") == 7
+
+
+def test_shadow_follows_block_writes(cocotb_map, model):
+    dut_map = cocotb_map.Addrmap(model, shadow=True)
+    r0 = dut_map.RF[0].R0
+    asyncio.run(dut_map.RF[0].write_raw([0xAAAA0000]))
+    asyncio.run(r0.a.write(2))
+    assert model.read(0x38)[0] == 0xAAAA0002
+    # array of regfiles
+    r0 = dut_map.RF[1].R0
+    asyncio.run(dut_map.RF.write_raw([0, 0, 0xBBBB0000, 0]))
+    asyncio.run(r0.a.write(3))
+    assert model.read(0x40)[0] == 0xBBBB0003
+
+
+def test_shadow_follows_batch_writes(cocotb_map, model):
+    dut_map = cocotb_map.Addrmap(model, shadow=True)
+    ctrl = dut_map.CTRL
+
+    async def run():
+        async with dut_map.batch():
+            await dut_map.write("runtime", "CTRL", 0xF)
+            await ctrl.enable.write(0)
+
+    asyncio.run(run())
+    assert model.hw_read("runtime.CTRL", "mode") == 7
+
+
+def test_shadow_follows_restore(cocotb_map, model):
+    dut_map = cocotb_map.Addrmap(model, shadow=True)
+    ctrl = dut_map.CTRL
+    record = asyncio.run(dut_map.snapshot(memories=False))
+    asyncio.run(ctrl.mode.write(1))
+    asyncio.run(dut_map.restore(record))
+    asyncio.run(ctrl.enable.write(0))
+    assert model.hw_read("runtime.CTRL", "mode") == 2
+
+
+def test_shadow_of_array_elements(cocotb_map, model):
+    dut_map = cocotb_map.Addrmap(model, shadow=True)
+    asyncio.run(dut_map.MATRIX[1, 2].write(0x11))
+    assert list(asyncio.run(dut_map.MATRIX[5].data.read())) == [0x11]
+
+
+def test_no_shadow_cache_on_views(cocotb_map, cocotb_runtime):
+    memory = bytearray(MAP_SIZE)
+    dut_map = cocotb_map.Addrmap(cocotb_runtime.MmapBus(memory), shadow=True)
+    ctrl = dut_map.CTRL
+    asyncio.run(ctrl.enable.write(0))
+    # views change the words without bus accesses
+    ctrl.view()[0] = 0xF
+    asyncio.run(ctrl.enable.write(0))
+    assert np.frombuffer(memory, dtype=np.uint32)[0] == 0xE
+
+
+# =============================================================================
+# conversion of item values
+def test_signed_round_trip(dut_map, model):
+    asyncio.run(dut_map.SINT.write(-5))
+    assert model.read(0x4)[0] == 0xFFFFFFFB
+    values = asyncio.run(dut_map.SINT.read())
+    assert values.dtype == np.int32
+    assert list(values) == [-5]
+    asyncio.run(dut_map.SHORT.write(-32768))
+    assert model.read(0x8)[0] == 0x8000
+    assert list(asyncio.run(dut_map.SHORT.read())) == [-32768]
+
+
+def test_fixed_round_trip(dut_map, model):
+    asyncio.run(dut_map.FIX.write(1.5))
+    assert model.read(0xC)[0] == 0x180
+    assert list(asyncio.run(dut_map.FIX.read())) == [1.5]
+    asyncio.run(dut_map.FIX.write(-0.5))
+    assert model.read(0xC)[0] == 0xFF80
+    assert list(asyncio.run(dut_map.FIX.read())) == [-0.5]
+
+
+def test_float_round_trip(dut_map, model):
+    asyncio.run(dut_map.FLT.write(3.25))
+    assert model.read(0x10)[0] == np.float32(3.25).view(np.uint32)
+    values = asyncio.run(dut_map.FLT.read())
+    assert values.dtype == np.float32
+    assert list(values) == [3.25]
+
+
+def test_memory_round_trip(dut_map, model):
+    values = np.arange(-8, 8)
+    asyncio.run(dut_map.SMEM.write(values))
+    assert model.read(0x200)[0] == 0xFFFFFFF8
+    assert list(asyncio.run(dut_map.SMEM.read(16))) == list(values)
+    asyncio.run(dut_map.MEM.write_raw([0xFFFFFFFF, 1]))
+    assert list(asyncio.run(dut_map.MEM.read_raw(2))) == [0xFFFFFFFF, 1]
+
+
+# =============================================================================
+# batches
+def test_batch_merges_writes(dut_map, model):
+    accesses = count_accesses(model)
+
+    async def sequence():
+        async with dut_map.batch():
+            for num in range(8):
+                await dut_map.TABLE[num].write(num + 1)
+            await dut_map.STAT.read_raw()
+
+    asyncio.run(sequence())
+    # queued writes are issued before the read
+    assert accesses == [("write", 0x14, 8), ("read", 0x34, 1)]
+    assert list(model.read(0x14, 8)) == list(range(1, 9))
+
+
+def test_batch_max_words(dut_map, model):
+    accesses = count_accesses(model)
+
+    async def sequence():
+        async with dut_map.batch(max_words=3):
+            for num in range(8):
+                await dut_map.TABLE[num].write(num)
+
+    asyncio.run(sequence())
+    assert [count for _, _, count in accesses] == [3, 3, 2]
+
+
+def test_batch_reads(dut_map, model):
+    accesses = count_accesses(model)
+    model.hw_write("runtime.STAT", 42)
+
+    async def sequence():
+        async with dut_map.batch() as batch:
+            await dut_map.SINT.write(-7)
+            sint = batch.read(dut_map.SINT)
+            stat = batch.read(dut_map.STAT, raw=True)
+            table = batch.read(dut_map.TABLE, 2, offset=1)
+            assert not accesses
+        return await sint, await stat, await table
+
+    sint, stat, table = asyncio.run(sequence())
+    assert accesses[0] == ("write", 0x4, 1)
+    assert {access[1] for access in accesses[1:]} == {0x4, 0x34, 0x18}
+    assert list(sint) == [-7]
+    assert list(stat) == [42]
+    assert list(table) == [0, 0]
+
+
+def test_batch_read_outside_batch(dut_map):
+    with pytest.raises(RuntimeError, match="batch"):
+        dut_map.bus.read(dut_map.SINT)
+
+
+# =============================================================================
+# address index
+def test_address_index_resolve(dut_map):
+    index = dut_map.address_index
+    assert index.resolve(0x0) == "runtime.CTRL"
+    assert index.resolve(0x0, bit=2) == "runtime.CTRL.mode"
+    assert index.resolve(0x0, bit=10) == "runtime.CTRL.events"
+    assert index.resolve(0x20) == "runtime.TABLE[3]"
+    assert index.resolve(0x44) == "runtime.RF[1].R1"
+    assert index.resolve(0x108) == "runtime.MEM[2]"
+    assert index.resolve(0x400 + 5 * 4) == "runtime.MATRIX[1][2]"
+    # gaps and addresses outside the map
+    assert index.resolve(0x80) is None
+    assert index.resolve(0x1000) is None
+
+
+def test_address_index_lookup(dut_map):
+    index = dut_map.address_index
+    addresses = np.array([0x14, 0x18, 0x80, 0x104, 0x33C])
+    entries, elements = index.lookup(addresses)
+    assert list(elements) == [0, 1, -1, 1, 15]
+    assert entries[2] == -1
+    assert index.resolve_all(addresses) == [
+        "runtime.TABLE[0]",
+        "runtime.TABLE[1]",
+        None,
+        "runtime.MEM[1]",
+        "runtime.BMEM[15]",
+    ]
+
+
+# =============================================================================
+# memory mapped bus
+MAP_SIZE = 0x500
+
+
+def test_mmap_bus_access(cocotb_map, cocotb_runtime):
+    memory = bytearray(MAP_SIZE)
+    words = np.frombuffer(memory, dtype=np.uint32)
+    bus = cocotb_runtime.MmapBus(memory)
+    dut_map = cocotb_map.Addrmap(bus)
+    asyncio.run(dut_map.SINT.write(-5))
+    assert words[0x4 // 4] == 0xFFFFFFFB
+    assert list(asyncio.run(dut_map.SINT.read())) == [-5]
+    # numpy arrays are written without list conversion
+    asyncio.run(dut_map.MEM.write_raw(np.arange(16)))
+    assert list(words[0x100 // 4 : 0x140 // 4]) == list(range(16))
+    data = asyncio.run(bus.read_dwords(0x100, 4))
+    data[0] = 99
+    assert words[0x100 // 4] == 0
+
+
+def test_mmap_bus_views(cocotb_map, cocotb_runtime):
+    memory = bytearray(MAP_SIZE)
+    dut_map = cocotb_map.Addrmap(cocotb_runtime.MmapBus(memory))
+    flt = dut_map.FLT.view()
+    assert flt.dtype == np.float32
+    flt[0] = 1.5
+    assert list(asyncio.run(dut_map.FLT.read())) == [1.5]
+    smem = dut_map.SMEM.view()
+    assert smem.dtype == np.int32
+    assert smem.shape == (16,)
+    asyncio.run(dut_map.SMEM.write([-1, -2]))
+    assert list(smem[:2]) == [-1, -2]
+    matrix = dut_map.MATRIX.view()
+    assert matrix.shape == (2, 3)
+    asyncio.run(dut_map.MATRIX[1, 2].write(7))
+    assert matrix[1, 2] == 7
+    regfiles = dut_map.RF.view()
+    assert regfiles.shape == (2, 2)
+    regfiles[1, 1] = 0x55
+    assert list(asyncio.run(dut_map.RF[1].R1.read())) == [0x55]
+
+
+def test_mmap_bus_range(cocotb_runtime):
+    bus = cocotb_runtime.MmapBus(bytearray(0x40), address=0x1000)
+    asyncio.run(bus.write_dwords(0x103C, [1]))
+    assert list(bus.view(0x1038, 2)) == [0, 1]
+    for address, count in ((0xFFC, 1), (0x103C, 2), (0x1002, 1)):
+        with pytest.raises(ValueError, match="out of the mapped memory"):
+            asyncio.run(bus.read_dwords(address, count))
+
+
+def test_mmap_bus_buffer_offset(cocotb_runtime):
+    memory = bytearray(0x100)
+    words = np.frombuffer(memory, dtype=np.uint32)
+    bus = cocotb_runtime.MmapBus(memory, 0x1000, offset=0x40)
+    assert len(bus.words) == (0x100 - 0x40) // 4
+    asyncio.run(bus.write_dwords(0x1004, [7]))
+    assert words[0x44 // 4] == 7
+    bus = cocotb_runtime.MmapBus(memory, 0x1000, 0x10, offset=0x40)
+    assert list(bus.view(0x1000, 4)) == [0, 7, 0, 0]
+
+
+def test_mmap_bus_file(cocotb_map, cocotb_runtime, tmp_path):
+    path = tmp_path / "memory.bin"
+    path.write_bytes(bytes(MAP_SIZE))
+    with cocotb_runtime.MmapBus(path) as bus:
+        assert len(bus.words) == MAP_SIZE // 4
+        dut_map = cocotb_map.Addrmap(bus)
+        asyncio.run(dut_map.TABLE[2].write(0x12345678))
+    assert np.frombuffer(path.read_bytes(), dtype=np.uint32)[0x1C // 4] == 0x12345678
+    # mapped from offset, a multiple of the allocation granularity as for UIO maps
+    page = mmap.ALLOCATIONGRANULARITY
+    path.write_bytes(bytes(page) + np.arange(16, dtype=np.uint32).tobytes())
+    with cocotb_runtime.MmapBus(path, 0x100, offset=page) as bus:
+        assert list(asyncio.run(bus.read_dwords(0x104, 2))) == [1, 2]
+    empty = tmp_path / "empty.bin"
+    empty.touch()
+    with pytest.raises(ValueError, match="size of the mapped memory not known"):
+        cocotb_runtime.MmapBus(empty)
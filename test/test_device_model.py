@@ -0,0 +1,81 @@
+"""Tests of the generated device model."""
+
+import numpy as np
+import pytest
+
+
+def test_reset(model):
+    assert model.read(0x0)[0] == 0x5
+    assert model.hw_read("runtime.COUNT", "down") == 10
+    model.write(0x0, [0])
+    model.write(0x100, np.arange(16, dtype=np.uint32))
+    model.reset()
+    assert model.read(0x0)[0] == 0x5
+    # memories keep their content
+    assert list(model.read(0x100, 16)) == list(range(16))
+
+
+def test_access(model):
+    # read only register ignores writes, its value is set by the logic
+    model.write(0x34, [7])
+    assert model.read(0x34)[0] == 0
+    model.hw_write("runtime.STAT", 7)
+    assert model.read(0x34)[0] == 7
+    # unmapped words read 0 and ignore writes
+    model.write(0x80, [1, 2])
+    assert list(model.read(0x7C, 3)) == [0, 0, 0]
+    # bits of fields which are not writable keep their value
+    model.hw_write("runtime.CTRL", 0xF, "status")
+    model.write(0x0, [0])
+    assert model.read(0x0)[0] == 0xF << 5
+
+
+def test_burst_access(model):
+    model.write(0x14, np.arange(1, 9, dtype=np.uint32))
+    assert list(model.read(0x10, 10)) == [0, *range(1, 9), 0]
+    assert list(model.hw_read("runtime.TABLE")) == list(range(1, 9))
+    assert model.hw_read("runtime.TABLE[3]") == 4
+    model.write(0x414, [0x1234])
+    assert model.hw_read("runtime.MATRIX[1][2]") == 0x1234
+    assert list(model.hw_read("runtime.MATRIX[1]")) == [0, 0, 0x1234]
+
+
+def test_side_effects(model):
+    model.hw_write("runtime.CTRL", 5, "events")
+    assert (model.read(0x0)[0] >> 9) & 0xF == 5
+    # read clear field
+    assert (model.read(0x0)[0] >> 9) & 0xF == 0
+    model.hw_write("runtime.COUNT", 0xFF, "flags")
+    model.write(0x420, [0x0F << 16])
+    assert model.hw_read("runtime.COUNT", "flags") == 0xF0
+    model.write(0x0, [0x10])
+    assert model.hw_read("runtime.CTRL", "start") == 0
+
+
+def test_counters(model):
+    model.incr("runtime.COUNT", "up")
+    model.incr("runtime.COUNT", "up", 3)
+    model.decr("runtime.COUNT", "down")
+    assert model.hw_read("runtime.COUNT", "up") == 4
+    assert model.hw_read("runtime.COUNT", "down") == 8
+    model.decr("runtime.COUNT", "up", 5)
+    assert model.hw_read("runtime.COUNT", "up") == 0xFF
+
+
+def test_callbacks(model):
+    writes, reads = [], []
+    model.on_write("runtime.TABLE", lambda element, value: writes.append((element, value)))
+    model.on_read("runtime.TABLE[2]", lambda element, value: reads.append((element, value)))
+    model.write(0x18, [5, 6])
+    assert writes == [(1, 5), (2, 6)]
+    model.read(0x14, 3)
+    assert reads == [(2, 6)]
+
+
+def test_errors(model):
+    with pytest.raises(KeyError, match="NOPE"):
+        model.hw_read("runtime.NOPE")
+    with pytest.raises(KeyError, match="nope"):
+        model.hw_read("runtime.CTRL", "nope")
+    with pytest.raises(ValueError, match="not writable by hardware"):
+        model.hw_write("runtime.CTRL", 1, "mode")
@@ -0,0 +1,14 @@
+"""Tests of the map output."""
+
+from pathlib import Path
+
+from desyrdl.api import render
+
+RDL_DIR = Path(__file__).parent / "rdl"
+
+
+def test_interrupt_cascade():
+    # interrupt IDs of three levels of cascaded interrupt controllers, as read by the map file readers
+    outputs = render([RDL_DIR / "interrupts.rdl"], ["map"])
+    mapp = next(content for path, content in outputs.items() if str(path).endswith(".mapp"))
+    assert mapp == (RDL_DIR / "interrupts.mapp").read_text()
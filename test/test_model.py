@@ -0,0 +1,57 @@
+"""Tests of the saved address space model."""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from desyrdl import desyrdl
+from desyrdl.api import TPL_DIR, generate
+
+RDL_FILE = Path(__file__).parent / "rdl" / "runtime.rdl"
+
+
+@pytest.fixture
+def node_tpl_dir(tmp_path):
+    """Templates of the map format with a template calling a node method, not kept in the model."""
+    tpl_dir = tmp_path / "templates"
+    shutil.copytree(TPL_DIR / "map", tpl_dir / "map")
+    (tpl_dir / "map" / "paths.txt.jinja2").write_text(
+        "{% for addrmap in addrmaps %}{{addrmap.node.get_path()}}{% endfor %}"
+    )
+    with (tpl_dir / "map" / "include.txt").open("a") as include:
+        include.write("paths.txt.jinja2 paths.txt\n")
+    return tpl_dir
+
+
+def run(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["desyrdl", "-f", "map", "--no-cache", *map(str, args)])
+    desyrdl.main()
+
+
+def test_load_model(monkeypatch, tmp_path):
+    model = tmp_path / "model.pkl"
+    run(monkeypatch, "-i", RDL_FILE, "-o", tmp_path / "compiled", "--save-model", model)
+    run(monkeypatch, "-o", tmp_path / "loaded", "--load-model", model)
+    for fname in ("ch0.mapp", "ch0.mapt"):
+        compiled = (tmp_path / "compiled" / "map" / fname).read_text()
+        assert (tmp_path / "loaded" / "map" / fname).read_text() == compiled
+
+
+def test_load_model_node_members(monkeypatch, tmp_path, node_tpl_dir, capsys):
+    model = tmp_path / "model.pkl"
+    run(monkeypatch, "-i", RDL_FILE, "-o", tmp_path / "compiled", "-t", node_tpl_dir, "--save-model", model)
+    assert (tmp_path / "compiled" / "map" / "paths.txt").read_text() == "runtime"
+    # input files are compiled for templates using node members not kept in the model
+    run(monkeypatch, "-i", RDL_FILE, "-o", tmp_path / "loaded", "-t", node_tpl_dir, "--load-model", model)
+    assert "node member 'get_path' is not kept in the saved model" in capsys.readouterr().err
+    assert (tmp_path / "loaded" / "map" / "paths.txt").read_text() == "runtime"
+    with pytest.raises(SystemExit):
+        run(monkeypatch, "-o", tmp_path / "model_only", "-t", node_tpl_dir, "--load-model", model)
+
+
+def test_render_pool_node_members(tmp_path, node_tpl_dir):
+    # templates are rendered in this process if the frozen context of the workers lacks the node members
+    generate([RDL_FILE], ["map"], out_dir=tmp_path, tpl_dir=node_tpl_dir, jobs=2)
+    assert (tmp_path / "map" / "paths.txt").read_text() == "runtime"
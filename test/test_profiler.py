@@ -0,0 +1,41 @@
+"""Tests of the generation profiler."""
+
+import tracemalloc
+
+import pytest
+
+from desyrdl import profiler
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    """Stop tracing started by the profilers, it slows down the other tests."""
+    yield
+    tracemalloc.stop()
+
+
+def test_phases():
+    prof = profiler.Profiler(enabled=True)
+    with prof.phase("render", "top", "a.vhd"):
+        with prof.phase("compile"):
+            data = bytearray(100000)
+        del data
+    with prof.phase("render", "top", "a.vhd"):
+        pass
+    summary = {rec["phase"]: rec for rec in prof.summary()}
+    assert summary["render"]["calls"] == 2
+    assert summary["compile"]["peak"] >= 100000
+    assert summary["render"]["peak"] >= summary["compile"]["peak"]
+    assert summary["render"]["self_time"] <= summary["render"]["time"]
+    assert "render" in prof.report()
+
+
+def test_phases_without_reset_peak(monkeypatch):
+    # Python 3.8 has no tracemalloc.reset_peak
+    monkeypatch.setattr(profiler, "_reset_peak", None)
+    monkeypatch.delattr(tracemalloc, "reset_peak")
+    prof = profiler.Profiler(enabled=True)
+    with prof.phase("compile"):
+        data = bytearray(100000)
+    del data
+    assert prof.summary()[0]["peak"] >= 100000